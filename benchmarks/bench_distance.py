@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# geopy.distance.geodesic döngüsü ile deprem_distance.batch_distances karşılaştırması.
+# Kullanım: python benchmarks/bench_distance.py [--sizes 1000 10000 100000] [--json]
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import geopy.distance
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from deprem_distance import DISTANCE_METHODS, batch_distances  # noqa: E402
+
+TARGET = (41.0082, 28.9784)
+
+
+def _best_of(func, repeat):
+    best = float('inf'); result = None
+    for _ in range(repeat):
+        start = time.perf_counter(); result = func(); best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(sizes, seed=42):
+    rng = np.random.default_rng(seed); rows = []
+    for n in sizes:
+        lats = rng.uniform(-89.0, 89.0, n); lons = rng.uniform(-180.0, 180.0, n)
+        geopy_s, reference = _best_of(lambda: np.array([geopy.distance.geodesic(TARGET, (a, b)).km for a, b in zip(lats.tolist(), lons.tolist())]), 1)
+        row = {'events': n, 'geopy_s': geopy_s}
+        for method in DISTANCE_METHODS:
+            elapsed, distances = _best_of(lambda: batch_distances(TARGET, lats, lons, method), 5)
+            error_m = np.abs(distances - reference) * 1000.0
+            row[method] = {'seconds': elapsed, 'speedup': geopy_s / elapsed if elapsed else float('inf'),
+                           'max_abs_error_m': float(error_m.max()), 'max_abs_error_m_under_1000km': float(error_m[reference < 1000].max()) if (reference < 1000).any() else None,
+                           'max_rel_error': float((error_m / 1000.0 / np.maximum(reference, 1e-9)).max())}
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu uzaklık motoru kıyaslaması")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args(); rows = run(args.sizes)
+    if args.json: print(json.dumps(rows, indent=2)); return
+    print(f"{'olay':>8} {'geopy (s)':>10} " + " ".join(f"{m + ' (s)':>14} {'hızlanma':>9} {'maks hata (m)':>14}" for m in DISTANCE_METHODS))
+    for row in rows:
+        print(f"{row['events']:>8} {row['geopy_s']:>10.3f} " + " ".join(f"{row[m]['seconds']:>14.5f} {row[m]['speedup']:>8.0f}x {row[m]['max_abs_error_m']:>14.1f}" for m in DISTANCE_METHODS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# Sorgu → ayrıştırma → süzme → çizim hattının aşama aşama kıyaslaması. Akışlar yerel USGS yerine geçen sunucudan
+# (feed_server) indirilir; kayıtlı akışlar yoksa sentetik akışlar kullanılır (fixtures). Her aşama için süre (tekrarların
+# ortancası) ve tracemalloc ile en yüksek ek bellek ölçülür; sonuçlar karşılaştırılabilir JSON olarak yazılır.
+# Kullanım: python benchmarks/bench_pipeline.py [--feed day|week|month | --events 1000000] [--repeat 3] [--latency 0]
+#                                              [--etag strong] [--prefilter] [--output sonuc.json] [--compare onceki.json]
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__)); ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+from deprem_changes import ChangeSet  # noqa: E402
+from deprem_cluster import ClusterIndex  # noqa: E402
+from deprem_feed import USGSFeedClient  # noqa: E402
+from deprem_map import MapDiffTracker, build_base_map_html, cluster_tooltip, event_tooltip, marker_payload, zoom_for_radius  # noqa: E402
+from deprem_pipeline import process_earthquake_data  # noqa: E402
+from deprem_stream import FeaturePrefilter  # noqa: E402
+from deprem_zones import WatchZone, merge_zone_matches  # noqa: E402
+from feed_server import ETAG_MODES, FeedServer  # noqa: E402
+from fixtures import FEED_NAMES, fixture_path, is_recorded, synthetic_path  # noqa: E402
+
+SCHEMA_VERSION = 1
+WORLD_VIEWPORT = (2, -180.0, -85.0, 180.0, 85.0)
+
+
+def _nearby_model_class():
+    """ Liste modeli Qt (PySide6) gerektirir; yoksa liste aşamaları atlanır. """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try: from deprem_gui import NearbyEventsModel
+    except ImportError: return None
+    return NearbyEventsModel
+
+
+class StageRecorder:
+    """ trace_memory=False: aşama süreleri (saniye); True: aşamanın başına göre en yüksek ek bellek (bayt). """
+
+    def __init__(self, trace_memory=False): self.trace_memory = trace_memory; self.values = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.trace_memory: tracemalloc.reset_peak(); base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        self.values[name] = max(0, tracemalloc.get_traced_memory()[1] - base) if self.trace_memory else elapsed
+
+
+def _write_delta_hour(hour_path, workdir, new_events=5):
+    """ Saatlik akışın bir kopyası: olayların yarısının 'updated' değeri artırılır, new_events yeni olay eklenir. """
+    with open(hour_path, 'rb') as hour_file: data = json.load(hour_file)
+    features = data.get('features', [])
+    for feature in features[::2]: feature['properties']['updated'] = (feature['properties'].get('updated') or 0) + 60000
+    template = features[0] if features else None; generated = (data.get('metadata') or {}).get('generated') or int(time.time() * 1000)
+    for i in range(new_events if template else 0):
+        feature = json.loads(json.dumps(template)); feature['id'] = f"bench{i:05d}"
+        feature['properties'].update(time=generated - i * 1000, updated=generated - i * 1000 + 500)
+        features.append(feature)
+    path = os.path.join(workdir, "all_hour_delta.geojson")
+    with open(path, 'w', encoding='utf-8') as out: json.dump(data, out)
+    return path
+
+
+def run_pipeline(server, window, zones, recorder, prefilter, delta_hour_path, hour_path, model_class):
+    """ Hattı bir kez, soğuk bir istemciyle çalıştırır; aşama değerleri recorder'a yazılır, sayımlar döndürülür. """
+    stage = recorder.stage; counts = {}
+    client = USGSFeedClient(day_url=server.url('day'), hour_url=server.url('hour'), base_url=server.base_url); client.set_window(window)
+    client.set_prefilter(FeaturePrefilter.for_zones(zones) if prefilter else None)
+    server.set_feed('hour', hour_path)
+    try:
+        with stage('fetch_baseline'): result = client.fetch()
+        if not result.ok: raise RuntimeError(f"Temel akış alınamadı: {result.error}")
+        store = result.store; counts['events'] = len(store)
+        with stage('match_zones'): zone_matches = process_earthquake_data(store, zones)
+        with stage('merge_matches'): rows, distances, zone_ids, zone_names = merge_zone_matches(zone_matches)
+        counts['matched'] = len(rows)
+        with stage('cluster_build'): ids = store.ids; index = ClusterIndex(store.lat[rows], store.lon[rows], store.mag[rows], [ids[row] for row in rows.tolist()])
+        model = model_class() if model_class else None
+        if model is not None:
+            with stage('nearby_model_full'): model.apply(store, rows, distances, zone_ids, zone_names)
+        primary = zones[0]; region_zoom = zoom_for_radius(primary.radius_km)
+        region = (region_zoom, primary.lon - 10.0, primary.lat - 8.0, primary.lon + 10.0, primary.lat + 8.0)
+        tracker = MapDiffTracker()
+        for name, viewport in (('map_viewport_world', WORLD_VIEWPORT), ('map_viewport_region', region)):
+            with stage(name):
+                current = {}
+                for key, lat, lon, count, max_mag, leaf in index.get_clusters(*viewport):
+                    record = store.get(key) if leaf >= 0 else None
+                    current[key] = marker_payload(key, lat, lon, count, max_mag, event_tooltip(record) if record else cluster_tooltip(count, max_mag))
+                payload = json.dumps(tracker.diff(current), ensure_ascii=False)
+            counts[name + '_markers'] = len(current); counts[name + '_bytes'] = len(payload)
+        with stage('map_base_html'): build_base_map_html(primary.location, region_zoom)
+        server.set_feed('hour', delta_hour_path)
+        with stage('fetch_delta'): delta = client.fetch()
+        if delta.ok:
+            counts['delta_changes'] = len(delta.changes)
+            with stage('match_zones_delta'): delta_matches = process_earthquake_data(delta.store, zones)
+            if model is not None:
+                merged = merge_zone_matches(delta_matches)
+                with stage('nearby_model_delta'): model.apply(delta.store, *merged, changes=delta.changes if delta.changed else ChangeSet())
+        with stage('fetch_not_modified'): client.fetch()
+    finally: client.close()
+    return counts
+
+
+def _environment():
+    try: commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError): commit = None
+    return {'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'), 'git_commit': commit, 'python': platform.python_version(),
+            'implementation': platform.python_implementation(), 'platform': platform.platform(), 'machine': platform.machine(), 'cpu_count': os.cpu_count(), 'numpy': np.__version__}
+
+
+def run(args):
+    zones = [WatchZone("Hedef Konum", 41.0082, 28.9784, args.radius, args.min_magnitude), WatchZone("Ek Bölge", 38.4237, 27.1428, min(args.radius, 500), args.min_magnitude)]
+    model_class = None if args.no_qt else _nearby_model_class()
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.events: window = 'month'; baseline_path = synthetic_path(args.events, workdir); source = f"synthetic:{args.events}"
+        else: window = args.feed; baseline_path = fixture_path(window, workdir); source = ('recorded:' if is_recorded(window) else 'synthetic:') + window
+        hour_path = fixture_path('hour', workdir); delta_hour_path = _write_delta_hour(hour_path, workdir)
+        with FeedServer({'day': baseline_path, 'hour': hour_path}, latency_s=args.latency, etag=args.etag, mbps=args.mbps) as server:
+            if window != 'day': server.set_feed(window, baseline_path)
+            timings = []; counts = {}
+            for _ in range(args.repeat):
+                recorder = StageRecorder(); counts = run_pipeline(server, window, zones, recorder, args.prefilter, delta_hour_path, hour_path, model_class); timings.append(recorder.values)
+            memory = StageRecorder(trace_memory=True); tracemalloc.start()
+            try: run_pipeline(server, window, zones, memory, args.prefilter, delta_hour_path, hour_path, model_class)
+            finally: tracemalloc.stop()
+            requests_seen = [status for _, status, _ in server.requests]
+    stages = {}
+    for name in timings[0]:
+        samples = [values[name] for values in timings if name in values]
+        stages[name] = {'seconds': statistics.median(samples), 'seconds_min': min(samples), 'seconds_max': max(samples), 'peak_bytes': memory.values.get(name)}
+    return {'schema': SCHEMA_VERSION, 'environment': _environment(),
+            'config': {'source': source, 'window': window, 'repeat': args.repeat, 'latency_s': args.latency, 'etag': args.etag, 'mbps': args.mbps,
+                       'prefilter': args.prefilter, 'radius_km': args.radius, 'min_magnitude': args.min_magnitude, 'qt_model': model_class is not None},
+            'counts': counts, 'http': {'requests': len(requests_seen), 'not_modified': requests_seen.count(304)}, 'stages': stages}
+
+
+def compare(result, previous):
+    """ Her aşama için önceki çalıştırmaya göre süre ve bellek oranları (>1: daha yavaş / daha çok). """
+    rows = []
+    for name, stage in result['stages'].items():
+        old = previous.get('stages', {}).get(name)
+        if not old: rows.append((name, None, None)); continue
+        time_ratio = stage['seconds'] / old['seconds'] if old.get('seconds') else None
+        memory_ratio = stage['peak_bytes'] / old['peak_bytes'] if old.get('peak_bytes') and stage.get('peak_bytes') is not None else None
+        rows.append((name, time_ratio, memory_ratio))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deprem hattı aşama kıyaslaması (yerel akış sunucusuyla)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--feed', choices=[name for name in FEED_NAMES if name != 'hour'], default='day', help="Temel akış (kayıtlı ya da sentetik)")
+    source.add_argument('--events', type=int, help="Bu kadar olaylık sentetik akış kullan (1M'a kadar)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help="Sunucu yanıt gecikmesi (saniye)")
+    parser.add_argument('--etag', choices=ETAG_MODES, default='strong')
+    parser.add_argument('--mbps', type=float, default=0.0, help="Bant genişliği sınırı (Mbit/s); 0 = sınırsız")
+    parser.add_argument('--radius', type=float, default=5000.0, help="Ana bölge yarıçapı (km); büyük değer liste/harita aşamalarını zorlar")
+    parser.add_argument('--min-magnitude', type=float, default=0.0)
+    parser.add_argument('--prefilter', action='store_true', help="Akış süzgecini (FeaturePrefilter) etkinleştir")
+    parser.add_argument('--no-qt', action='store_true', help="Qt liste modeli aşamalarını atla")
+    parser.add_argument('--output', help="JSON sonucu bu dosyaya yaz")
+    parser.add_argument('--compare', help="Önceki bir --output dosyasıyla karşılaştır")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(); result = run(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out: json.dump(result, out, indent=2)
+    if args.json: print(json.dumps(result, indent=2)); return
+    config = result['config']; counts = result['counts']
+    print(f"Kaynak: {config['source']}, {counts.get('events')} olay, {counts.get('matched')} eşleşme, tekrar={config['repeat']}, ETag={config['etag']}, gecikme={config['latency_s']} s")
+    for name, stage in result['stages'].items():
+        peak = f"{stage['peak_bytes'] / 1e6:8.2f} MB" if stage['peak_bytes'] is not None else "       ?"
+        print(f"  {name:22s} {stage['seconds'] * 1000:10.2f} ms  (min {stage['seconds_min'] * 1000:.2f})  en yüksek ek bellek {peak}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous_file: previous = json.load(previous_file)
+        print(f"Karşılaştırma ({previous.get('environment', {}).get('git_commit')} -> {result['environment']['git_commit']}):")
+        for name, time_ratio, memory_ratio in compare(result, previous):
+            if time_ratio is None and memory_ratio is None: print(f"  {name:22s} önceki sonuçta yok"); continue
+            print(f"  {name:22s} süre " + (f"x{time_ratio:.2f}" if time_ratio is not None else "?") + (f", bellek x{memory_ratio:.2f}" if memory_ratio is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Kayıttan oynatma kıyaslaması: sentetik bir artçı dizisi (Omori yasasına göre ilk dakikalarda yoğun) farklı hızlarda
+# arayüzsüz oynatılır; her hız için tur gecikmesi (ortalama, p50/p95/p99, en çok), düşen turlar ve bildirim sayısı yazılır.
+# Ağ isteği yapılmaz; bildirimler atılır (yazıcı yok). Her hız süre sınırına (--duration) ya da kaydın sonuna kadar oynar.
+# Kullanım: python benchmarks/bench_replay.py [--events 5000] [--speeds 60 300 1000] [--tick 0.5] [--duration 20] [--min-magnitude 2] [--json]
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__)); ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+from deprem_replay import ReplaySession, load_recording, run_headless  # noqa: E402
+from deprem_settings import default_settings  # noqa: E402
+from synthetic_feed import iter_aftershock_features, write_collection  # noqa: E402
+
+MAINSHOCK_MS = 1675646254000  # 2023-02-06 01:17:34 UTC
+EPICENTER = (37.17, 37.03)
+
+
+def write_sequence(path, count, seed=0):
+    with open(path, 'wb') as out:
+        write_collection(out, count, now_ms=MAINSHOCK_MS, title="Sentetik artçı dizisi", features=iter_aftershock_features(count, seed=seed, start_ms=MAINSHOCK_MS, lat=EPICENTER[0], lon=EPICENTER[1]))
+
+
+def run_speed(recording, speed, tick_s, duration_s, settings):
+    session = ReplaySession(recording, speed, tick_s); stop = threading.Event(); timer = threading.Timer(duration_s, stop.set); timer.start()
+    try: summary = run_headless(session, settings, [], stop=stop)
+    finally: timer.cancel()
+    return dict(summary, speed=speed, tick_s=tick_s, published=session.client.published)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=5000); parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--speeds', type=float, nargs='+', default=[60.0, 300.0, 1000.0])
+    parser.add_argument('--tick', type=float, default=0.5); parser.add_argument('--duration', type=float, default=20.0, help="Hız başına en uzun gerçek süre (sn)")
+    parser.add_argument('--min-magnitude', type=float, default=2.0, help="Bildirim eşiği (düşük eşik turları ağırlaştırır)"); parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    settings = dict(default_settings(), target_lat=EPICENTER[0], target_lon=EPICENTER[1], radius_km=200, min_magnitude=args.min_magnitude, archive_enabled=False)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "artci.geojson"); write_sequence(path, args.events, args.seed); recording = load_recording(path)
+        results = [run_speed(recording, speed, args.tick, args.duration, settings) for speed in args.speeds]
+    if args.json: print(json.dumps(results, indent=2)); return
+    print(f"{args.events} olaylık sentetik artçı dizisi, tur aralığı {args.tick:g} sn, hız başına en çok {args.duration:g} sn")
+    print(f"{'hız':>6} {'tur':>5} {'düşen':>6} {'olay':>7} {'tur/en çok':>10} {'bildirim':>8} {'ort ms':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'en çok':>8}")
+    for r in results:
+        latency = r['latency_ms']
+        print(f"{r['speed']:>5g}x {r['ticks']:>5} {r['dropped']:>6} {r['events']:>7} {r['max_tick_events']:>10} {r['alerts']:>8} "
+              f"{latency['mean']:>8.1f} {latency['p50']:>7.1f} {latency['p95']:>7.1f} {latency['p99']:>7.1f} {latency['max']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
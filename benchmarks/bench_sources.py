@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Çok kaynaklı akış kıyaslaması: aynı sentetik deprem kümesinden USGS, EMSC, AFAD ve Kandilli biçiminde (zaman, konum ve
+# büyüklük sapmalarıyla) akışlar üretilir ve yerel sunucudan (feed_server) sunulur. Bağdaştırıcılar bu sunucuya karşı
+# çalıştırılır; eşzamanlı ve sıralı çekme süreleri, birleştirmenin doğruluğu (yanlış birleşen / bölünen olaylar) ve
+# EventMatcher ile ikili (O(n²)) karşılaştırmanın süreleri ölçülür.
+# Kullanım: python benchmarks/bench_sources.py [--events 3000] [--latency 0.3] [--json]
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+from deprem_feed import USGSFeedClient  # noqa: E402
+from deprem_sources import AFADSource, EMSCSource, EventMatcher, KandilliSource, KANDILLI_UTC_OFFSET_H, MultiSourceFeedClient  # noqa: E402
+from feed_server import FeedServer  # noqa: E402
+from synthetic_feed import write_collection  # noqa: E402
+
+TURKEY_BOX = (36.0, 26.0, 42.0, 45.0)  # güney, batı, kuzey, doğu
+# Ajans: (en küçük bildirilen büyüklük, zaman sapması s, konum sapması km, büyüklük sapması)
+AGENCIES = {'usgs': (2.5, 3.0, 12.0, 0.3), 'emsc': (2.0, 3.0, 10.0, 0.3), 'afad': (0.0, 1.5, 5.0, 0.2), 'kandilli': (0.0, 1.5, 6.0, 0.3)}
+PRIORITY = ['afad', 'kandilli', 'emsc', 'usgs']
+DAY_MS = 24 * 3600 * 1000
+
+
+class PairwiseMatcher(EventMatcher):
+    """ Karşılaştırma için: her kayıt tüm kümelerle karşılaştırılır (O(n²)); eşleşme kuralları EventMatcher ile aynıdır. """
+
+    def _candidates(self, bucket, lat, lon): return range(len(self.clusters))
+
+
+def make_truth(count, seed, now_ms):
+    rng = random.Random(seed); south, west, north, east = TURKEY_BOX
+    return [(rng.uniform(south, north), rng.uniform(west, east), round(rng.uniform(2.0, 30.0), 1), round(1.0 + rng.expovariate(1.6), 1),
+             now_ms - rng.randint(60 * 1000, DAY_MS - 60 * 1000)) for _ in range(count)]
+
+
+def agency_reports(truth, agency, seed):
+    """ Ajansın bildirdiği (gerçek indeks, enlem, boylam, derinlik, büyüklük, zaman) kayıtları. """
+    min_mag, dt_s, dist_km, dmag = AGENCIES[agency]; rng = random.Random(f"{seed}-{agency}"); reports = []
+    for index, (lat, lon, depth, mag, time_ms) in enumerate(truth):
+        if mag < min_mag: continue
+        bearing = rng.uniform(0.0, 2.0 * math.pi); offset = rng.uniform(0.0, dist_km) / 111.2
+        reports.append((index, lat + offset * math.cos(bearing), lon + offset * math.sin(bearing) / math.cos(math.radians(lat)), depth,
+                        round(max(mag + rng.uniform(-dmag, dmag), 0.0), 1), time_ms + int(rng.uniform(-dt_s, dt_s) * 1000)))
+    return reports
+
+
+def _iso(time_ms, offset_h=0, sep='T'): return time.strftime(f'%Y-%m-%d{sep}%H:%M:%S', time.gmtime(time_ms / 1000 + offset_h * 3600)) + f".{time_ms % 1000:03d}"
+
+
+def write_feeds(truth, seed, now_ms, workdir):
+    """ Ajans biçimlerinde akış dosyalarını yazar; {ad: (yol, içerik türü)} ve {kayıt id'si: gerçek indeks} döndürür. """
+    paths = {}; truth_of = {}; reports = {agency: agency_reports(truth, agency, seed) for agency in AGENCIES}
+    features = []
+    for index, lat, lon, depth, mag, time_ms in reports['usgs']:
+        eq_id = f"us{index:08d}"; truth_of[eq_id] = index
+        features.append({"type": "Feature", "id": eq_id, "properties": {"mag": mag, "place": f"{index} km N of Sentetik", "time": time_ms, "updated": time_ms + 60000},
+                         "geometry": {"type": "Point", "coordinates": [round(lon, 4), round(lat, 4), depth]}})
+    for name, window_ms in (('day', DAY_MS), ('hour', 3600 * 1000)):
+        path = os.path.join(workdir, f"all_{name}.geojson"); selected = [f for f in features if f['properties']['time'] >= now_ms - window_ms]
+        with open(path, 'wb') as out: write_collection(out, len(selected), now_ms=now_ms, features=selected)
+        paths[name] = (path, 'application/geo+json')
+    emsc = []
+    for index, lat, lon, depth, mag, time_ms in reports['emsc']:
+        unid = f"2023{index:010d}"; truth_of[f"emsc:{unid}"] = index
+        emsc.append({"type": "Feature", "id": unid, "geometry": {"type": "Point", "coordinates": [round(lon, 4), round(lat, 4), -depth]},
+                     "properties": {"unid": unid, "time": _iso(time_ms) + "Z", "lastupdate": _iso(time_ms + 120000) + "Z", "lat": round(lat, 4), "lon": round(lon, 4),
+                                    "depth": depth, "mag": mag, "magtype": "ml", "flynn_region": "WESTERN TURKEY", "auth": "EMSC"}})
+    paths['emsc.json'] = (_dump(os.path.join(workdir, "emsc.json"), {"type": "FeatureCollection", "metadata": {"count": len(emsc)}, "features": emsc}), 'application/json')
+    afad = []
+    for index, lat, lon, depth, mag, time_ms in reports['afad']:
+        event_id = str(500000 + index); truth_of[f"afad:{event_id}"] = index
+        afad.append({"rms": "0.5", "eventID": event_id, "location": f"Merkez ({index % 81})", "latitude": f"{lat:.5f}", "longitude": f"{lon:.5f}", "depth": f"{depth:.2f}",
+                     "type": "ML", "magnitude": f"{mag:.1f}", "country": "Türkiye", "province": "Sentetik", "district": "Merkez", "neighborhood": None,
+                     "date": _iso(time_ms)[:19], "isEventUpdate": False, "lastUpdateDate": None})
+    paths['afad.json'] = (_dump(os.path.join(workdir, "afad.json"), afad), 'application/json')
+    lines = ["<HTML><BODY><pre>", "Tarih      Saat      Enlem(N)  Boylam(E) Derinlik(km)  MD   ML   Mw    Yer                                             Çözüm Niteliği",
+             "---------- --------  --------  -------   ----------    ------------    --------------                                  --------------"]
+    for index, lat, lon, depth, mag, time_ms in sorted(reports['kandilli'], key=lambda report: -report[5]):
+        stamp = time.strftime('%Y.%m.%d %H:%M:%S', time.gmtime(time_ms // 1000 + KANDILLI_UTC_OFFSET_H * 3600))
+        truth_of[f"kandilli:{stamp.replace('.', '').replace(':', '').replace(' ', '')}"] = index
+        lines.append(f"{stamp}  {lat:7.4f}   {lon:7.4f}       {depth:5.1f}      -.-  {mag:3.1f}  -.-   {'KÖY-İLÇE (SENTETİK)':<50}İlksel")
+    path = os.path.join(workdir, "lst0.asp")
+    with open(path, 'wb') as out: out.write(("\r\n".join(lines + ["</pre></BODY></HTML>"])).encode('cp1254'))
+    paths['lst0.asp'] = (path, 'text/html')
+    return paths, truth_of, {agency: len(agency_reports) for agency, agency_reports in reports.items()}
+
+
+def _dump(path, data):
+    with open(path, 'w', encoding='utf-8') as out: json.dump(data, out)
+    return path
+
+
+def _clients(server):
+    usgs = USGSFeedClient(day_url=server.url('day'), hour_url=server.url('hour'), base_url=server.base_url)
+    return usgs, [AFADSource(server.origin + "/afad.json"), KandilliSource(server.origin + "/lst0.asp"), EMSCSource(server.origin + "/emsc.json")]
+
+
+def _quality(clusters, truth_of):
+    """ Yanlış birleşen (birden çok gerçek olay içeren) kümeler ve birden çok kümeye bölünen gerçek olaylar. """
+    false_merges = 0; clusters_of = {}
+    for index, cluster in enumerate(clusters):
+        truths = {truth_of[values[0]] for _, values in cluster}
+        if len(truths) > 1: false_merges += 1
+        for truth in truths: clusters_of.setdefault(truth, set()).add(index)
+    return false_merges, sum(1 for indices in clusters_of.values() if len(indices) > 1)
+
+
+def run(events, latency, seed=7):
+    now_ms = int(time.time() * 1000); truth = make_truth(events, seed, now_ms)
+    with tempfile.TemporaryDirectory() as workdir:
+        paths, truth_of, reported = write_feeds(truth, seed, now_ms, workdir)
+        with FeedServer(latency_s=latency) as server:
+            for name, (path, content_type) in paths.items(): server.set_feed(name, path, content_type)
+            usgs, sources = _clients(server); client = MultiSourceFeedClient(usgs, sources, PRIORITY)
+            start = time.perf_counter(); result = client.fetch(); concurrent_s = time.perf_counter() - start
+            start = time.perf_counter(); unchanged = client.fetch(); unchanged_s = time.perf_counter() - start
+            rows = {name: list(client._rows[name]) for name in PRIORITY}; client.close()
+            usgs, sources = _clients(server); start = time.perf_counter(); usgs.fetch()
+            for source in sources: source.fetch(DAY_MS, now_ms)
+            sequential_s = time.perf_counter() - start; usgs.close()
+            for source in sources: source.close()
+    assert result.ok, result.error
+    timings = {}; quality = {}
+    for name, matcher_class in (('grid', EventMatcher), ('pairwise', PairwiseMatcher)):
+        start = time.perf_counter(); matcher = matcher_class()
+        for source in PRIORITY:
+            for values in rows[source]: matcher.add(source, values)
+        timings[name] = time.perf_counter() - start; quality[name] = (len(matcher),) + _quality(matcher.clusters, truth_of)
+    return {'events': events, 'latency_s': latency, 'reported': reported, 'records': sum(len(r) for r in rows.values()), 'merged_events': len(result.store),
+            'fetch_concurrent_s': concurrent_s, 'fetch_sequential_s': sequential_s, 'fetch_unchanged_s': unchanged_s, 'unchanged_status': unchanged.status_code,
+            'match_grid_s': timings['grid'], 'match_pairwise_s': timings['pairwise'],
+            'grid': dict(zip(('clusters', 'false_merges', 'split_events'), quality['grid'])), 'pairwise': dict(zip(('clusters', 'false_merges', 'split_events'), quality['pairwise']))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok kaynaklı akış ve ajanslar arası birleştirme kıyaslaması")
+    parser.add_argument('--events', type=int, nargs='+', default=[3000], help="Gerçek (sentetik) deprem sayısı")
+    parser.add_argument('--latency', type=float, default=0.3, help="Her yanıttan önceki gecikme (saniye)")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(); results = [run(n, args.latency) for n in args.events]
+    if args.json: print(json.dumps(results, indent=2)); return
+    for r in results:
+        print(f"{r['events']} gerçek olay; bildirilen: " + ", ".join(f"{agency}={count}" for agency, count in r['reported'].items()) + f" (toplam {r['records']} kayıt)")
+        print(f"  çekme: eşzamanlı {r['fetch_concurrent_s'] * 1000:.0f} ms, sıralı {r['fetch_sequential_s'] * 1000:.0f} ms, değişmeyen tur {r['fetch_unchanged_s'] * 1000:.0f} ms (durum {r['unchanged_status']})")
+        print(f"  birleşen olay: {r['merged_events']}")
+        for name in ('grid', 'pairwise'):
+            q = r[name]; print(f"  {name:8s}: {r['match_' + name + '_s'] * 1000:8.1f} ms, {q['clusters']} küme, yanlış birleşen {q['false_merges']}, bölünen {q['split_events']}")
+
+
+if __name__ == "__main__":
+    main()
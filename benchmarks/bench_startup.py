@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Başlangıç süresi ve bellek (RSS) karşılaştırması: arayüzsüz kip ile masaüstü arayüzü, her biri ayrı bir süreçte.
+# Arayüz ekransız (QT_QPA_PLATFORM=offscreen) açılır; harita sekmesi (QtWebEngine/Chromium) ayrıca "map" adımında ölçülür.
+# Ağ isteği yapılmaz: süreler ilk sorgudan hemen öncesine kadardır.
+# Kullanım: python benchmarks/bench_startup.py [--modes headless gui] [--repeat 3] [--json]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHILD_TIMEOUT_S = 120
+
+# Alt süreçte çalışan ölçüm kodu; sonuç tek bir JSON satırı olarak yazdırılır
+_CHILD = r'''
+import json, logging, os, sys, time
+start = time.perf_counter(); sys.path.insert(0, ROOT); mode = MODE; result = {}
+def _rss_mb():
+    try: import resource
+    except ImportError: return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+if mode == 'headless':
+    import deprem_headless; result['import_s'] = time.perf_counter() - start
+    from deprem_settings import load_settings
+    monitor = deprem_headless.HeadlessMonitor(load_settings(), []); monitor.close()
+else:
+    import deprem_gui; result['import_s'] = time.perf_counter() - start
+    from PySide6.QtCore import QCoreApplication, Qt
+    from PySide6.QtWidgets import QApplication
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts); app = QApplication([sys.argv[0]])
+    window = deprem_gui.EarthquakeMainWindow(); window.show(); app.processEvents()
+    if mode == 'map':
+        ready = time.perf_counter() - start
+        try: import PySide6.QtWebEngineWidgets  # Yüklenemezse pencere modal hata kutusu açar; önceden denenir
+        except ImportError as e: result['map_error'] = f"{type(e).__name__}: {e}"
+        else: window.initialize_map_view(); app.processEvents(); result['map_s'] = time.perf_counter() - start - ready
+result['ready_s'] = time.perf_counter() - start; result['rss_mb'] = _rss_mb()
+result['modules'] = len(sys.modules); result['qt_loaded'] = 'PySide6.QtWidgets' in sys.modules; result['webengine_loaded'] = 'PySide6.QtWebEngineWidgets' in sys.modules
+logging.disable(logging.CRITICAL); print('BENCH ' + json.dumps(result)); sys.stdout.flush(); os._exit(0)
+'''
+
+
+def run_mode(mode, repeat):
+    """ Her tekrarda yeni bir süreç başlatır; en hızlı turun sonucunu (duvar saati dahil) döndürür. """
+    env = dict(os.environ); env.setdefault('QT_QPA_PLATFORM', 'offscreen'); best = None
+    code = _CHILD.replace('ROOT', repr(ROOT)).replace('MODE', repr(mode))
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as workdir:  # Ayar ve arşiv dosyaları geçici dizinde oluşur
+            start = time.perf_counter(); proc = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env, capture_output=True, text=True, timeout=CHILD_TIMEOUT_S)
+            wall_s = time.perf_counter() - start
+        lines = [line for line in proc.stdout.splitlines() if line.startswith('BENCH ')]
+        if not lines: return {'mode': mode, 'error': (proc.stderr.strip().splitlines() or ["çıktı yok"])[-1]}
+        result = json.loads(lines[-1][len('BENCH '):]); result['mode'] = mode; result['wall_s'] = wall_s
+        if best is None or wall_s < best['wall_s']: best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arayüzsüz kip / masaüstü arayüzü başlangıç kıyaslaması")
+    parser.add_argument('--modes', nargs='+', choices=['headless', 'gui', 'map'], default=['headless', 'gui', 'map'],
+                        help="map: arayüz + harita sekmesi (QtWebEngine yüklenebiliyorsa)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(); results = [run_mode(mode, args.repeat) for mode in args.modes]
+    if args.json: print(json.dumps(results, indent=2)); return
+    for r in results:
+        if 'error' in r: print(f"{r['mode']}: çalıştırılamadı ({r['error']})"); continue
+        rss = f"{r['rss_mb']:.0f} MB" if r['rss_mb'] is not None else "?"
+        print(f"{r['mode']}: süreç={r['wall_s'] * 1000:.0f} ms, içe aktarma={r['import_s'] * 1000:.0f} ms, hazır={r['ready_s'] * 1000:.0f} ms, "
+              f"en yüksek RSS={rss}, modül={r['modules']}, Qt={'evet' if r['qt_loaded'] else 'hayır'}, WebEngine={'evet' if r['webengine_loaded'] else 'hayır'}")
+        if 'map_s' in r: print(f"  harita sekmesi: {r['map_s'] * 1000:.0f} ms")
+        if 'map_error' in r: print(f"  harita sekmesi açılamadı: {r['map_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Ham GeoJSON sözlük listesi ile sütunlu EventStore'un bellek ve işlem hızı karşılaştırması (aylık akış boyutu).
+# Kullanım: python benchmarks/bench_store.py [--events 12000] [--json]
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from deprem_distance import batch_distances, feature_coordinates  # noqa: E402
+from deprem_store import EventStore  # noqa: E402
+from synthetic_feed import generate_collection  # noqa: E402
+
+TARGET = (41.0082, 28.9784); MIN_MAGNITUDE = 2.5; RADIUS_KM = 5000.0
+
+
+def _measure_memory(build):
+    gc.collect(); tracemalloc.start(); obj = build(); current, _ = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    return obj, current
+
+
+def _best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter(); func(); best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _dict_pipeline(features):
+    """ Eski yol: her sözlüğe uzaklık ekle, filtrele, uzaklığa göre sırala. """
+    lats, lons = feature_coordinates(features)
+    for eq, distance in zip(features, batch_distances(TARGET, lats, lons).tolist()): eq['distance_from_target'] = distance
+    selected = [eq for eq in features if eq['properties'].get('mag', 0.0) >= MIN_MAGNITUDE and eq['distance_from_target'] <= RADIUS_KM]
+    return sorted(selected, key=lambda eq: eq['distance_from_target'])
+
+
+def _store_pipeline(store):
+    store.compute_distances(TARGET)
+    return store.sort_rows(store.filter_rows(min_magnitude=MIN_MAGNITUDE, max_distance=RADIUS_KM), 'distance')
+
+
+def run(events):
+    payload = json.dumps(generate_collection(events, seed=7)); ids = [f["id"] for f in json.loads(payload)["features"]]
+    features, dict_bytes = _measure_memory(lambda: json.loads(payload)["features"])
+    store, store_bytes = _measure_memory(lambda: EventStore.from_features(json.loads(payload)["features"]))
+    lookup_ids = ids[::7]; by_id = {eq['id']: eq for eq in features}
+    result = {'events': events, 'memory_bytes': {'dicts': dict_bytes, 'store': store_bytes, 'ratio': dict_bytes / store_bytes if store_bytes else None},
+              'seconds': {'dicts_filter_sort': _best_of(lambda: _dict_pipeline(features)), 'store_filter_sort': _best_of(lambda: _store_pipeline(store)),
+                          'dicts_lookup': _best_of(lambda: [by_id[i]['properties']['mag'] for i in lookup_ids]), 'store_lookup': _best_of(lambda: [store.get(i).mag for i in lookup_ids]),
+                          'store_build_from_features': _best_of(lambda: EventStore.from_features(features), 3)}}
+    assert len(_dict_pipeline(features)) == len(_store_pipeline(store))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventStore bellek/hız kıyaslaması")
+    parser.add_argument('--events', type=int, nargs='+', default=[12000, 100000], help="Olay sayısı (aylık USGS akışı ~10-12 bin olay)")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(); results = [run(n) for n in args.events]
+    if args.json: print(json.dumps(results, indent=2)); return
+    for r in results:
+        mem = r['memory_bytes']; sec = r['seconds']
+        print(f"{r['events']} olay: bellek sözlük={mem['dicts'] / 1e6:.1f} MB, depo={mem['store'] / 1e6:.2f} MB ({mem['ratio']:.0f}x daha az)")
+        print(f"  filtre+sıralama: sözlük={sec['dicts_filter_sort'] * 1000:.2f} ms, depo={sec['store_filter_sort'] * 1000:.2f} ms ({sec['dicts_filter_sort'] / sec['store_filter_sort']:.1f}x)")
+        print(f"  id ile erişim ({len(range(0, r['events'], 7))} adet): sözlük={sec['dicts_lookup'] * 1000:.2f} ms, depo={sec['store_lookup'] * 1000:.2f} ms; depo kurulumu={sec['store_build_from_features'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
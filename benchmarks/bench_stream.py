@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# response.json() + EventStore.from_features ile akış halinde ayrıştırma (deprem_stream) karşılaştırması: en yüksek
+# Python bellek kullanımı (tracemalloc), ilk olaya kadar geçen süre ve toplam süre. Sentetik akış yerel bir HTTP
+# sunucusundan requests ile indirilir; --mbps ile bant genişliği sınırlanabilir.
+# Kullanım: python benchmarks/bench_stream.py [--events 12000 100000] [--min-magnitude 2.5] [--mbps 0] [--json]
+import argparse
+import gc
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from deprem_store import EventStore  # noqa: E402
+from deprem_stream import FeaturePrefilter, FeatureStream, STREAM_CHUNK_SIZE  # noqa: E402
+from deprem_zones import WatchZone  # noqa: E402
+from synthetic_feed import generate_collection  # noqa: E402
+
+WATCH_ZONES = [WatchZone("Hedef Konum", 41.0082, 28.9784, 150, 2.5), WatchZone("Ek Bölge", 38.4, 27.1, 300, 1.0)]
+SEND_BLOCK = 64 * 1024
+
+
+def _serve(body, mbps):
+    """ body'yi sunan yerel sunucu; mbps > 0 ise gönderim bu hızla sınırlanır. Adresi döndürür. """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200); self.send_header('Content-Type', 'application/geo+json'); self.send_header('Content-Length', str(len(body))); self.end_headers()
+            view = memoryview(body); delay = SEND_BLOCK * 8 / (mbps * 1e6) if mbps > 0 else 0.0
+            for offset in range(0, len(body), SEND_BLOCK):
+                self.wfile.write(view[offset:offset + SEND_BLOCK])
+                if delay: time.sleep(delay)
+
+        def log_message(self, *args): pass
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler); threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/all_month.geojson"
+
+
+def _json_path(session, url, prefilter):
+    """ Mevcut yol: tüm gövde ve tüm özellik sözlükleri bellekte; süzme depo kurulduktan sonra. """
+    start = time.perf_counter(); response = session.get(url); data = response.json(); first_s = time.perf_counter() - start
+    store = EventStore.from_features(data['features']); del data
+    keep = [eq_id for eq_id, lat, lon, mag in zip(store.ids, store.lat.tolist(), store.lon.tolist(), store.mag.tolist()) if prefilter.accepts(lat, lon, mag)]
+    return first_s, len(keep)
+
+
+def _stream_path(session, url, prefilter):
+    start = time.perf_counter(); first_s = None; store = EventStore()
+    with session.get(url, stream=True) as response:
+        stream = FeatureStream(response.iter_content(STREAM_CHUNK_SIZE), prefilter)
+        for values in stream:
+            if first_s is None: first_s = time.perf_counter() - start
+            store.upsert(*values)
+    return first_s, len(store)
+
+
+def _measure(func, *args):
+    """ Süreler izlemesiz bir turda, en yüksek bellek ayrı bir tracemalloc turunda ölçülür (izleme küçük ayırmaları yavaşlatır). """
+    gc.collect(); start = time.perf_counter(); first_s, kept = func(*args); total_s = time.perf_counter() - start
+    gc.collect(); tracemalloc.start(); func(*args); _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    return {'first_event_s': first_s, 'total_s': total_s, 'peak_bytes': peak, 'kept': kept}
+
+
+def run(events, min_magnitude, mbps):
+    zones = [WatchZone(zone.name, zone.lat, zone.lon, zone.radius_km, min_magnitude if i == 0 else zone.min_magnitude) for i, zone in enumerate(WATCH_ZONES)]
+    prefilter = FeaturePrefilter.for_zones(zones)
+    body = json.dumps(generate_collection(events, seed=11)).encode('utf-8'); server, url = _serve(body, mbps)
+    try:
+        with requests.Session() as session:
+            session.get(url).content  # Bağlantıyı ısıt
+            result = {'events': events, 'body_bytes': len(body), 'min_magnitude': min_magnitude, 'mbps': mbps,
+                      'json': _measure(_json_path, session, url, prefilter), 'stream': _measure(_stream_path, session, url, prefilter)}
+    finally: server.shutdown(); server.server_close()
+    assert result['json']['kept'] <= result['stream']['kept']  # Kutu süzgeci fazlasını tutabilir, eksiğini değil
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Akış halinde GeoJSON ayrıştırma kıyaslaması")
+    parser.add_argument('--events', type=int, nargs='+', default=[12000, 100000], help="Olay sayısı (aylık USGS akışı ~10-12 bin olay)")
+    parser.add_argument('--min-magnitude', type=float, default=2.5)
+    parser.add_argument('--mbps', type=float, default=0.0, help="Bant genişliği sınırı (Mbit/s); 0 = sınırsız")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(); results = [run(n, args.min_magnitude, args.mbps) for n in args.events]
+    if args.json: print(json.dumps(results, indent=2)); return
+    for r in results:
+        print(f"{r['events']} olay ({r['body_bytes'] / 1e6:.1f} MB gövde, M>={r['min_magnitude']}):")
+        for name in ('json', 'stream'):
+            m = r[name]
+            print(f"  {name:6s}: ilk olay={m['first_event_s'] * 1000:.0f} ms, toplam={m['total_s'] * 1000:.0f} ms, en yüksek bellek={m['peak_bytes'] / 1e6:.1f} MB, tutulan={m['kept']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# USGS özet akışı uç noktasının yerine geçen yerel HTTP sunucusu (kıyaslamalar ve ağsız denemeler için).
+# /earthquakes/feed/v1.0/summary/all_<ad>.geojson (ve diğer ajanslar için /<ad>) yollarını diskteki dosyalardan akış halinde sunar; gecikme,
+# bant genişliği ve ETag/Last-Modified davranışı ayarlanabilir. Her istek (yol, durum, gönderilen bayt) olarak kaydedilir.
+# Kullanım: python benchmarks/feed_server.py [--port 8000] [--latency 0.2] [--etag strong|weak|none|ignore] [--mbps 0]
+import argparse
+import email.utils
+import hashlib
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+FEED_PATH = "/earthquakes/feed/v1.0/summary/"
+ETAG_MODES = ('strong', 'weak', 'none', 'ignore')  # ignore: ETag gönderir ama koşullu istekleri yok sayar (hep 200)
+SEND_BLOCK = 64 * 1024
+
+
+class FeedServer:
+    """ feeds: {ad: dosya yolu}. set_feed ile akış içeriği çalışırken değiştirilebilir (yeni ETag üretilir). """
+
+    def __init__(self, feeds=None, latency_s=0.0, etag='strong', mbps=0.0, host='127.0.0.1', port=0):
+        if etag not in ETAG_MODES: raise ValueError(f"Bilinmeyen ETag kipi: {etag}")
+        self.latency_s = latency_s; self.etag = etag; self.mbps = mbps; self.requests = []
+        self._feeds = {}; self._lock = threading.Lock()
+        for name, path in (feeds or {}).items(): self.set_feed(name, path)
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler_class()); self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="feed-server", daemon=True); self._thread.start()
+
+    @property
+    def origin(self): return f"http://{self._server.server_address[0]}:{self._server.server_port}"
+
+    @property
+    def base_url(self): return self.origin + FEED_PATH
+
+    def url(self, name): return f"{self.base_url}all_{name}.geojson"
+
+    def set_feed(self, name, path, content_type='application/geo+json'):
+        """ ETag dosya içeriğinin özetidir; Last-Modified güncelleme anıdır. """
+        digest = hashlib.sha1()
+        with open(path, 'rb') as feed_file:
+            for block in iter(lambda: feed_file.read(1 << 20), b''): digest.update(block)
+        with self._lock: self._feeds[name] = (path, os.path.getsize(path), f'"{digest.hexdigest()}"', email.utils.formatdate(usegmt=True), content_type)
+
+    def close(self): self._server.shutdown(); self._server.server_close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Bağlantı yeniden kullanımı (istemci keep-alive kullanır)
+
+            def do_GET(self):
+                if server.latency_s: time.sleep(server.latency_s)
+                name = self.path.split('?', 1)[0]
+                name = name[len(FEED_PATH):] if name.startswith(FEED_PATH) else name.lstrip('/')
+                name = name[len('all_'):-len('.geojson')] if name.startswith('all_') and name.endswith('.geojson') else name
+                with server._lock: feed = server._feeds.get(name)
+                if feed is None: self._reply(404); return
+                path, size, etag, last_modified, content_type = feed
+                etag = etag if server.etag in ('strong', 'ignore') else ('W/' + etag if server.etag == 'weak' else None)
+                if server.etag != 'ignore':
+                    match = self.headers.get('If-None-Match')
+                    if (etag and match and match.replace('W/', '') == etag.replace('W/', '')) or (not etag and self.headers.get('If-Modified-Since') == last_modified):
+                        self._reply(304, etag=etag); return
+                self.send_response(200); self.send_header('Content-Type', content_type); self.send_header('Content-Length', str(size))
+                self.send_header('Last-Modified', last_modified); self.send_header('Cache-Control', 'max-age=60')
+                if etag: self.send_header('ETag', etag)
+                self.end_headers(); delay = SEND_BLOCK * 8 / (server.mbps * 1e6) if server.mbps > 0 else 0.0; sent = 0
+                with open(path, 'rb') as feed_file:
+                    for block in iter(lambda: feed_file.read(SEND_BLOCK), b''):
+                        self.wfile.write(block); sent += len(block)
+                        if delay: time.sleep(delay)
+                server.requests.append((self.path, 200, sent))
+
+            def _reply(self, status, etag=None):
+                self.send_response(status); self.send_header('Content-Length', '0')
+                if etag: self.send_header('ETag', etag)
+                self.end_headers(); server.requests.append((self.path, status, 0))
+
+            def log_message(self, *args): pass
+        return Handler
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from fixtures import FEED_NAMES, fixture_path
+    parser = argparse.ArgumentParser(description="Yerel USGS akış sunucusu (kayıtlı ya da sentetik veriler)")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="Her yanıttan önceki gecikme (saniye)")
+    parser.add_argument('--etag', choices=ETAG_MODES, default='strong')
+    parser.add_argument('--mbps', type=float, default=0.0, help="Bant genişliği sınırı (Mbit/s); 0 = sınırsız")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        feeds = {name: fixture_path(name, workdir) for name in FEED_NAMES}
+        with FeedServer(feeds, args.latency, args.etag, args.mbps, port=args.port) as server:
+            print(f"Akışlar: {', '.join(server.url(name) for name in FEED_NAMES)}")
+            try:
+                while True: time.sleep(3600)
+            except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
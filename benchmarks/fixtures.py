@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Kıyaslama akışları: benchmarks/fixtures/all_<ad>.geojson kayıtlı USGS yanıtlarıdır (--record ile indirilir). Kayıt yoksa
+# aynı boyutta, tekrarlanabilir sentetik akışlar üretilir; USGS'deki gibi saatlik ⊂ günlük ⊂ haftalık ⊂ aylık olur.
+# Kullanım: python benchmarks/fixtures.py --record [--feeds hour day week month]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_feed import iter_features, write_collection  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FEED_NAMES = ('hour', 'day', 'week', 'month')
+FEED_WINDOWS_MS = {'hour': 3600 * 1000, 'day': 24 * 3600 * 1000, 'week': 7 * 24 * 3600 * 1000, 'month': 30 * 24 * 3600 * 1000}
+SYNTHETIC_MONTH_EVENTS = 9500  # all_month.geojson tipik olarak ~9-12 bin olay içerir
+SYNTHETIC_SEED = 2023
+USGS_FEED_BASE_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/"
+
+
+def recorded_path(name): return os.path.join(FIXTURE_DIR, f"all_{name}.geojson")
+
+
+def fixture_path(name, workdir, now_ms=None):
+    """ Kayıtlı akış varsa onun yolu; yoksa workdir içine yazılan sentetik akışın yolu. """
+    if os.path.exists(recorded_path(name)): return recorded_path(name)
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000); cutoff_ms = now_ms - FEED_WINDOWS_MS[name]
+    features = [feature for feature in iter_features(SYNTHETIC_MONTH_EVENTS, seed=SYNTHETIC_SEED, now_ms=now_ms, window_ms=FEED_WINDOWS_MS['month'])
+                if feature['properties']['time'] >= cutoff_ms]
+    return _write(os.path.join(workdir, f"all_{name}.geojson"), len(features), now_ms=now_ms, features=features, title=f"USGS All Earthquakes, Past {name} (sentetik)")
+
+
+def synthetic_path(count, workdir, seed=SYNTHETIC_SEED, now_ms=None):
+    """ count olaylık (1M'a kadar) sentetik aylık akış; özellikler bellekte biriktirilmeden yazılır. """
+    return _write(os.path.join(workdir, f"synthetic_{count}.geojson"), count, seed=seed, now_ms=now_ms, window_ms=FEED_WINDOWS_MS['month'])
+
+
+def is_recorded(name): return os.path.exists(recorded_path(name))
+
+
+def _write(path, count, **kwargs):
+    with open(path, 'wb') as feed_file: write_collection(feed_file, count, **kwargs)
+    return path
+
+
+def record(names, base_url=USGS_FEED_BASE_URL):
+    import requests
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with requests.Session() as session:
+        for name in names:
+            response = session.get(f"{base_url}all_{name}.geojson", timeout=60); response.raise_for_status()
+            with open(recorded_path(name), 'wb') as feed_file: feed_file.write(response.content)
+            print(f"{name}: {len(response.content) / 1e6:.1f} MB -> {recorded_path(name)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="USGS akışlarını kıyaslama verisi olarak kaydeder")
+    parser.add_argument('--record', action='store_true', help="Akışları USGS'den indirip benchmarks/fixtures altına yaz")
+    parser.add_argument('--feeds', nargs='+', choices=FEED_NAMES, default=list(FEED_NAMES))
+    args = parser.parse_args()
+    if args.record: record(args.feeds); return
+    for name in args.feeds: print(f"{name}: {'kayıtlı (' + recorded_path(name) + ')' if is_recorded(name) else 'sentetik'}")
+
+
+if __name__ == "__main__":
+    main()
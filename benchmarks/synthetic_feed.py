@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# USGS özet akışı (GeoJSON) biçiminde, tekrarlanabilir sentetik deprem verisi üretir. Büyük akışlar (1M olaya kadar)
+# write_collection ile sözlük listesi tutulmadan doğrudan dosyaya yazılabilir.
+import json
+import random
+import time
+
+_PROPERTY_TEMPLATE = {"tz": None, "felt": None, "cdi": None, "mmi": None, "alert": None, "status": "automatic", "tsunami": 0,
+                      "nst": None, "dmin": None, "rms": 0.12, "gap": None, "magType": "ml", "type": "earthquake"}
+_NETWORKS = ("us", "ak", "ci", "nc", "hv", "nn", "pr", "tx", "uw", "ok")
+
+
+def generate_features(count, seed=0, now_ms=None, window_ms=30 * 24 * 3600 * 1000):
+    """ count adet USGS benzeri özellik üretir; olay zamanları [now - window, now] aralığına yayılır. """
+    return list(iter_features(count, seed=seed, now_ms=now_ms, window_ms=window_ms))
+
+
+def iter_features(count, seed=0, now_ms=None, window_ms=30 * 24 * 3600 * 1000):
+    """ generate_features ile aynı özellikleri tek tek üretir. """
+    rng = random.Random(seed); now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    for i in range(count):
+        net = _NETWORKS[i % len(_NETWORKS)]; code = f"{seed:02d}{i:08d}"; event_time = now_ms - rng.randint(0, window_ms)
+        # Büyüklükler Gutenberg-Richter benzeri: küçük depremler çok daha sık
+        mag = round(min(9.0, rng.expovariate(2.3) - 0.5), 2); lat = rng.uniform(-70.0, 70.0); lon = rng.uniform(-180.0, 180.0); depth = round(rng.uniform(0.0, 200.0), 2)
+        place = f"{rng.randint(1, 120)} km {rng.choice(('N', 'S', 'E', 'W', 'NE', 'SW'))} of Sentetik {i % 997}"
+        props = dict(_PROPERTY_TEMPLATE, mag=mag, place=place, time=event_time, updated=event_time + rng.randint(60000, 3600000),
+                     url=f"https://earthquake.usgs.gov/earthquakes/eventpage/{net}{code}", detail=f"https://earthquake.usgs.gov/earthquakes/feed/v1.0/detail/{net}{code}.geojson",
+                     sig=int(max(0.0, mag) * 100), net=net, code=code, ids=f",{net}{code},", sources=f",{net},", types=",origin,phase-data,", title=f"M {mag} - {place}")
+        yield {"type": "Feature", "properties": props, "geometry": {"type": "Point", "coordinates": [round(lon, 4), round(lat, 4), depth]}, "id": f"{net}{code}"}
+
+
+def iter_aftershock_features(count, seed=0, start_ms=0, lat=37.17, lon=37.03, duration_ms=7 * 24 * 3600 * 1000, omori_c_s=300.0, mainshock_mag=7.8):
+    """ Ana şok ve count - 1 artçıdan oluşan, zamana göre sıralı dizi (varsayılan konum Kahramanmaraş/Pazarcık). Artçı
+    zamanları Omori yasasına (sıklık ~ 1 / (t + c)) göre dağılır: ilk dakikalarda yoğun, sonra seyrek; konumlar merkez
+    çevresinde ~50 km, büyüklükler Gutenberg-Richter benzeri ve ana şoktan küçük. """
+    rng = random.Random(seed); c_ms = omori_c_s * 1000.0; span = (duration_ms + c_ms) / c_ms
+    offsets = sorted(c_ms * span ** rng.random() - c_ms for _ in range(count - 1))
+    for i, offset in enumerate([0.0] + offsets):
+        event_time = start_ms + int(offset); code = f"{seed:02d}{i:08d}"; net = "us"
+        mag = mainshock_mag if i == 0 else round(min(mainshock_mag - 0.3, 1.5 + rng.expovariate(2.3)), 1)
+        event_lat = lat + (rng.gauss(0.0, 0.3) if i else 0.0); event_lon = lon + (rng.gauss(0.0, 0.4) if i else 0.0); depth = round(rng.uniform(2.0, 20.0), 2)
+        place = f"{rng.randint(1, 40)} km {rng.choice(('N', 'S', 'E', 'W', 'NE', 'SW'))} of Sentetik Artçı {i % 97}"
+        props = dict(_PROPERTY_TEMPLATE, mag=mag, place=place, time=event_time, updated=event_time + rng.randint(60000, 600000),
+                     url=f"https://earthquake.usgs.gov/earthquakes/eventpage/{net}{code}", detail=f"https://earthquake.usgs.gov/earthquakes/feed/v1.0/detail/{net}{code}.geojson",
+                     sig=int(mag * 100), net=net, code=code, ids=f",{net}{code},", sources=f",{net},", types=",origin,phase-data,", title=f"M {mag} - {place}")
+        yield {"type": "Feature", "properties": props, "geometry": {"type": "Point", "coordinates": [round(event_lon, 4), round(event_lat, 4), depth]}, "id": f"{net}{code}"}
+
+
+def generate_collection(count, seed=0, now_ms=None, window_ms=30 * 24 * 3600 * 1000, title="USGS All Earthquakes (sentetik)"):
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    features = generate_features(count, seed=seed, now_ms=now_ms, window_ms=window_ms)
+    return {"type": "FeatureCollection", "metadata": _metadata(now_ms, title, count), "features": features, "bbox": [-180.0, -70.0, 0.0, 180.0, 70.0, 200.0]}
+
+
+def _metadata(now_ms, title, count): return {"generated": now_ms, "url": "", "title": title, "status": 200, "api": "1.14.1", "count": count}
+
+
+def write_collection(fileobj, count, seed=0, now_ms=None, window_ms=30 * 24 * 3600 * 1000, title="USGS All Earthquakes (sentetik)", features=None):
+    """ generate_collection çıktısını (ya da verilen features yinelenebilirini) bellekte biriktirmeden ikili dosyaya yazar. """
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    features = iter_features(count, seed=seed, now_ms=now_ms, window_ms=window_ms) if features is None else features
+    fileobj.write(('{"type": "FeatureCollection", "metadata": ' + json.dumps(_metadata(now_ms, title, count)) + ', "features": [').encode('utf-8'))
+    for i, feature in enumerate(features): fileobj.write(((', ' if i else '') + json.dumps(feature)).encode('utf-8'))
+    fileobj.write(b'], "bbox": [-180.0, -70.0, 0.0, 180.0, 70.0, 200.0]}')
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Kalıcı deprem arşivi (SQLite, WAL kipi). Her sorgu turunda olaylar id ve USGS 'updated' alanına göre
+# upsert edilir; zaman, büyüklük ve uzamsal hücre (deprem_zones ızgarası) sütunlarında indeks vardır.
+# Uygulama açılışta arayüzü ağdan önce arşivden doldurur; geçmiş sorguları da buradan yapılır.
+import logging
+import sqlite3
+import threading
+
+import numpy as np
+
+from deprem_distance import DEFAULT_DISTANCE_METHOD
+from deprem_store import EventStore
+from deprem_zones import DEFAULT_CELL_DEG, bbox_cell_ranges, candidate_cell_ranges, grid_cell_ids
+
+ARCHIVE_FILE = "deprem_arsiv.sqlite3"
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        id TEXT PRIMARY KEY, time INTEGER NOT NULL, updated INTEGER NOT NULL, mag REAL NOT NULL,
+        lat REAL, lon REAL, depth REAL, place TEXT, cell INTEGER
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_events_time ON events(time)",
+    "CREATE INDEX IF NOT EXISTS idx_events_mag_time ON events(mag, time)",
+    "CREATE INDEX IF NOT EXISTS idx_events_cell_time ON events(cell, time)",
+)
+_UPSERT_SQL = """INSERT INTO events (id, time, updated, mag, lat, lon, depth, place, cell) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET time=excluded.time, updated=excluded.updated, mag=excluded.mag, lat=excluded.lat, lon=excluded.lon,
+    depth=excluded.depth, place=excluded.place, cell=excluded.cell WHERE excluded.updated > events.updated"""
+_COLUMNS = "id, lat, lon, depth, mag, time, updated, place"
+
+
+def _nullable(values):
+    """ NaN değerleri SQLite NULL'a çevirir. """
+    return [None if v != v else v for v in values]
+
+
+class EventArchive:
+    """ İş parçacıkları arasında paylaşılabilen (tek bağlantı + kilit) SQLite deprem arşivi. """
+
+    def __init__(self, path=ARCHIVE_FILE, cell_deg=DEFAULT_CELL_DEG):
+        self.path = path; self.cell_deg = cell_deg; self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL"); self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY"); self._conn.execute("PRAGMA cache_size=-16000")
+            for statement in _SCHEMA: self._conn.execute(statement)
+        logging.info(f"Deprem arşivi açıldı: {path} ({self.count()} olay)")
+
+    def close(self):
+        with self._lock: self._conn.close()
+
+    def count(self):
+        with self._lock: return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def upsert_store(self, store, rows=None):
+        """ Depodaki (ya da yalnızca verilen satırlardaki) olayları arşive yazar; yalnızca daha yeni 'updated' değerleri üzerine yazılır. """
+        rows = np.arange(len(store)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if not len(rows): return 0
+        ids = store.ids; places = store.place; cells = grid_cell_ids(np.nan_to_num(store.lat[rows]), np.nan_to_num(store.lon[rows]), self.cell_deg).tolist()
+        params = zip([ids[r] for r in rows.tolist()], store.time[rows].tolist(), store.updated[rows].tolist(), store.mag[rows].tolist(),
+                     _nullable(store.lat[rows].tolist()), _nullable(store.lon[rows].tolist()), _nullable(store.depth[rows].tolist()),
+                     [places[r] for r in rows.tolist()], cells)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try: self._conn.executemany(_UPSERT_SQL, params); self._conn.execute("COMMIT")
+            except Exception: self._conn.execute("ROLLBACK"); raise
+        return len(rows)
+
+    def delete(self, eq_ids):
+        eq_ids = list(eq_ids)
+        if not eq_ids: return 0
+        with self._lock:
+            before = self._conn.total_changes; self._conn.execute("BEGIN")
+            try: self._conn.executemany("DELETE FROM events WHERE id = ?", ((eq_id,) for eq_id in eq_ids)); self._conn.execute("COMMIT")
+            except Exception: self._conn.execute("ROLLBACK"); raise
+            return self._conn.total_changes - before
+
+    def query(self, start_ms=None, end_ms=None, min_magnitude=None, max_magnitude=None, bbox=None, center=None, radius_km=None,
+              limit=None, method=DEFAULT_DISTANCE_METHOD):
+        """ Geçmiş sorgusu; sonuç bir EventStore'dur.
+        bbox=(min_enlem, min_boylam, maks_enlem, maks_boylam); center=(enlem, boylam) ve radius_km birlikte verilir.
+        Yarıçap sorgusu önce hücre aralıklarıyla indeksten adayları alır, sonra kesin uzaklıkla süzer
+        (verilen merkeze uzaklık 'distance' sütununa yazılır). limit verilirse en yeni olaylar döner. """
+        where = []; params = []
+        if start_ms is not None: where.append("time >= ?"); params.append(int(start_ms))
+        if end_ms is not None: where.append("time <= ?"); params.append(int(end_ms))
+        if min_magnitude is not None: where.append("mag >= ?"); params.append(float(min_magnitude))
+        if max_magnitude is not None: where.append("mag <= ?"); params.append(float(max_magnitude))
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox; ranges = bbox_cell_ranges(min_lat, min_lon, max_lat, max_lon, self.cell_deg)
+            where.append("(" + " OR ".join("cell BETWEEN ? AND ?" for _ in ranges) + ")"); params += [v for r in ranges for v in r]
+            where.append("lat BETWEEN ? AND ?"); params += [min_lat, max_lat]
+            if min_lon <= max_lon: where.append("lon BETWEEN ? AND ?"); params += [min_lon, max_lon]
+            else: where.append("(lon >= ? OR lon <= ?)"); params += [min_lon, max_lon]  # 180. meridyeni kesen kutu
+        if center is not None and radius_km is not None:
+            ranges = candidate_cell_ranges(center[0], center[1], radius_km, self.cell_deg)
+            if ranges is not None:
+                where.append("(" + " OR ".join("cell BETWEEN ? AND ?" for _ in ranges) + ")"); params += [v for r in ranges for v in r]
+        sql = f"SELECT {_COLUMNS} FROM events" + (" WHERE " + " AND ".join(where) if where else "")
+        if limit is not None: sql += " ORDER BY time DESC LIMIT ?"; params.append(int(limit))
+        with self._lock: rows = self._conn.execute(sql, params).fetchall()
+        store = EventStore(len(rows))
+        for eq_id, lat, lon, depth, mag, time_ms, updated_ms, place in rows:
+            store.upsert(eq_id, np.nan if lat is None else lat, np.nan if lon is None else lon, np.nan if depth is None else depth, mag, time_ms, updated_ms, place)
+        if center is not None and radius_km is not None and len(store):
+            ids = store.ids; store.remove([ids[row] for row in np.flatnonzero(store.compute_distances(center, method) > radius_km).tolist()])
+        return store
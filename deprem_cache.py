@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Olay başına türetilmiş değerlerin önbelleği: hedef konumlara uzaklıklar ve biçimlendirilmiş metinler (zaman, liste
+# satırı, harita ipucu ve açılır pencere HTML'i). Metinler olay id'si ve USGS 'updated' sürümüyle saklanır; olay
+# güncellenince eski metin kullanılmaz, değişiklik kümeleri (invalidate) ve depodan düşen olaylar (retain) belleği açıkça
+# boşaltır. Uzaklıklar her hedef konum için depo satırlarına hizalı bir sütun olarak tutulur (olay başına sözlük araması
+# toplu NumPy hesabından yavaştır); yeni anlık görüntüde değerler aynı id ve 'updated' sürümündeki olaylar için yeni satırlara
+# taşınır, yalnızca eklenen/güncellenen olaylar yeniden hesaplanır. Büyüklük/yarıçap/konum ayarları değişince eşleşmeler ağa
+# gitmeden bu değerlerle yeniden hesaplanır; yalnızca yeni hedefler için eksik uzaklıklar hesaplanır.
+import collections
+import threading
+
+import numpy as np
+
+from deprem_distance import batch_distances, DEFAULT_DISTANCE_METHOD
+from deprem_metrics import METRICS
+
+DEFAULT_MAX_TARGETS = 8  # Uzaklıkları saklanan en fazla hedef konum (ana konum + izleme bölgeleri); en eski kullanılan atılır
+
+
+class DerivedCache:
+    """ Uzaklıklar arka plan işçisinde, metinler arayüz iş parçacığında istenir; iç sözlükler tek kilitle korunur.
+    distances()'a verilen depolar sorgu hattının ürettiği, yerinde değiştirilmeyen anlık görüntülerdir. """
+
+    def __init__(self, max_targets=DEFAULT_MAX_TARGETS):
+        self.max_targets = max_targets; self._lock = threading.Lock()
+        self._store = None; self._columns = collections.OrderedDict()  # (enlem, boylam, yöntem) -> uzaklık sütunu (hesaplanmamış: NaN)
+        self._text = {}  # id -> (updated, {tür: değer})
+
+    def __len__(self): return len(self._text)
+
+    def clear(self):
+        with self._lock: self._store = None; self._columns.clear(); self._text.clear()
+
+    def invalidate(self, changes):
+        """ ChangeSet'te güncellenen ve silinen olayların metinlerini atar; atılan girdi sayısını döndürür. """
+        gone = changes.updated + changes.removed
+        if not gone: return 0
+        with self._lock: return sum(self._text.pop(eq_id, None) is not None for eq_id in gone)
+
+    def retain(self, store):
+        """ Depoda olmayan olayların metinlerini atar (arşivden yükleme, pencere değişimi gibi tam yenilemelerden sonra). """
+        with self._lock: self._text = {eq_id: value for eq_id, value in self._text.items() if eq_id in store}
+
+    def _carry_over(self, store):
+        """ Sütunları yeni anlık görüntünün satırlarına taşır: önceki görüntüde aynı id ve 'updated' ile bulunan olayların
+        değerleri korunur, eklenen/güncellenen olaylar NaN (hesaplanmamış) olur. Kilit tutulurken çağrılır. """
+        previous = self._store; self._store = store
+        if previous is None or not self._columns: self._columns.clear(); return
+        old_rows = np.fromiter((-1 if row is None else row for row in map(previous.row_of, store.ids)), dtype=np.int64, count=len(store))
+        kept = np.flatnonzero(old_rows >= 0); kept = kept[previous.updated[old_rows[kept]] == store.updated[kept]]; source = old_rows[kept]
+        for key, column in self._columns.items():
+            carried = np.full(len(store), np.nan); carried[kept] = column[source]; self._columns[key] = carried
+        METRICS.inc('derived_cache_total', len(kept) * len(self._columns), kind='distance', result='carried')
+
+    def distances(self, store, target_location, method=DEFAULT_DISTANCE_METHOD, rows=None):
+        """ Hedefe uzaklıklar (km; rows sırasıyla, rows=None ise tüm satırlar). Aynı hedef için daha önce hesaplanmış
+        (önceki anlık görüntülerden taşınan) satırlar yeniden hesaplanmaz; eksikler tek bir toplu geçişte hesaplanır. """
+        key = (round(float(target_location[0]), 6), round(float(target_location[1]), 6), method)
+        with self._lock:
+            if store is not self._store: self._carry_over(store)
+            column = self._columns.pop(key, None)
+            if column is None or len(column) != len(store): column = np.full(len(store), np.nan)
+            self._columns[key] = column
+            while len(self._columns) > self.max_targets: self._columns.popitem(last=False)
+        rows = np.arange(len(store), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        values = column[rows]; missing = np.flatnonzero(np.isnan(values))  # batch_distances NaN üretmez (geçersiz koordinat -> inf)
+        METRICS.inc('derived_cache_total', len(rows) - len(missing), kind='distance', result='hit')
+        if len(missing):
+            missing_rows = rows[missing]; computed = batch_distances(target_location, store.lat[missing_rows], store.lon[missing_rows], method)
+            column[missing_rows] = computed; values[missing] = computed; METRICS.inc('derived_cache_total', len(missing), kind='distance', result='miss')
+        return values
+
+    def text(self, eq_id, version, kind, factory):
+        """ Olayın (id, updated) sürümü için 'kind' türündeki metni döndürür; yoksa factory() ile üretip saklar. """
+        with self._lock:
+            entry = self._text.get(eq_id)
+            if entry is not None and entry[0] == version and kind in entry[1]: return entry[1][kind]
+        value = factory(); METRICS.inc('derived_cache_total', kind='text', result='miss')
+        with self._lock:
+            entry = self._text.get(eq_id)
+            if entry is None or entry[0] != version: entry = (version, {}); self._text[eq_id] = entry
+            entry[1][kind] = value
+        return value
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Sürümlü değişiklik tespiti: olaylar id ve USGS 'updated' zaman damgasıyla izlenir. Her akış turu
+# açık bir değişiklik kümesi (eklenen / güncellenen / silinen / süresi dolan) üretir; liste, harita ve
+# bildirimler tam anlık görüntü yerine bu kümeyle çalışır. Bildirim durumu (görülen id'ler), olay akış
+# penceresinden düştükten sonra ttl_ms içinde unutulur; böylece süreç haftalarca çalışsa da büyümez.
+import heapq
+import time
+
+DEFAULT_SEEN_TTL_MS = 6 * 3600 * 1000
+MAGNITUDE_REALERT_STEP = 1.0  # Bildirilmiş bir depremin büyüklüğü bu kadar artarsa yeniden bildirilir
+
+_ADDED, _UPDATED, _DELETED, _EXPIRED = 'added', 'updated', 'deleted', 'expired'
+
+
+class ChangeSet:
+    """ Bir akış turunda değişen olay id'leri. deleted: akış penceresindeyken USGS'nin sildiği olaylar;
+    expired: pencereden zamanla düşen olaylar. """
+    __slots__ = ('added', 'updated', 'deleted', 'expired')
+
+    def __init__(self, added=(), updated=(), deleted=(), expired=()):
+        self.added = list(added); self.updated = list(updated); self.deleted = list(deleted); self.expired = list(expired)
+
+    @property
+    def removed(self): return self.deleted + self.expired
+
+    @property
+    def is_empty(self): return not (self.added or self.updated or self.deleted or self.expired)
+
+    def __len__(self): return len(self.added) + len(self.updated) + len(self.deleted) + len(self.expired)
+
+    def __repr__(self): return f"ChangeSet(+{len(self.added)} ~{len(self.updated)} -{len(self.deleted)} süresi dolan {len(self.expired)})"
+
+    def merged(self, later):
+        """ Bu kümeden sonra gelen 'later' kümesiyle birleşimi (araya kaçan turların etkisi korunur). """
+        state = {}
+        for changes in (self, later):
+            for kind, ids in ((_ADDED, changes.added), (_UPDATED, changes.updated), (_DELETED, changes.deleted), (_EXPIRED, changes.expired)):
+                for eq_id in ids:
+                    previous = state.get(eq_id)
+                    if previous == _ADDED and kind == _UPDATED: continue  # Eklenip güncellenen: hâlâ yeni
+                    if previous == _ADDED and kind in (_DELETED, _EXPIRED): del state[eq_id]; continue  # Hiç görülmeden gitti
+                    if previous in (_DELETED, _EXPIRED) and kind == _ADDED: kind = _UPDATED
+                    state[eq_id] = kind
+        result = ChangeSet()
+        for eq_id, kind in state.items(): getattr(result, kind).append(eq_id)
+        return result
+
+
+def diff_stores(previous, current, window_start_ms=None):
+    """ İki EventStore anlık görüntüsü arasındaki ChangeSet. current'ta olmayıp zamanı window_start_ms'ten
+    eski olanlar 'expired', diğer kaybolanlar 'deleted' sayılır. """
+    added = []; updated = []; previous_updated = previous.updated.tolist(); row_of = previous.row_of
+    for eq_id, updated_ms in zip(current.ids, current.updated.tolist()):
+        row = row_of(eq_id)
+        if row is None: added.append(eq_id)
+        elif previous_updated[row] != updated_ms: updated.append(eq_id)
+    deleted = []; expired = []
+    for eq_id, time_ms in zip(previous.ids, previous.time.tolist()):
+        if eq_id in current: continue
+        (expired if window_start_ms is not None and time_ms < window_start_ms else deleted).append(eq_id)
+    return ChangeSet(added, updated, deleted, expired)
+
+
+class SeenEvents:
+    """ Bildirim durumu: id -> bildirilen büyüklük (henüz bildirilmediyse None). Eşiği yeni geçen depremler
+    (ilk kez ya da büyüklüğü sonradan yükseltilerek) bir kez, bildirimden sonra MAGNITUDE_REALERT_STEP kadar
+    büyüyenler yeniden bildirilir. Akıştan düşen id'ler ttl_ms sonra unutulur. """
+
+    def __init__(self, ttl_ms=DEFAULT_SEEN_TTL_MS, realert_step=MAGNITUDE_REALERT_STEP):
+        self.ttl_ms = ttl_ms; self.realert_step = realert_step
+        self._alerted = {}; self._expiry = {}; self._heap = []  # (son kullanma, id) yığını
+
+    def __len__(self): return len(self._alerted)
+
+    def __contains__(self, eq_id): return eq_id in self._alerted
+
+    def observe(self, store, changes, min_magnitude, notify=True, now_ms=None):
+        """ Değişiklik kümesini işler ve bildirilecek [(kayıt, yükseltme_mi), ...] listesini döndürür.
+        notify=False ise (ör. ilk yükleme) durum güncellenir ama bildirim üretilmez. İş, değişen olay sayısıyla orantılıdır. """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms; alerts = []
+        for eq_id in changes.added + changes.updated:
+            row = store.row_of(eq_id)
+            if row is None: continue
+            self._expiry.pop(eq_id, None); mag = float(store.mag[row]); known = eq_id in self._alerted; alerted_mag = self._alerted.get(eq_id)
+            if mag < min_magnitude: self._alerted.setdefault(eq_id, None); continue
+            if alerted_mag is None: alerts.append((store.record(row), known)); self._alerted[eq_id] = mag
+            elif mag >= alerted_mag + self.realert_step: alerts.append((store.record(row), True)); self._alerted[eq_id] = mag
+        for eq_id in changes.removed:
+            if eq_id in self._alerted:
+                expires = now_ms + self.ttl_ms; self._expiry[eq_id] = expires; heapq.heappush(self._heap, (expires, eq_id))
+        self.prune(now_ms)
+        return alerts if notify else []
+
+    def prune(self, now_ms=None):
+        """ Süresi dolan id'leri unutur; unutulan sayısını döndürür. """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms; heap = self._heap; pruned = 0
+        while heap and heap[0][0] <= now_ms:
+            expires, eq_id = heapq.heappop(heap)
+            if self._expiry.get(eq_id) == expires: del self._expiry[eq_id]; del self._alerted[eq_id]; pruned += 1
+        return pruned
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Sunucu (Python) tarafında hiyerarşik işaretçi kümeleme (supercluster benzeri ızgara kümeleme).
+# Olaylar Web Mercator düzlemine izdüşürülür; en yüksek yakınlaştırma düzeyinden başlayarak her düzeyde
+# bir önceki düzeyin öğeleri radius_px piksellik ızgara hücrelerinde birleştirilir. Hiyerarşi her veri
+# güncellemesinde bir kez kurulur; harita yalnızca o anki yakınlaştırma ve görünür alandaki kümeleri alır.
+import itertools
+import math
+
+import numpy as np
+
+DEFAULT_MIN_ZOOM = 0
+DEFAULT_MAX_ZOOM = 16
+DEFAULT_RADIUS_PX = 40
+TILE_EXTENT = 256
+_MAX_MERCATOR_LAT = 85.0511287798
+
+
+def mercator_x(lons): return (np.asarray(lons, dtype=np.float64) + 180.0) / 360.0
+
+
+def mercator_y(lats):
+    lats = np.clip(np.asarray(lats, dtype=np.float64), -_MAX_MERCATOR_LAT, _MAX_MERCATOR_LAT)
+    return 0.5 - np.log(np.tan(np.pi / 4.0 + np.radians(lats) / 2.0)) / (2.0 * np.pi)
+
+
+def mercator_lat(y): return np.degrees(2.0 * np.arctan(np.exp((0.5 - np.asarray(y)) * 2.0 * np.pi)) - np.pi / 2.0)
+
+
+class _Level:
+    __slots__ = ('x', 'y', 'count', 'max_mag', 'leaf')
+
+    def __init__(self, x, y, count, max_mag, leaf): self.x = x; self.y = y; self.count = count; self.max_mag = max_mag; self.leaf = leaf
+
+
+class ClusterIndex:
+    """ keys[i], i. olayın kalıcı anahtarıdır (olay id'si). Tek olaylı kümeler her düzeyde bu anahtarla,
+    çok olaylı kümeler "c<kuşak>:<zoom>:<sıra>" anahtarıyla döndürülür. Sıra yalnızca bu dizin içinde anlamlıdır;
+    kuşak (generation) her yeni dizinde artar, eski bir haritadan gelen küme anahtarı böylece yeni dizinle karışmaz. """
+
+    _generations = itertools.count(1)
+
+    def __init__(self, lats, lons, mags, keys, min_zoom=DEFAULT_MIN_ZOOM, max_zoom=DEFAULT_MAX_ZOOM, radius_px=DEFAULT_RADIUS_PX):
+        self.min_zoom = min_zoom; self.max_zoom = max_zoom; self.radius_px = radius_px; self.generation = next(ClusterIndex._generations)
+        lats = np.asarray(lats, dtype=np.float64); lons = np.asarray(lons, dtype=np.float64); mags = np.asarray(mags, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        self.keys = [keys[i] for i in valid.tolist()]; self.lats = lats[valid]; self.lons = lons[valid]; self.mags = mags[valid]
+        points = _Level(mercator_x(self.lons), mercator_y(self.lats), np.ones(len(valid)), self.mags.copy(), np.arange(len(valid), dtype=np.int64))
+        self.levels = {max_zoom + 1: points}; self.parents = {}  # parents[z + 1][i]: z+1 düzeyindeki i. öğenin z düzeyindeki kümesi
+        current = points
+        for zoom in range(max_zoom, min_zoom - 1, -1):
+            current = self._cluster(current, zoom); self.levels[zoom] = current
+
+    def __len__(self): return len(self.keys)
+
+    def _cluster(self, level, zoom):
+        if not len(level.x):
+            self.parents[zoom + 1] = np.empty(0, dtype=np.int32); return level
+        cell_size = self.radius_px / (TILE_EXTENT * (2 ** zoom)); n_cells = int(math.ceil(1.0 / cell_size)) + 1
+        cells = np.floor(level.x / cell_size).astype(np.int64) * n_cells + np.floor(level.y / cell_size).astype(np.int64)
+        _, first, inverse = np.unique(cells, return_index=True, return_inverse=True); inverse = inverse.ravel()
+        count = np.bincount(inverse, weights=level.count)
+        x = np.bincount(inverse, weights=level.x * level.count) / count; y = np.bincount(inverse, weights=level.y * level.count) / count
+        max_mag = np.full(len(count), -np.inf); np.maximum.at(max_mag, inverse, level.max_mag)
+        leaf = np.where(count == 1, level.leaf[first], -1)
+        self.parents[zoom + 1] = inverse.astype(np.int32)
+        return _Level(x, y, count, max_mag, leaf)
+
+    def get_clusters(self, zoom, west, south, east, north):
+        """ Görünür alandaki kümeleri [(anahtar, enlem, boylam, adet, en büyük büyüklük, tek olay indeksi ya da -1), ...] olarak döndürür. """
+        zoom = min(max(int(zoom), self.min_zoom), self.max_zoom + 1); level = self.levels[zoom]
+        if not len(level.x): return []
+        y_min = float(mercator_y(min(north, 90.0))); y_max = float(mercator_y(max(south, -90.0))); mask = (level.y >= y_min) & (level.y <= y_max)
+        if east - west < 360.0:
+            west = ((west + 180.0) % 360.0) - 180.0; east = ((east + 180.0) % 360.0) - 180.0
+            x_min = float(mercator_x(west)); x_max = float(mercator_x(east))
+            mask &= ((level.x >= x_min) & (level.x <= x_max)) if x_min <= x_max else ((level.x >= x_min) | (level.x <= x_max))
+        rows = np.flatnonzero(mask); lats = mercator_lat(level.y[rows]); lons = level.x[rows] * 360.0 - 180.0
+        return [(self.keys[leaf] if leaf >= 0 else f"c{self.generation}:{zoom}:{i}", lat, lon, int(count), mag, leaf)
+                for i, lat, lon, count, mag, leaf in zip(rows.tolist(), lats.tolist(), lons.tolist(), level.count[rows].tolist(), level.max_mag[rows].tolist(), level.leaf[rows].tolist())]
+
+    @staticmethod
+    def parse_cluster_key(key):
+        """ "c<kuşak>:<zoom>:<sıra>" anahtarını (kuşak, zoom, sıra) olarak çözer; olay anahtarı ise None döner. """
+        if not key.startswith('c') or key.count(':') != 2: return None
+        try: generation, zoom, i = key[1:].split(':'); return int(generation), int(zoom), int(i)
+        except ValueError: return None
+
+    def cluster_info(self, zoom, i):
+        """ (enlem, boylam, adet, en büyük büyüklük); sıra geçersizse IndexError. """
+        level = self.levels[zoom]
+        return float(mercator_lat(level.y[i])), float(level.x[i] * 360.0 - 180.0), int(level.count[i]), float(level.max_mag[i])
+
+    def leaves(self, zoom, i):
+        """ Bir kümenin içerdiği olay indeksleri (self.keys/self.lats... dizilerine göre). """
+        members = np.array([i]); level_zoom = zoom
+        while level_zoom <= self.max_zoom:
+            members = np.flatnonzero(np.isin(self.parents[level_zoom + 1], members)); level_zoom += 1
+        return self.levels[self.max_zoom + 1].leaf[members]
+
+    def expansion_zoom(self, zoom, i):
+        """ Kümenin birden fazla parçaya ayrıldığı ilk yakınlaştırma düzeyi. """
+        while zoom <= self.max_zoom:
+            children = np.flatnonzero(self.parents[zoom + 1] == i)
+            if len(children) != 1: return zoom + 1
+            zoom += 1; i = int(children[0])
+        return self.max_zoom + 1
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Toplu (vektörel) uzaklık hesabı: tüm depremlerin hedefe uzaklığı tek bir NumPy geçişinde hesaplanır.
+#
+# Yöntemler ve geopy.distance.geodesic (Karney, WGS-84) karşısındaki hata sınırları
+# (rastgele 120 bin nokta çifti ile ölçüldü, bkz. benchmarks/bench_distance.py):
+#   "haversine": Ortalama yarıçaplı (6371.0088 km) küre. Göreli hata en fazla ~%0.56
+#                (150 km yarıçapta ~0.8 km'ye kadar).
+#   "andoyer"  : Andoyer-Lambert birinci derece basıklık düzeltmesi (WGS-84 elipsoidi).
+#                Mutlak hata: 1000 km altında < 1.5 m, 10000 km altında < 15 m,
+#                15000 km altında < 50 m, 18000 km altında < 250 m. Antipodlara yaklaştıkça
+#                (σ → π) yöntem bozulur; 19500 km üzerinde hata birkaç km'ye çıkabilir.
+# Ölçüm ve hız karşılaştırması için: python benchmarks/bench_distance.py
+import numpy as np
+
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+MEAN_EARTH_RADIUS_KM = 6371.0088
+DISTANCE_METHODS = ("andoyer", "haversine")
+DEFAULT_DISTANCE_METHOD = "andoyer"
+
+
+def _central_angle(lat1, lon1, lat2, lon2):
+    """ Radyan cinsinden girişler için haversine merkez açısı (σ). """
+    sin_dlat = np.sin((lat2 - lat1) * 0.5); sin_dlon = np.sin((lon2 - lon1) * 0.5)
+    h = sin_dlat * sin_dlat + np.cos(lat1) * np.cos(lat2) * sin_dlon * sin_dlon
+    return 2.0 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def haversine_km(lat, lon, lats, lons):
+    """ (lat, lon) noktasından lats/lons dizilerine küresel uzaklık (km). """
+    lat1 = np.radians(lat); lon1 = np.radians(lon)
+    return MEAN_EARTH_RADIUS_KM * _central_angle(lat1, lon1, np.radians(lats), np.radians(lons))
+
+
+def andoyer_lambert_km(lat, lon, lats, lons):
+    """ (lat, lon) noktasından lats/lons dizilerine WGS-84 elipsoidi üzerinde yaklaşık jeodezik uzaklık (km). """
+    # İndirgenmiş enlemler: tan β = (1 - f) tan φ
+    beta1 = np.arctan((1.0 - WGS84_F) * np.tan(np.radians(lat)))
+    beta2 = np.arctan((1.0 - WGS84_F) * np.tan(np.radians(np.asarray(lats, dtype=np.float64))))
+    lon1 = np.radians(lon); lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+    sigma = _central_angle(beta1, lon1, beta2, lon2)
+    p = (beta1 + beta2) * 0.5; q = (beta2 - beta1) * 0.5
+    sin_p = np.sin(p); cos_p = np.cos(p); sin_q = np.sin(q); cos_q = np.cos(q)
+    sin_sigma = np.sin(sigma); cos_half = np.cos(sigma * 0.5); sin_half = np.sin(sigma * 0.5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (sigma - sin_sigma) * (sin_p * cos_q) ** 2 / (cos_half * cos_half)
+        y = (sigma + sin_sigma) * (cos_p * sin_q) ** 2 / (sin_half * sin_half)
+        correction = 0.5 * WGS84_F * (x + y)
+    # σ≈0 (aynı nokta) ve σ≈π (antipod) durumlarında düzeltme tanımsızdır
+    correction = np.where(np.isfinite(correction) & (sin_half > 1e-12) & (cos_half > 1e-6), correction, 0.0)
+    return WGS84_A_KM * (sigma - correction)
+
+
+def batch_distances(target_location, lats, lons, method=DEFAULT_DISTANCE_METHOD):
+    """ target_location=(enlem, boylam) noktasından tüm olaylara uzaklıkları (km, float64 dizisi) döndürür.
+    Geçersiz/eksik koordinatlar (NaN) için sonuç inf olur. """
+    lats = np.asarray(lats, dtype=np.float64); lons = np.asarray(lons, dtype=np.float64)
+    if not target_location or target_location[0] is None or target_location[1] is None: return np.full(lats.shape, np.inf)
+    lat, lon = float(target_location[0]), float(target_location[1])
+    if method == "haversine": distances = haversine_km(lat, lon, lats, lons)
+    else: distances = andoyer_lambert_km(lat, lon, lats, lons)
+    return np.where(np.isnan(distances), np.inf, distances)
+
+
+def feature_coordinates(features):
+    """ GeoJSON özelliklerinden (enlem, boylam) dizilerini çıkarır; koordinatı olmayanlar NaN olur. """
+    lats = np.full(len(features), np.nan); lons = np.full(len(features), np.nan)
+    for i, eq in enumerate(features):
+        coordinates = (eq.get('geometry') or {}).get('coordinates')
+        if coordinates and len(coordinates) >= 2 and coordinates[0] is not None and coordinates[1] is not None: lons[i] = coordinates[0]; lats[i] = coordinates[1]
+    return lats, lons
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# USGS GeoJSON akış istemcisi: kalıcı HTTP oturumu, koşullu GET (ETag/Last-Modified)
+# ve günlük temel akış + saatlik artımlı (delta) akış birleştirme. Olaylar sütunlu EventStore'da tutulur.
+# Yanıtlar akış halinde ayrıştırılır (deprem_stream); prefilter verilirse eşiğin altındaki olaylar sözlüğe dönüşmeden düşer.
+# İstek, indirme/ayrıştırma ve JSON çözme süreleri ile yanıt kodları deprem_metrics'e yazılır. Yanıtın önbellek
+# başlıklarından (Cache-Control/Expires) hesaplanan tazelik süresi sorgu zamanlayıcısına (deprem_scheduler) iletilir.
+import datetime
+import email.utils
+import json
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from deprem_changes import ChangeSet, diff_stores
+from deprem_metrics import METRICS
+from deprem_store import EventStore
+from deprem_stream import FeatureStream, STREAM_CHUNK_SIZE
+
+USGS_FEED_BASE_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/"
+USGS_API_URL = USGS_FEED_BASE_URL + "all_day.geojson"
+USGS_HOUR_API_URL = USGS_FEED_BASE_URL + "all_hour.geojson"
+FEED_WINDOW_MS = 24 * 3600 * 1000
+FEED_WINDOWS = {'day': FEED_WINDOW_MS, 'week': 7 * FEED_WINDOW_MS, 'month': 30 * FEED_WINDOW_MS}  # Temel akış adı -> kapsadığı süre
+DEFAULT_FEED_WINDOW = 'day'
+DEFAULT_BASELINE_REFRESH_S = 3600  # Silinen/eski olayları yakalamak için günlük akış bu sürede bir yeniden çekilir
+REQUEST_TIMEOUT_S = 25
+
+
+def feed_url(window, base_url=USGS_FEED_BASE_URL):
+    """ 'day' / 'week' / 'month' temel akışının (tüm büyüklükler) adresi. """
+    return base_url + f"all_{window}.geojson"
+
+
+def create_session():
+    """ Bağlantıları yeniden kullanan HTTP oturumu (akış istemcileri ve ajans bağdaştırıcıları için). """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter); session.mount("http://", adapter)
+    session.headers.update({'Accept': 'application/geo+json, application/json', 'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+    return session
+
+
+def _http_date(value):
+    parsed = email.utils.parsedate_to_datetime(value)
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)).timestamp()
+
+
+def cache_lifetime_s(headers, now=None):
+    """ Yanıtın taze kalacağı süre (saniye): Cache-Control max-age (Age düşülerek), yoksa Expires - Date.
+    no-cache / no-store ya da geçersiz Expires 0, önbellek bilgisi yoksa None döndürür. """
+    directives = {}
+    for part in (headers.get('Cache-Control') or "").split(','):
+        key, _, value = part.strip().partition('=')
+        if key: directives[key.lower()] = value.strip().strip('"')
+    if 'no-store' in directives or 'no-cache' in directives: return 0.0
+    if 'max-age' in directives:
+        try: return max(float(directives['max-age']) - float(headers.get('Age') or 0), 0.0)
+        except ValueError: pass
+    if not headers.get('Expires'): return None
+    try: expires = _http_date(headers['Expires'])
+    except (TypeError, ValueError, IndexError): return 0.0
+    try: reference = _http_date(headers['Date']) if headers.get('Date') else (time.time() if now is None else now)
+    except (TypeError, ValueError, IndexError): reference = time.time() if now is None else now
+    return max(expires - reference, 0.0)
+
+
+class FeedResult:
+    """ Bir akış sorgusunun sonucu. store=None ise sorgu başarısız olmuştur; aksi halde store,
+    istemcinin güncel olay deposunun (çağıranın serbestçe değiştirebileceği) bir kopyasıdır.
+    changes, önceki tura göre değişen olayların ChangeSet'idir (304'te boş). fresh_for_s, yanıtın önbellek
+    başlıklarına göre taze kalacağı süredir (bilgi yoksa None). """
+    __slots__ = ('store', 'changes', 'status_code', 'error', 'fresh_for_s')
+
+    def __init__(self, store=None, changes=None, status_code=None, error=None, fresh_for_s=None):
+        self.store = store; self.changes = changes if changes is not None else ChangeSet(); self.status_code = status_code; self.error = error; self.fresh_for_s = fresh_for_s
+
+    @property
+    def ok(self): return self.store is not None
+
+    @property
+    def changed(self): return not self.changes.is_empty
+
+
+class USGSFeedClient:
+    """ Bağlantıları yeniden kullanan, koşullu istek yapan ve isteğe bağlı olarak
+    saatlik akışı günlük temel veriye id ile birleştiren USGS akış istemcisi. """
+
+    def __init__(self, day_url=USGS_API_URL, hour_url=USGS_HOUR_API_URL, delta_mode=True,
+                 baseline_refresh_s=DEFAULT_BASELINE_REFRESH_S, timeout=REQUEST_TIMEOUT_S, session=None, base_url=USGS_FEED_BASE_URL):
+        self.base_url = base_url; self.day_url = day_url; self.hour_url = hour_url; self.delta_mode = delta_mode; self.window_ms = FEED_WINDOW_MS; self.prefilter = None
+        self.baseline_refresh_s = baseline_refresh_s; self.timeout = timeout
+        self.session = session or create_session()
+        self._validators = {}  # url -> (ETag, Last-Modified)
+        self._store = EventStore()
+        self._baseline_at = None
+        self.fresh_for_s = None  # Son yanıtın tazelik süresi (cache_lifetime_s)
+        self._lock = threading.Lock()
+
+    def close(self): self.session.close()
+
+    def reset(self):
+        """ Önbelleği ve doğrulayıcıları temizler; bir sonraki sorgu tam günlük akışı indirir. """
+        with self._lock: self._validators.clear(); self._store = EventStore(); self._baseline_at = None
+
+    def set_window(self, window):
+        """ Temel akışı 'day' / 'week' / 'month' olarak değiştirir; değiştiyse bir sonraki sorgu tam temel akışı indirir. """
+        url = feed_url(window, self.base_url)
+        with self._lock:
+            if url == self.day_url: return
+            self.day_url = url; self.window_ms = FEED_WINDOWS[window]; self._validators.pop(url, None); self._baseline_at = None
+        logging.info(f"Temel akış penceresi: {window} ({url})")
+
+    def set_prefilter(self, prefilter):
+        """ Süzgeç değiştiyse bir sonraki sorgu tam temel akışı indirir; artık süzgeçten geçmeyen olaylar 'deleted' olarak raporlanır. """
+        with self._lock:
+            if prefilter == self.prefilter: return
+            self.prefilter = prefilter; self._validators.clear(); self._baseline_at = None
+        logging.info(f"Akış süzgeci: {prefilter}")
+
+    def _conditional_get(self, url, consume):
+        """ Gövdeyi akış halinde ayrıştırır ve (durum_kodu, consume(FeatureStream)) döndürür; 304 yanıtında (304, None). """
+        headers = {}; etag, last_modified = self._validators.get(url, (None, None))
+        if etag: headers['If-None-Match'] = etag
+        if last_modified: headers['If-Modified-Since'] = last_modified
+        with METRICS.timer(stage='fetch'): response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)  # Başlıklar gelene kadar
+        with response:
+            METRICS.inc('http_responses_total', code=response.status_code); self.fresh_for_s = cache_lifetime_s(response.headers)
+            if response.status_code == 304: logging.info(f"Akış değişmemiş (304): {url}"); return 304, None
+            response.raise_for_status()
+            stream = FeatureStream(response.iter_content(STREAM_CHUNK_SIZE), self.prefilter)
+            with METRICS.timer(stage='download_parse'): result = consume(stream)
+            METRICS.observe('stage_seconds', stream.decode_s, stage='json_decode'); METRICS.inc('events_processed_total', stream.seen); METRICS.inc('events_kept_total', stream.kept)
+            if self.prefilter is not None: logging.info(f"Akış süzgeci: {stream.seen} olaydan {stream.kept} tanesi tutuldu.")
+            self._validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return response.status_code, result
+
+    def _needs_baseline(self):
+        if not self.delta_mode or self._baseline_at is None: return True
+        return time.monotonic() - self._baseline_at >= self.baseline_refresh_s
+
+    def fetch(self):
+        """ Akışı günceller ve birleştirilmiş tam olay listesini içeren bir FeedResult döndürür. """
+        with self._lock:
+            self.fresh_for_s = None
+            try:
+                result = self._fetch_baseline() if self._needs_baseline() else self._fetch_delta()
+                result.fresh_for_s = self.fresh_for_s; return result
+            except requests.exceptions.Timeout: logging.error("Hata: API zaman aşımı.", exc_info=False); METRICS.inc('poll_errors_total', reason='timeout'); return FeedResult(error="timeout")
+            except requests.exceptions.RequestException as e: logging.error(f"Hata: API bağlantı: {e}", exc_info=False); METRICS.inc('poll_errors_total', reason='http'); return FeedResult(error=str(e))
+            except (json.JSONDecodeError, ValueError): logging.error("Hata: JSON formatı.", exc_info=False); METRICS.inc('poll_errors_total', reason='json'); return FeedResult(error="json")
+            except Exception as e: logging.error(f"Hata (veri çekme): {e}", exc_info=True); METRICS.inc('poll_errors_total', reason='other'); return FeedResult(error=str(e))
+
+    def _fetch_baseline(self):
+        logging.info(f"Deprem verisi çekiliyor (temel akış): {self.day_url}")
+        status, parsed = self._conditional_get(self.day_url, lambda stream: (EventStore.from_values(stream), stream)); self._baseline_at = time.monotonic()
+        if parsed is None: return FeedResult(self._store.copy(), status_code=status)
+        store, stream = parsed; logging.info(f"{stream.seen} adet ham deprem verisi alındı.")
+        previous = self._store; self._store = store
+        generated_ms = stream.metadata.get('generated') or int(time.time() * 1000)
+        changes = diff_stores(previous, self._store, window_start_ms=generated_ms - self.window_ms)
+        # Saatlik akışın doğrulayıcıları eski temel veriye göreydi; delta bir sonraki turda baştan alınsın
+        self._validators.pop(self.hour_url, None)
+        logging.info(f"Temel akış değişiklikleri: {changes}")
+        return FeedResult(self._store.copy(), changes=changes, status_code=status)
+
+    def _fetch_delta(self):
+        logging.info(f"Deprem verisi çekiliyor (saatlik delta): {self.hour_url}")
+        status, parsed = self._conditional_get(self.hour_url, lambda stream: (list(stream), stream))
+        if parsed is None: return FeedResult(self._store.copy(), status_code=status)
+        rows, stream = parsed; added, updated = self._store.upsert_values(rows)
+        delta_ids = {values[0] for values in rows}  # Süzgeçten geçmeyen olaylar depoda da tutulmaz
+        generated_ms = stream.metadata.get('generated') or int(time.time() * 1000)
+        # Saatlik pencerede olup artık akışta görünmeyen olaylar USGS tarafından silinmiştir
+        hour_start_ms = generated_ms - 3600 * 1000; store = self._store
+        removed = store.remove([eq_id for eq_id, t in zip(store.ids, store.time.tolist()) if t >= hour_start_ms and eq_id not in delta_ids])
+        expired = store.remove_older_than(generated_ms - self.window_ms)
+        logging.info(f"Saatlik akıştan {len(rows)} olay birleştirildi (+{len(added)} ~{len(updated)} -{len(removed) + len(expired)}); toplam {len(store)} olay.")
+        return FeedResult(store.copy(), changes=ChangeSet(added, updated, removed, expired), status_code=status)
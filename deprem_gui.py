@@ -0,0 +1,783 @@
+# -*- coding: utf-8 -*-
+import sys
+import os # resource_path için gerekli
+import json
+import tempfile
+# import os # Zaten yukarıda import edildi
+import datetime
+import logging
+import traceback
+import platform
+import time
+
+import numpy as np
+
+from deprem_feed import DEFAULT_FEED_WINDOW
+from deprem_distance import DEFAULT_DISTANCE_METHOD
+from deprem_settings import (APP_NAME, SETTINGS_FILE, DEFAULT_MIN_MAGNITUDE, DEFAULT_CHECK_INTERVAL_MIN, DEFAULT_TARGET_LAT, DEFAULT_TARGET_LON, DEFAULT_RADIUS_KM,
+                             DEFAULT_NOTIFICATIONS_ENABLED, DEFAULT_NOTIFICATION_SOUND, DEFAULT_THEME, DEFAULT_DELTA_FEED, DEFAULT_WATCH_ZONES, DEFAULT_ARCHIVE_ENABLED,
+                             DEFAULT_HISTORY_HOURS, MAX_HISTORY_HOURS, DEFAULT_ADAPTIVE_POLLING, DEFAULT_MIN_INTERVAL_S, DEFAULT_MAX_INTERVAL_MIN, PRIMARY_ZONE_NAME, MAX_RADIUS_KM, APP_ICON_FILE, resource_path, load_settings, save_settings, watch_zones_from_settings, format_datetime)
+from deprem_pipeline import process_earthquake_data, poll_feed, create_feed_client, feed_source_config
+from deprem_scheduler import PollScheduler
+from deprem_cache import DerivedCache
+from deprem_stream import FeaturePrefilter, prefilter_covers
+from deprem_tiles import (MapCache, TILE_CACHE_FILE, ASSETS_DIR, MAP_SCHEME, DEFAULT_OFFLINE_MAP, DEFAULT_TILE_URL, DEFAULT_TILE_CACHE_MB, DEFAULT_TILE_PREFETCH,
+                          create_scheme_handler, map_scheme_registered, register_map_scheme)
+from deprem_sources import DEFAULT_FEED_SOURCES, SOURCE_NAMES, parse_source_names
+from deprem_store import EventStore, ms_to_datetime
+from deprem_archive import EventArchive, ARCHIVE_FILE
+from deprem_map import (MapDiffTracker, build_base_map_html, marker_payload, zones_payload, zoom_for_radius,
+                        event_tooltip, cluster_tooltip, event_popup_html, cluster_popup_html)
+from deprem_zones import merge_zone_matches, parse_watch_zones, format_watch_zones
+from deprem_cluster import ClusterIndex
+from deprem_changes import SeenEvents
+from deprem_notify import NotificationDispatcher
+from deprem_log import LogRingBuffer, LOG_BUFFER_CAPACITY, LOG_FORMAT, filter_entries
+from deprem_metrics import METRICS, MetricsServer, DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT, format_labels
+
+# Gerekli PySide6 modülleri
+from PySide6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
+    QTableView, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QLabel, QPushButton, QStatusBar, QSplitter, QTabWidget,
+    QDoubleSpinBox, QSpinBox, QLineEdit, QCheckBox, QComboBox, QSlider, QPlainTextEdit,
+    QMessageBox, QFileDialog,
+    QSystemTrayIcon, QMenu
+)
+# QtWebEngine (Chromium) ve folium yalnızca harita sekmesi başlatılırken yüklenir (initialize_map_view)
+from PySide6.QtCore import QUrl, QFileInfo, Qt, Slot, Signal, QObject, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRunnable, QThreadPool, QTimer, QSettings, QStandardPaths, QCoreApplication
+from PySide6.QtGui import QIcon, QPalette, QColor, QFont, QAction, QTextCursor
+
+# --- Logging Setup ---
+log_format = LOG_FORMAT
+logging.basicConfig(level=logging.INFO, format=log_format)
+# Kayıtlar sabit kapasiteli tamponda tutulur; Log sekmesi tamponu LOG_FLUSH_INTERVAL_MS aralıkla toplu okur
+log_buffer = LogRingBuffer(LOG_BUFFER_CAPACITY); log_buffer.setFormatter(logging.Formatter(log_format)); logging.getLogger().addHandler(log_buffer)
+
+# --- Constants & Defaults (ortak sabitler deprem_settings içinde) ---
+LOG_FLUSH_INTERVAL_MS = 250; LOG_VIEW_MAX_LINES = 2000
+STATS_REFRESH_INTERVAL_MS = 2000
+STATS_COLUMNS = ("Ölçüm", "Sayı / Değer", "Ort. (ms)", "p50 (ms)", "p95 (ms)", "En büyük (ms)", "Son (ms)")
+LOG_LEVEL_FILTERS = (("Tümü", logging.NOTSET), ("Bilgi ve üzeri", logging.INFO), ("Uyarı ve üzeri", logging.WARNING), ("Hata ve üzeri", logging.ERROR))
+
+# --- Helper Functions ---
+def build_cluster_index(store, zone_matches):
+    """ Arka plan işçisinde çalışır: bölgelerle eşleşen olaylar için harita kümeleme hiyerarşisini veri başına bir kez kurar. """
+    rows = merge_zone_matches(zone_matches)[0]; ids = store.ids
+    return ClusterIndex(store.lat[rows], store.lon[rows], store.mag[rows], [ids[row] for row in rows.tolist()])
+
+# --- Arka Plan İşçisi: Veri çekme/işleme GUI iş parçacığının dışında ---
+class EarthquakeFetchSignals(QObject):
+    finished = Signal(object, object)  # (işçi, FeedResult)
+    failed = Signal(object, str)       # (işçi, hata mesajı)
+
+class EarthquakeFetchWorker(QRunnable):
+    def __init__(self, feed_client, zones, is_initial_load=False, force_update=False, distance_method=DEFAULT_DISTANCE_METHOD, archive=None, history_hours=DEFAULT_HISTORY_HOURS, cache=None):
+        super().__init__(); self.setAutoDelete(False); self.cache = cache
+        self.feed_client = feed_client; self.zones = zones; self.distance_method = distance_method; self.zone_matches = None; self.cluster_index = None; self.is_initial_load = is_initial_load; self.force_update = force_update
+        self.full_refresh = force_update  # True ise arayüz değişiklik kümesi yerine tüm eşleşmeleri karşılaştırır
+        self.archive = archive; self.history_hours = history_hours
+        self.cancelled = False; self.poll = None; self.signals = EarthquakeFetchSignals()
+
+    def cancel(self): self.cancelled = True
+
+    def run(self):
+        try:
+            poll = poll_feed(self.feed_client, self.zones, self.distance_method, self.archive, self.history_hours, self.force_update, cancelled=lambda: self.cancelled, cache=self.cache)
+            result = poll.feed; self.poll = poll  # Sonraki sorgunun zamanlaması için (PollScheduler)
+            if not result.ok:
+                if not self.cancelled: self.signals.failed.emit(self, "Deprem verileri alınamadı!")
+                return
+            # İptal edilen işçi de sonucunu bildirir: değişiklik kümesi kaybolmasın, bir sonraki sonuca taşınsın
+            if self.cancelled: logging.info("İptal edilen veri çekme işleminin değişiklikleri sonraki sonuca taşınacak."); self.signals.finished.emit(self, result); return
+            self.zone_matches = poll.zone_matches; self.full_refresh = poll.full_refresh
+            if self.zone_matches is not None:
+                with METRICS.timer(stage='cluster_build'): self.cluster_index = build_cluster_index(result.store, self.zone_matches)
+            self.signals.finished.emit(self, result)
+        except Exception as e:
+            logging.error(f"Hata (arka plan işçisi): {e}", exc_info=True)
+            if not self.cancelled: self.signals.failed.emit(self, f"Veri işlenirken hata: {e}")
+
+# --- Harita köprüsü: sayfa QWebChannel üzerinden görünür alan kümelerini ve açılır pencereleri ister ---
+class MapBridge(QObject):
+    def __init__(self, window): super().__init__(window); self._window = window
+
+    @Slot(float, float, float, float, float, result=str)
+    def viewport(self, zoom, west, south, east, north): return self._window.map_viewport_changed(zoom, west, south, east, north)
+
+    @Slot(str, result=str)
+    def popup(self, key): return self._window.map_popup_html(key)
+
+# --- Yakındaki depremler modeli: yalnızca olay id'lerini tutar, hücreler depodan istendikçe okunur ---
+def _row_runs(rows):
+    """ Sıralı satır numaralarını ardışık (ilk, son) aralıklarına böler. """
+    runs = []
+    for row in rows:
+        if runs and row == runs[-1][1] + 1: runs[-1][1] = row
+        else: runs.append([row, row])
+    return runs
+
+class NearbyEventsModel(QAbstractTableModel):
+    COLUMNS = ("Zaman", "Büyüklük", "Uzaklık (km)", "Derinlik (km)", "Bölge", "Yer")
+    TIME_COL, MAG_COL, DISTANCE_COL, DEPTH_COL, ZONE_COL, PLACE_COL = range(6)
+    EVENT_ID_ROLE = Qt.UserRole + 1  # Qt.UserRole: sıralama için ham değer
+
+    def __init__(self, parent=None, derived=None):
+        super().__init__(parent); self._store = EventStore(); self._ids = []; self._positions = {}; self._info = {}  # id -> (uzaklık, bölge, updated)
+        self._derived = derived  # DerivedCache: satır metinleri olay sürümü başına bir kez biçimlendirilir
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole: return self.COLUMNS[section]
+        return None
+
+    def event_id(self, row): return self._ids[row]
+
+    def _row_text(self, eq_id, row):
+        """ (zaman, büyüklük, derinlik) metinleri. """
+        store = self._store
+        def build():
+            depth = float(store.depth[row]); return format_datetime(ms_to_datetime(int(store.time[row]))), f"{float(store.mag[row]):.1f}", (f"{depth:.1f}" if depth == depth else "N/A")
+        return build() if self._derived is None else self._derived.text(eq_id, int(store.updated[row]), 'row', build)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.UserRole, Qt.ToolTipRole, Qt.TextAlignmentRole, self.EVENT_ID_ROLE): return None
+        eq_id = self._ids[index.row()]; column = index.column()
+        if role == self.EVENT_ID_ROLE: return eq_id
+        if role == Qt.TextAlignmentRole: return int(Qt.AlignRight | Qt.AlignVCenter) if column in (self.MAG_COL, self.DISTANCE_COL, self.DEPTH_COL) else None
+        row = self._store.row_of(eq_id)
+        if row is None: return None
+        store = self._store; distance, zone_name = self._info[eq_id][:2]
+        if column == self.TIME_COL: return int(store.time[row]) if role == Qt.UserRole else self._row_text(eq_id, row)[0]
+        if column == self.MAG_COL: return float(store.mag[row]) if role == Qt.UserRole else self._row_text(eq_id, row)[1]
+        if column == self.DISTANCE_COL: return distance if role == Qt.UserRole else f"~{distance:.0f}"
+        if column == self.DEPTH_COL:
+            if role != Qt.UserRole: return self._row_text(eq_id, row)[2]
+            depth = float(store.depth[row]); return depth if depth == depth else float('inf')
+        if column == self.ZONE_COL: return zone_name
+        return store.place[row]
+
+    def apply(self, store, rows, distances, zone_ids, zone_names, changes=None):
+        """ rows/distances/zone_ids/zone_names: merge_zone_matches çıktısı. changes (ChangeSet) verilirse yalnızca kümedeki
+        id'ler incelenir (bölgeler değişmediğinden diğer satırlar aynıdır); verilmezse tüm eşleşmeler karşılaştırılır.
+        Silme/değişiklik/ekleme ayrı sinyallerle uygulanır (model sıfırlanmaz, seçim korunur). (eklenen, güncellenen, silinen) döndürür. """
+        position = np.full(len(store), -1, dtype=np.int64); position[rows] = np.arange(len(rows)); updated_col = store.updated
+        if changes is None: ids = store.ids; candidates = self._ids + [ids[row] for row in rows.tolist()]  # store.ids her erişimde kopya üretir
+        else: candidates = changes.added + changes.updated + changes.removed
+        info = {}
+        for eq_id in dict.fromkeys(candidates):
+            row = store.row_of(eq_id); i = position[row] if row is not None else -1
+            info[eq_id] = (float(distances[i]), zone_names[zone_ids[i]], int(updated_col[row])) if i >= 0 else None
+        self._store = store
+        removed_rows = sorted(self._positions[eq_id] for eq_id, value in info.items() if value is None and eq_id in self._positions)
+        for first, last in reversed(_row_runs(removed_rows)):  # Sondan başa: önceki satır numaraları geçerli kalır
+            self.beginRemoveRows(QModelIndex(), first, last); gone = self._ids[first:last + 1]; del self._ids[first:last + 1]; self.endRemoveRows()
+            for eq_id in gone: del self._info[eq_id]
+        if removed_rows: self._positions = {eq_id: i for i, eq_id in enumerate(self._ids)}
+        changed_rows = sorted(self._positions[eq_id] for eq_id, value in info.items() if value is not None and eq_id in self._positions and value != self._info[eq_id])
+        added = [eq_id for eq_id, value in info.items() if value is not None and eq_id not in self._positions]
+        self._info.update((eq_id, value) for eq_id, value in info.items() if value is not None)
+        for first, last in _row_runs(changed_rows): self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.COLUMNS) - 1))
+        if added:
+            start = len(self._ids); self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            self._ids.extend(added); self._positions.update((eq_id, start + i) for i, eq_id in enumerate(added)); self.endInsertRows()
+        return len(added), len(changed_rows), len(removed_rows)
+
+# --- Ana Uygulama Penceresi ---
+class EarthquakeMainWindow(QMainWindow):
+    def __init__(self, replay=None, settings_path=SETTINGS_FILE):
+        super().__init__()
+        self.replay = replay  # deprem_replay.ReplaySession: kayıttan oynatmada akış istemcisi ve tur zamanlaması ondan gelir
+        self.settings_path = settings_path
+        self.event_store = EventStore(); self.zone_matches = {}; self.cluster_index = None; self._map_event_info = None; self.current_map_file = None
+        self.seen_events = SeenEvents(); self._carried_changes = None; self.derived_cache = DerivedCache()
+        self.settings = {}; self.map_view = None; self.log_text_edit = None
+        self._map_ready = False; self._map_tracker = MapDiffTracker(); self._map_zones = None; self._map_view_target = None; self._map_viewport = None
+        self._map_bridge = None; self._map_channel = None; self._map_load_started = None; self.map_cache = None; self._map_scheme_handler = None
+        self.metrics_server = None; self._metrics_endpoint = None
+        self._log_view_seq = 0; self.nearby_model = None; self.nearby_table = None; self._focused_event_id = None
+        self.tray_icon = None
+        self.thread_pool = QThreadPool(self); self.thread_pool.setMaxThreadCount(2); self._fetch_worker = None
+
+        self.setWindowTitle(APP_NAME if replay is None else f"{APP_NAME} — kayıttan oynatma ({replay.speed:g}x)"); self.setGeometry(50, 50, 1300, 850)
+
+        # *** DEĞİŞİKLİK: İkon yolunu resource_path ile al ***
+        try:
+            self.icon_path = resource_path(APP_ICON_FILE)
+            if os.path.exists(self.icon_path):
+                 self.setWindowIcon(QIcon(self.icon_path))
+                 logging.info(f"Uygulama ikonu yüklendi: {self.icon_path}")
+            else:
+                 logging.warning(f"Uygulama ikonu bulunamadı: {self.icon_path}")
+                 self.icon_path = None
+        except Exception as icon_err:
+            logging.error(f"İkon yolu alınırken hata: {icon_err}")
+            self.icon_path = None
+        # ***************************************************
+
+        self.load_settings(); self.feed_client = create_feed_client(self.settings) if replay is None else replay.client
+        self.notifier = NotificationDispatcher.from_settings(APP_NAME, self.icon_path, self.settings)  # İkon ve ses yolu bir kez çözülür
+        self.archive = None
+        if self.settings.get('archive_enabled', DEFAULT_ARCHIVE_ENABLED) and replay is None:  # Oynatılan olaylar arşive yazılmaz
+            try: self.archive = EventArchive(ARCHIVE_FILE)
+            except Exception as archive_err: logging.error(f"Deprem arşivi açılamadı ({ARCHIVE_FILE}): {archive_err}")
+        self.apply_metrics_server(); self.init_ui(); self.apply_theme(self.settings.get('theme', DEFAULT_THEME))
+        self.setup_tray_icon(); self.load_from_archive()
+
+        # Tek atımlık: her kontrol bittiğinde bir sonraki kontrol PollScheduler'ın kararıyla yeniden kurulur
+        self.check_timer = QTimer(self); self.check_timer.setSingleShot(True); self.check_timer.timeout.connect(self.check_for_earthquakes_slot)
+        self.poll_scheduler = PollScheduler.from_settings(self.settings); QTimer.singleShot(500, self.perform_initial_load)
+        logging.info("Ana Pencere başlatıldı.")
+
+    def init_ui(self):
+        logging.info("Arayüz oluşturuluyor..."); self.tab_widget = QTabWidget(); self.setCentralWidget(self.tab_widget)
+        self.log_tab = self.create_log_tab(); self.settings_tab = self.create_settings_tab()
+        self.nearby_tab = self.create_nearby_tab(); self.map_tab = self.create_map_tab(); self.stats_tab = self.create_stats_tab()
+        logging.getLogger().setLevel(logging.INFO)
+        self.tab_widget.addTab(self.settings_tab, "Ayarlar"); self.tab_widget.addTab(self.nearby_tab, "Yakındaki Depremler")
+        self.tab_widget.addTab(self.map_tab, "Harita"); self.tab_widget.addTab(self.stats_tab, "İstatistik"); self.tab_widget.addTab(self.log_tab, "Log")
+        self.tab_widget.currentChanged.connect(self.refresh_stats_view)
+        self.status_bar = QStatusBar(); self.setStatusBar(self.status_bar); self.status_bar.showMessage("Arayüz başlatılıyor...")
+        logging.info("Arayüz başarıyla oluşturuldu.")
+
+    def setup_tray_icon(self):
+        if not QSystemTrayIcon.isSystemTrayAvailable(): logging.warning("Sistem tepsisi desteklenmiyor."); return
+        if self.icon_path:
+            self.tray_icon = QSystemTrayIcon(QIcon(self.icon_path), self)
+            self.tray_icon.setToolTip(f"{APP_NAME}\nÇift tıkla: Göster/Gizle")
+            tray_menu = QMenu(self); show_hide_action = QAction("Göster/Gizle", self)
+            show_hide_action.triggered.connect(self.toggle_window_visibility); tray_menu.addAction(show_hide_action)
+            tray_menu.addSeparator(); quit_action = QAction("Çıkış", self)
+            quit_action.triggered.connect(self.quit_application); tray_menu.addAction(quit_action)
+            self.tray_icon.setContextMenu(tray_menu); self.tray_icon.activated.connect(self.tray_icon_activated)
+            self.tray_icon.show(); logging.info("Sistem tepsisi ikonu oluşturuldu.")
+        else: logging.error("Sistem tepsisi ikonu için ikon dosyası bulunamadı."); self.tray_icon = None
+
+    @Slot(QSystemTrayIcon.ActivationReason)
+    def tray_icon_activated(self, reason):
+        if reason == QSystemTrayIcon.Trigger or reason == QSystemTrayIcon.DoubleClick: self.toggle_window_visibility()
+
+    @Slot()
+    def toggle_window_visibility(self):
+        if self.isVisible(): self.hide(); logging.info("Pencere gizlendi.")
+        else: self.show(); self.activateWindow(); self.raise_(); logging.info("Pencere gösterildi.")
+
+    @Slot()
+    def quit_application(self):
+        logging.info("Çıkış menüsünden uygulama kapatılıyor..."); self.check_timer.stop()
+        if self.replay: logging.info(f"Oynatma özeti: {self.replay.stats.format()}")
+        if self._fetch_worker: self._fetch_worker.cancel(); self._fetch_worker = None
+        self.feed_client.close(); self.notifier.close()
+        if self.metrics_server: self.metrics_server.close(); self.metrics_server = None
+        if self.archive: self.archive.close(); self.archive = None
+        if self._map_scheme_handler: self._map_scheme_handler.shutdown()
+        if self.map_cache: self.map_cache.close(); self.map_cache = None
+        if self.tray_icon: self.tray_icon.hide()
+        QApplication.quit()
+
+    def create_settings_tab(self):
+        widget = QWidget(); layout = QVBoxLayout(widget); form_layout = QFormLayout()
+        magnitude_layout = QHBoxLayout(); self.magnitude_slider = QSlider(Qt.Horizontal); self.magnitude_slider.setRange(10, 90); self.magnitude_slider.setSingleStep(1)
+        initial_mag = self.settings.get('min_magnitude', DEFAULT_MIN_MAGNITUDE); self.magnitude_slider.setValue(int(initial_mag * 10))
+        self.magnitude_label = QLabel(f"{initial_mag:.1f}"); self.magnitude_slider.valueChanged.connect(lambda val: self.magnitude_label.setText(f"{val / 10.0:.1f}"))
+        magnitude_layout.addWidget(self.magnitude_slider); magnitude_layout.addWidget(self.magnitude_label); form_layout.addRow("Min. Büyüklük:", magnitude_layout)
+        self.interval_spinbox = QSpinBox(); self.interval_spinbox.setRange(1, 120); self.interval_spinbox.setValue(self.settings.get('check_interval_min', DEFAULT_CHECK_INTERVAL_MIN))
+        form_layout.addRow("Kontrol Aralığı (dk):", self.interval_spinbox)
+        self.adaptive_polling_checkbox = QCheckBox("Uyarlanır aralık (bölgede deprem olunca sıklaştır, sakin dönemde seyrelt)"); self.adaptive_polling_checkbox.setChecked(self.settings.get('adaptive_polling', DEFAULT_ADAPTIVE_POLLING))
+        self.adaptive_polling_checkbox.setToolTip(f"Aralık {self.settings.get('min_interval_s', DEFAULT_MIN_INTERVAL_S):.0f} sn ile {self.settings.get('max_interval_min', DEFAULT_MAX_INTERVAL_MIN):.0f} dk arasında değişir "
+                                                  "(INI: MinIntervalSec, MaxIntervalMin). Sunucunun önbellek başlıklarına ve hatalarda geri çekilmeye her durumda uyulur.")
+        form_layout.addRow(self.adaptive_polling_checkbox)
+        location_layout = QHBoxLayout(); self.lat_input = QLineEdit(str(self.settings.get('target_lat', DEFAULT_TARGET_LAT)))
+        self.lon_input = QLineEdit(str(self.settings.get('target_lon', DEFAULT_TARGET_LON)))
+        location_layout.addWidget(self.lat_input); location_layout.addWidget(self.lon_input); form_layout.addRow("Hedef Konum (Enlem, Boylam):", location_layout)
+        self.radius_input = QSpinBox(); self.radius_input.setRange(10, MAX_RADIUS_KM); self.radius_input.setSingleStep(10)
+        self.radius_input.setValue(self.settings.get('radius_km', DEFAULT_RADIUS_KM)); form_layout.addRow("Yarıçap (km):", self.radius_input)
+        self.watch_zones_input = QPlainTextEdit(self.settings.get('watch_zones', DEFAULT_WATCH_ZONES)); self.watch_zones_input.setFixedHeight(90)
+        self.watch_zones_input.setPlaceholderText("Her satıra bir bölge: Ad; Enlem; Boylam; Yarıçap (km); Min. Büyüklük\nÖrn: Fabrika; 40.77; 29.94; 100; 3.5")
+        form_layout.addRow("Ek İzleme Bölgeleri:", self.watch_zones_input)
+        self.history_spinbox = QSpinBox(); self.history_spinbox.setRange(1, MAX_HISTORY_HOURS); self.history_spinbox.setValue(self.settings.get('history_hours', DEFAULT_HISTORY_HOURS))
+        self.history_spinbox.setToolTip("24 saatten uzun pencereler yerel arşivden doldurulur."); self.history_spinbox.setEnabled(self.settings.get('archive_enabled', DEFAULT_ARCHIVE_ENABLED))
+        form_layout.addRow("Geçmiş Penceresi (saat):", self.history_spinbox)
+        self.notifications_checkbox = QCheckBox("Bildirimleri Etkinleştir (Dünya Geneli)"); self.notifications_checkbox.setChecked(self.settings.get('notifications_enabled', DEFAULT_NOTIFICATIONS_ENABLED))
+        form_layout.addRow(self.notifications_checkbox)
+        self.delta_feed_checkbox = QCheckBox("Artımlı güncelleme (günlük akıştan sonra yalnızca saatlik akışı çek)"); self.delta_feed_checkbox.setChecked(self.settings.get('delta_feed', DEFAULT_DELTA_FEED))
+        form_layout.addRow(self.delta_feed_checkbox)
+        self.feed_window_combobox = QComboBox()
+        for window, label in (('day', "Son 24 saat"), ('week', "Son 7 gün"), ('month', "Son 30 gün")): self.feed_window_combobox.addItem(label, window)
+        self.feed_window_combobox.setCurrentIndex(max(self.feed_window_combobox.findData(self.settings.get('feed_window', DEFAULT_FEED_WINDOW)), 0))
+        self.feed_window_combobox.setToolTip("USGS temel akışı. Haftalık/aylık akışlar büyüktür; akış halinde okunur ve eşiğin altındaki olaylar indirilirken atılır.")
+        form_layout.addRow("Akış Penceresi:", self.feed_window_combobox)
+        self.feed_sources_input = QLineEdit(self.settings.get('feed_sources', DEFAULT_FEED_SOURCES)); self.feed_sources_input.setPlaceholderText(", ".join(SOURCE_NAMES))
+        self.feed_sources_input.setToolTip(f"Virgülle ayrılmış kaynaklar ({', '.join(SOURCE_NAMES)}); sıra önceliktir. Aynı deprem birden çok kaynakta görünürse tek olay olarak gösterilir.")
+        form_layout.addRow("Veri Kaynakları:", self.feed_sources_input)
+        self.metrics_port_spinbox = QSpinBox(); self.metrics_port_spinbox.setRange(0, 65535); self.metrics_port_spinbox.setSpecialValueText("Kapalı")
+        self.metrics_port_spinbox.setValue(self.settings.get('metrics_port', DEFAULT_METRICS_PORT))
+        self.metrics_port_spinbox.setToolTip(f"İstatistikler http://{self.settings.get('metrics_host', DEFAULT_METRICS_HOST)}:PORT/metrics (Prometheus) ve /metrics.json adreslerinden sunulur.")
+        form_layout.addRow("Ölçüm Uç Noktası Portu:", self.metrics_port_spinbox)
+        self.offline_map_checkbox = QCheckBox("Çevrimdışı harita önbelleği (karolar ve harita dosyaları yerelde saklanır; yeniden başlatınca etkinleşir)")
+        self.offline_map_checkbox.setChecked(self.settings.get('offline_map', DEFAULT_OFFLINE_MAP))
+        self.offline_map_checkbox.setToolTip(f"İzleme bölgelerinin çevresindeki karolar önceden indirilir; önbellek {self.settings.get('tile_cache_mb', DEFAULT_TILE_CACHE_MB)} MB ile sınırlıdır (INI: TileCacheMB, TileUrl, TilePrefetch).")
+        form_layout.addRow(self.offline_map_checkbox)
+        sound_layout = QHBoxLayout(); sound_file_path = self.settings.get('notification_sound', "")
+        # *** DEĞİŞİKLİK: Varsayılan ses yolu kontrolü resource_path ile ***
+        is_default_sound = os.path.basename(sound_file_path) == DEFAULT_NOTIFICATION_SOUND
+        try: default_sound_full_path = resource_path(DEFAULT_NOTIFICATION_SOUND)
+        except Exception: default_sound_full_path = "" # Hata olursa boş kalsın
+        # **************************************************************
+        if sound_file_path and os.path.exists(sound_file_path): sound_display_name = os.path.basename(sound_file_path); tooltip_path = sound_file_path
+        elif is_default_sound and os.path.exists(default_sound_full_path): sound_display_name = DEFAULT_NOTIFICATION_SOUND; tooltip_path = default_sound_full_path; self.settings['notification_sound'] = tooltip_path
+        else: sound_display_name = "Seçilmedi"; tooltip_path = ""
+        self.sound_label = QLabel(sound_display_name); self.sound_label.setToolTip(tooltip_path)
+        self.sound_button = QPushButton("Ses Seç..."); self.sound_button.clicked.connect(self.select_sound_file)
+        self.clear_sound_button = QPushButton("Temizle"); self.clear_sound_button.clicked.connect(self.clear_sound_file)
+        sound_layout.addWidget(self.sound_label, stretch=1); sound_layout.addWidget(self.sound_button); sound_layout.addWidget(self.clear_sound_button); form_layout.addRow("Bildirim Sesi:", sound_layout)
+        theme_layout = QHBoxLayout(); self.theme_combobox = QComboBox(); self.theme_combobox.addItems(["dark-blue", "dark-orange", "light-blue", "light-gray"])
+        self.theme_combobox.setCurrentText(self.settings.get('theme', DEFAULT_THEME)); theme_layout.addWidget(QLabel("Tema:")); theme_layout.addWidget(self.theme_combobox)
+        form_layout.addRow("Görünüm:", theme_layout)
+        self.save_settings_button = QPushButton("Ayarları Kaydet ve Uygula"); self.save_settings_button.clicked.connect(self.save_and_apply_settings)
+        layout.addLayout(form_layout); layout.addStretch(); layout.addWidget(self.save_settings_button, alignment=Qt.AlignCenter)
+        return widget
+
+    def create_nearby_tab(self):
+        widget = QWidget(); layout = QVBoxLayout(widget)
+        label = QLabel("Hedef konuma yakın (ayarlanan yarıçap içinde) ve minimum büyüklükteki depremler:")
+        self.nearby_filter_input = QLineEdit(); self.nearby_filter_input.setPlaceholderText("Yer adına göre süz...")
+        self.nearby_model = NearbyEventsModel(self, self.derived_cache); self.nearby_proxy = QSortFilterProxyModel(self); self.nearby_proxy.setSourceModel(self.nearby_model)
+        self.nearby_proxy.setSortRole(Qt.UserRole); self.nearby_proxy.setDynamicSortFilter(True)
+        self.nearby_proxy.setFilterKeyColumn(NearbyEventsModel.PLACE_COL); self.nearby_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.nearby_filter_input.textChanged.connect(self.nearby_proxy.setFilterFixedString)
+        self.nearby_table = QTableView(); self.nearby_table.setModel(self.nearby_proxy); self.nearby_table.setSortingEnabled(True)
+        self.nearby_table.sortByColumn(NearbyEventsModel.DISTANCE_COL, Qt.AscendingOrder)
+        self.nearby_table.setSelectionBehavior(QAbstractItemView.SelectRows); self.nearby_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.nearby_table.setEditTriggers(QAbstractItemView.NoEditTriggers); self.nearby_table.setAlternatingRowColors(True); self.nearby_table.setWordWrap(False)
+        self.nearby_table.verticalHeader().setVisible(False); self.nearby_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = self.nearby_table.horizontalHeader(); header.setSectionResizeMode(QHeaderView.Interactive); header.setStretchLastSection(True)
+        header.resizeSection(NearbyEventsModel.TIME_COL, 150); self.nearby_table.setColumnHidden(NearbyEventsModel.ZONE_COL, True)
+        self.nearby_table.selectionModel().currentRowChanged.connect(self.focus_map_on_list_item)
+        layout.addWidget(label); layout.addWidget(self.nearby_filter_input); layout.addWidget(self.nearby_table)
+        return widget
+
+    def create_map_tab(self):
+        widget = QWidget(); self.map_layout = QVBoxLayout(widget); self.map_layout.setContentsMargins(0, 0, 0, 0)
+        loading_label = QLabel("Harita başlatılıyor..."); loading_label.setAlignment(Qt.AlignCenter)
+        self.map_layout.addWidget(loading_label); logging.info("Harita sekmesi oluşturuldu (WebEngineView henüz eklenmedi).")
+        return widget
+
+    def initialize_map_view(self):
+        if self.map_view is None:
+            try:
+                logging.info("QWebEngineView başlatılıyor...")
+                from PySide6.QtWebEngineWidgets import QWebEngineView
+                from PySide6.QtWebEngineCore import QWebEngineSettings
+                from PySide6.QtWebChannel import QWebChannel
+                self.map_view = QWebEngineView()
+                logging.info("QWebEngineView başarıyla oluşturuldu.")
+                settings = self.map_view.settings()
+                if settings:
+                    try: settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True); logging.info("WebEngine Ayarları: Javascript=True")
+                    except AttributeError:
+                        try: settings.setAttribute(QWebEngineSettings.JavascriptEnabled, True); logging.info("WebEngine Ayarları: Javascript=True (doğrudan denendi)")
+                        except AttributeError: logging.warning("JavascriptEnabled attribute'u ayarlanamadı.")
+                else: logging.warning("WebEngine ayarları alınamadı!")
+                if self.map_view.page():
+                    self.map_view.page().loadFinished.connect(self.map_load_finished); logging.info("QWebEnginePage.loadFinished sinyali bağlandı.")
+                    self._map_bridge = MapBridge(self); self._map_channel = QWebChannel(self.map_view.page())
+                    self._map_channel.registerObject("depremBridge", self._map_bridge); self.map_view.page().setWebChannel(self._map_channel)
+                    self.setup_map_cache()
+                else: logging.warning("QWebEngineView sayfası alınamadı, loadFinished sinyali bağlanamadı.")
+                item = self.map_layout.takeAt(0)
+                if item and item.widget(): item.widget().deleteLater()
+                self.map_layout.addWidget(self.map_view)
+                self.load_base_map()
+            except Exception as e:
+                logging.critical("QWebEngineView OLUŞTURULURKEN KRİTİK HATA!", exc_info=True)
+                QMessageBox.critical(self, "Harita Hatası", f"Harita bileşeni başlatılamadı:\n{e}\n\nHarita sekmesi kullanılamayabilir.")
+                item = self.map_layout.itemAt(0)
+                if item and item.widget(): item.widget().setText("Harita yüklenemedi.")
+
+    def setup_map_cache(self):
+        """ Çevrimdışı harita: şema main() içinde kaydedildiyse karo/dosya önbelleğini açar ve sayfanın profiline deprem:// işleyicisini kurar. """
+        if not self.settings.get('offline_map', DEFAULT_OFFLINE_MAP) or not map_scheme_registered(): logging.info("Çevrimdışı harita önbelleği kullanılmıyor; harita ağdan yüklenecek."); return
+        try:
+            self.map_cache = MapCache(TILE_CACHE_FILE, self.settings.get('tile_cache_mb', DEFAULT_TILE_CACHE_MB) * 1024 * 1024, self.settings.get('tile_url', DEFAULT_TILE_URL), resource_path(ASSETS_DIR))
+            self._map_scheme_handler = create_scheme_handler(self.map_cache, self)
+            self.map_view.page().profile().installUrlSchemeHandler(MAP_SCHEME.encode(), self._map_scheme_handler)
+        except Exception as e:
+            logging.error(f"Harita önbelleği açılamadı; harita ağdan yüklenecek: {e}", exc_info=True); self._map_scheme_handler = None
+            if self.map_cache: self.map_cache.close(); self.map_cache = None
+            return
+        self.start_tile_prefetch()
+
+    def start_tile_prefetch(self):
+        if self.map_cache and self.settings.get('tile_prefetch', DEFAULT_TILE_PREFETCH):
+            logging.info(f"İzleme bölgeleri için {self.map_cache.start_prefetch(self.get_watch_zones())} karoluk ön indirme başlatıldı (önbellekteki taze karolar atlanır).")
+
+    def load_base_map(self):
+        """ Temel haritayı (olaysız) bir kez yükler; olaylar ve bölgeler yüklendikten sonra JavaScript ile eklenir. """
+        primary = self.get_watch_zones()[0]
+        try:
+            with METRICS.timer(stage='map_render'): html_content = build_base_map_html(primary.location, zoom_for_radius(primary.radius_km), offline=self._map_scheme_handler is not None)
+            self._map_ready = False; self._map_tracker.reset(); self._map_zones = None; self._map_viewport = None; self._map_view_target = (primary.lat, primary.lon, primary.radius_km)
+            self._map_load_started = time.perf_counter(); self.map_view.setHtml(html_content, QUrl("qrc:/")); logging.info(f"Temel harita yüklendi (uzunluk: {len(html_content)}).")
+        except Exception as e:
+            logging.error(f"Temel harita oluşturulurken hata: {e}", exc_info=True)
+            self.map_view.setHtml("<html><body style='color:red;'>Harita oluşturulurken hata oluştu.</body></html>")
+
+    @Slot(bool)
+    def map_load_finished(self, success):
+        if self._map_load_started is not None: METRICS.observe('stage_seconds', time.perf_counter() - self._map_load_started, stage='map_load'); self._map_load_started = None
+        if success:
+            logging.info("Harita sayfası başarıyla yüklendi (loadFinished=True).")
+            self._map_ready = True; self._map_zones = None; self.update_map()
+        else: logging.error("Harita sayfası yüklenirken HATA oluştu (loadFinished=False).")
+
+    def javascript_callback(self, result): logging.info(f"Haritadaki işaretçi sayısı: {result}")
+
+    def create_stats_tab(self):
+        widget = QWidget(); layout = QVBoxLayout(widget); top_layout = QHBoxLayout()
+        self.stats_summary_label = QLabel(); self.stats_summary_label.setWordWrap(True)
+        reset_button = QPushButton("Sıfırla"); reset_button.clicked.connect(self.reset_stats)
+        top_layout.addWidget(self.stats_summary_label, 1); top_layout.addWidget(reset_button); layout.addLayout(top_layout)
+        self.stats_table = QTableWidget(0, len(STATS_COLUMNS)); self.stats_table.setHorizontalHeaderLabels(STATS_COLUMNS)
+        self.stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers); self.stats_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stats_table.verticalHeader().setVisible(False); self.stats_table.setAlternatingRowColors(True); self.stats_table.setWordWrap(False)
+        header = self.stats_table.horizontalHeader(); header.setSectionResizeMode(QHeaderView.ResizeToContents); header.setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.stats_table)
+        self.stats_timer = QTimer(self); self.stats_timer.timeout.connect(self.refresh_stats_view); self.stats_timer.start(STATS_REFRESH_INTERVAL_MS)
+        return widget
+
+    @Slot()
+    def refresh_stats_view(self, *args):
+        """ Ölçümlerin anlık görüntüsünü tabloya yazar; pencere ya da İstatistik sekmesi görünmüyorsa bir şey yapmaz. """
+        if not self.isVisible() or self.tab_widget.currentWidget() is not self.stats_tab: return
+        snapshot = METRICS.snapshot(); rows = []
+        for metric in snapshot['counters']: rows.append((metric['name'] + format_labels(tuple(metric['labels'].items())), str(metric['value'])))
+        for metric in snapshot['histograms']:
+            rows.append((metric['name'] + format_labels(tuple(metric['labels'].items())), str(metric['count'])) +
+                        tuple(f"{metric[key] * 1000:.1f}" for key in ('mean', 'p50', 'p95', 'max', 'last')))
+        self.stats_table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column: item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stats_table.setItem(row, column, item)
+        endpoint = f"http://{self.metrics_server.address[0]}:{self.metrics_server.address[1]}/metrics" if self.metrics_server else "kapalı"
+        self.stats_summary_label.setText(f"Çalışma süresi: {snapshot['uptime_s'] / 60:.1f} dk — sorgu: {METRICS.counter_value('polls_total', result='ok')} başarılı, "
+                                         f"{METRICS.counter_value('polls_total', result='error')} hatalı — bildirim: {METRICS.counter_value('notifications_sent_total', channel='desktop')} — uç nokta: {endpoint}")
+
+    @Slot()
+    def reset_stats(self): METRICS.reset(); logging.info("İstatistikler sıfırlandı."); self.refresh_stats_view()
+
+    def apply_metrics_server(self):
+        """ MetricsPort ayarına göre yerel ölçüm uç noktasını başlatır, başka porta taşır ya da kapatır (0 = kapalı). """
+        endpoint = (self.settings.get('metrics_host', DEFAULT_METRICS_HOST), self.settings.get('metrics_port', DEFAULT_METRICS_PORT))
+        if endpoint == self._metrics_endpoint and (self.metrics_server or not endpoint[1]): return
+        if self.metrics_server: self.metrics_server.close(); self.metrics_server = None; logging.info("Ölçüm uç noktası kapatıldı.")
+        self._metrics_endpoint = endpoint
+        if not endpoint[1]: return
+        try: self.metrics_server = MetricsServer(endpoint[1], endpoint[0])
+        except OSError as e: logging.error(f"Ölçüm uç noktası açılamadı ({endpoint[0]}:{endpoint[1]}): {e}")
+
+    def create_log_tab(self):
+        widget = QWidget(); layout = QVBoxLayout(widget); filter_layout = QHBoxLayout()
+        self.log_level_combo = QComboBox()
+        for name, level in LOG_LEVEL_FILTERS: self.log_level_combo.addItem(name, level)
+        self.log_filter_input = QLineEdit(); self.log_filter_input.setPlaceholderText("Loglarda ara...")
+        filter_layout.addWidget(QLabel("Seviye:")); filter_layout.addWidget(self.log_level_combo); filter_layout.addWidget(self.log_filter_input, 1); layout.addLayout(filter_layout)
+        self.log_text_edit = QPlainTextEdit(); self.log_text_edit.setReadOnly(True); self.log_text_edit.setMaximumBlockCount(LOG_VIEW_MAX_LINES)
+        self.log_text_edit.setFont(QFont("Courier New", 9)); layout.addWidget(self.log_text_edit)
+        self.log_level_combo.currentIndexChanged.connect(self.refilter_log_view); self.log_filter_input.textChanged.connect(self.refilter_log_view)
+        self.refilter_log_view()
+        self.log_flush_timer = QTimer(self); self.log_flush_timer.timeout.connect(self.flush_log_view); self.log_flush_timer.start(LOG_FLUSH_INTERVAL_MS)
+        return widget
+
+    def _log_view_filter(self): return self.log_level_combo.currentData(), self.log_filter_input.text().strip() or None
+
+    @Slot()
+    def refilter_log_view(self, *args):
+        """ Log görünümünü süzgeçlere göre tampondan yeniden doldurur. """
+        self._log_view_seq = seq = log_buffer.last_seq  # Sorgudan sonra gelen kayıtlar bir sonraki akışta eklenir
+        lines = [entry[2] for entry in log_buffer.query(*self._log_view_filter(), LOG_VIEW_MAX_LINES) if entry[0] <= seq]
+        self.log_text_edit.setPlainText("\n".join(lines)); self.log_text_edit.moveCursor(QTextCursor.End)
+
+    @Slot()
+    def flush_log_view(self):
+        """ Son akıştan bu yana gelen kayıtları tek seferde ekler; pencere ya da Log sekmesi görünmüyorsa tampon beklemeye devam eder. """
+        if log_buffer.last_seq == self._log_view_seq or not self.isVisible() or self.tab_widget.currentWidget() is not self.log_tab: return
+        entries = log_buffer.records_since(self._log_view_seq)
+        if not entries: return
+        self._log_view_seq = entries[-1][0]; lines = [entry[2] for entry in filter_entries(entries, *self._log_view_filter())[-LOG_VIEW_MAX_LINES:]]
+        if lines: self.log_text_edit.appendPlainText("\n".join(lines))
+
+    def load_settings(self): self.settings = load_settings(self.settings_path)
+
+    def save_settings(self):
+        try: save_settings(self.settings, self.settings_path); self.status_bar.showMessage("Ayarlar kaydedildi.", 3000)
+        except IOError as e: logging.error(f"Ayarlar kaydedilemedi: {e}"); QMessageBox.warning(self, "Hata", f"Ayarlar dosyaya yazılamadı:\n{e}")
+
+    @Slot()
+    def save_and_apply_settings(self):
+        logging.info("Ayarlar kaydediliyor ve uygulanıyor...")
+        try:
+            previous_zones = self.get_watch_zones(); previous_fetch = (feed_source_config(self.settings), self.settings.get('feed_window'), self.settings.get('history_hours'))
+            self.settings['min_magnitude'] = self.magnitude_slider.value() / 10.0; self.settings['check_interval_min'] = self.interval_spinbox.value(); self.settings['adaptive_polling'] = self.adaptive_polling_checkbox.isChecked()
+            self.settings['target_lat'] = float(self.lat_input.text().replace(',', '.')); self.settings['target_lon'] = float(self.lon_input.text().replace(',', '.'))
+            self.settings['radius_km'] = self.radius_input.value(); self.settings['watch_zones'] = format_watch_zones(parse_watch_zones(self.watch_zones_input.toPlainText(), reserved=(PRIMARY_ZONE_NAME,))); self.watch_zones_input.setPlainText(self.settings['watch_zones'])
+            self.settings['notifications_enabled'] = self.notifications_checkbox.isChecked()
+            self.settings['notification_sound'] = self.sound_label.toolTip() if self.sound_label.toolTip() else ""; self.settings['theme'] = self.theme_combobox.currentText()
+            self.settings['history_hours'] = self.history_spinbox.value(); self.settings['delta_feed'] = self.delta_feed_checkbox.isChecked(); self.feed_client.delta_mode = self.settings['delta_feed']
+            self.settings['feed_window'] = self.feed_window_combobox.currentData(); self.feed_client.set_window(self.settings['feed_window'])
+            previous_sources = feed_source_config(self.settings); self.settings['feed_sources'] = ", ".join(parse_source_names(self.feed_sources_input.text())); self.feed_sources_input.setText(self.settings['feed_sources'])
+            if feed_source_config(self.settings) != previous_sources and self.replay is None:
+                old_client = self.feed_client; self.feed_client = create_feed_client(self.settings); old_client.close()  # Süren sorgu aşağıdaki zorunlu güncellemeyle iptal edilir
+            self.settings['metrics_port'] = self.metrics_port_spinbox.value(); self.apply_metrics_server()
+            self.settings['offline_map'] = self.offline_map_checkbox.isChecked(); self.start_tile_prefetch()
+            self.apply_theme(self.settings['theme']); self.notifier.apply_settings(self.settings); self.poll_scheduler.apply_settings(self.settings); self.save_settings()
+            zones = self.get_watch_zones()
+            if (feed_source_config(self.settings), self.settings['feed_window'], self.settings['history_hours']) != previous_fetch or not len(self.event_store) or not prefilter_covers(self.feed_client.prefilter, FeaturePrefilter.for_zones(zones)):
+                self.check_for_earthquakes(is_initial_load=True, force_update=True)  # Eldeki depoda bulunmayan olaylar gerekiyor
+            elif zones != previous_zones: self.refilter_events()
+            else: logging.info("Değişen ayarlar olay verisini etkilemiyor; yeniden sorgu yapılmadı.")
+            if self._fetch_worker is None and self.replay is None:
+                # Sorgu yapılmadıysa bekleyen kontrol eski aralıkla kurulu kalmasın (süren sorgu bitince zaten yeniden kurulur)
+                self.check_timer.stop(); self.check_timer.start(self.poll_scheduler.after_settings_change().delay_ms)
+            logging.info("Ayarlar başarıyla uygulandı ve kaydedildi.")
+        except ValueError as e: logging.error(f"Ayarları okurken geçersiz değer: {e}"); QMessageBox.warning(self, "Geçersiz Değer", f"Lütfen sayısal alanlara geçerli değerler girin.\n{e}")
+        except Exception as e: logging.error(f"Ayarlar kaydedilirken/uygulanırken hata: {e}", exc_info=True); QMessageBox.critical(self, "Hata", f"Ayarlar uygulanırken bir sorun oluştu:\n{e}")
+
+    @Slot()
+    def select_sound_file(self):
+        current_path = self.sound_label.toolTip(); start_dir = os.path.dirname(current_path) if current_path and os.path.exists(os.path.dirname(current_path)) else QStandardPaths.writableLocation(QStandardPaths.MusicLocation)
+        file_path, _ = QFileDialog.getOpenFileName(self, "Bildirim Ses Dosyası Seç", start_dir, "Ses Dosyaları (*.wav *.mp3)")
+        if file_path: self.sound_label.setText(os.path.basename(file_path)); self.sound_label.setToolTip(file_path); logging.info(f"Bildirim sesi seçildi: {file_path}")
+
+    @Slot()
+    def clear_sound_file(self):
+        self.sound_label.setText("Seçilmedi"); self.sound_label.setToolTip(""); logging.info("Bildirim sesi temizlendi.")
+
+    def get_stylesheet(self, theme_name):
+        base_style = """ QWidget { font-size: 10pt; } QPushButton { padding: 6px 12px; } QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit, QPlainTextEdit, QTableView { padding: 4px; border: 1px solid #555; } QStatusBar { font-size: 9pt; } QTabWidget::pane { border: 1px solid #444; } QTabBar::tab { padding: 8px 15px; } """
+        dark_colors = { "bg": "#2E2E2E", "bg_alt": "#3C3C3C", "text": "#E0E0E0", "border": "#555", "highlight": "#5A9BFF", "button": "#4A4A4A", "button_hover": "#5A5A5A", "button_text": "#E0E0E0" }
+        light_colors = { "bg": "#F0F0F0", "bg_alt": "#E0E0E0", "text": "#1E1E1E", "border": "#B0B0B0", "highlight": "#0078D7", "button": "#D0D0D0", "button_hover": "#C0C0C0", "button_text": "#1E1E1E" }
+        colors = dark_colors if "dark" in theme_name else light_colors
+        if "blue" in theme_name: colors["highlight"] = dark_colors["highlight"] if "dark" in theme_name else light_colors["highlight"]
+        elif "orange" in theme_name: colors["highlight"] = "#FFA500"
+        elif "green" in theme_name: colors["highlight"] = "#4CAF50"
+        qss = base_style + f""" QMainWindow, QWidget {{ background-color: {colors['bg']}; color: {colors['text']}; }} QTabWidget::pane {{ background-color: {colors['bg_alt']}; border-color: {colors['border']}; }} QTabBar::tab {{ background-color: {colors['button']}; color: {colors['button_text']}; border: 1px solid {colors['border']}; margin-right: 2px; border-bottom: none; }} QTabBar::tab:selected {{ background-color: {colors['bg_alt']}; border-bottom: 2px solid {colors['highlight']}; }} QTabBar::tab:hover {{ background-color: {colors['button_hover']}; }} QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit, QPlainTextEdit, QTableView {{ background-color: {colors['bg_alt']}; color: {colors['text']}; border-color: {colors['border']}; }} QTextEdit, QPlainTextEdit, QTableView {{ border-radius: 3px; }} QPushButton {{ background-color: {colors['button']}; color: {colors['button_text']}; border: 1px solid {colors['border']}; border-radius: 3px; }} QPushButton:hover {{ background-color: {colors['button_hover']}; }} QPushButton:pressed {{ background-color: {colors['highlight']}; color: {colors['bg']}; }} QSlider::groove:horizontal {{ height: 5px; background: {colors['bg_alt']}; border-radius: 2px; border: 1px solid {colors['border']}; }} QSlider::handle:horizontal {{ background: {colors['highlight']}; border: 1px solid {colors['highlight']}; width: 14px; height: 14px; margin: -5px 0; border-radius: 7px; }} QSlider::sub-page:horizontal {{ background: {colors['highlight']}; border-radius: 2px; }} QCheckBox::indicator {{ width: 16px; height: 16px; }} QCheckBox::indicator:unchecked {{ border: 1px solid {colors['border']}; background-color: {colors['bg_alt']}; }} QCheckBox::indicator:checked {{ background-color: {colors['highlight']}; border: 1px solid {colors['highlight']}; }} QStatusBar {{ background-color: {colors['bg_alt']}; border-top: 1px solid {colors['border']}; }} QTableView::item:selected {{ background-color: {colors['highlight']}; color: {colors['bg']}; }} QMessageBox {{ background-color: {colors['bg_alt']}; }} """
+        return qss
+
+    def apply_theme(self, theme_name): stylesheet = self.get_stylesheet(theme_name); self.setStyleSheet(stylesheet); logging.info(f"Tema uygulandı: {theme_name}")
+
+    @Slot()
+    def check_for_earthquakes_slot(self): logging.info("Periyodik kontrol tetiklendi."); self.check_for_earthquakes()
+
+    def schedule_next_check(self, poll, error=None):
+        """ Biten kontrolün sonucuna göre (PollScheduler) bir sonraki periyodik kontrolü kurar; oynatmada bir sonraki tur diliminde. """
+        if self.replay is not None:
+            if not self.replay.finished: self.check_timer.start(int(self.replay.next_delay_s() * 1000))
+            return
+        decision = self.poll_scheduler.after_poll(poll, error); self.check_timer.start(decision.delay_ms)
+
+    def end_replay_tick(self, changes, alerts=0):
+        """ Oynatmada turun gecikmesini (değişiklikler liste, harita ve bildirimlere yansıdıktan sonra) kaydeder. """
+        if self.replay is None: return
+        self.replay.end_tick(changes, alerts); self.status_bar.showMessage(self.replay.status_text())
+        if self.replay.finished: logging.info(f"Oynatma bitti: {self.replay.stats.format()}")
+
+    def load_from_archive(self):
+        """ Ağ beklenmeden arayüzü arşivdeki son olaylarla doldurur. """
+        if not self.archive: return
+        try:
+            history_ms = max(self.settings.get('history_hours', DEFAULT_HISTORY_HOURS) * 3600 * 1000, self.feed_client.window_ms)
+            store = self.archive.query(start_ms=time.time() * 1000 - history_ms)
+            if not len(store): logging.info("Arşivde gösterilecek olay yok."); return
+            zone_matches = process_earthquake_data(store, self.get_watch_zones(), self.settings.get('distance_method', DEFAULT_DISTANCE_METHOD), self.derived_cache)
+            self.set_event_data(store, zone_matches, build_cluster_index(store, zone_matches))
+            self.update_nearby_list(); self.status_bar.showMessage(f"Arşivden {len(store)} olay yüklendi, veriler güncelleniyor...", 5000)
+            logging.info(f"Arşivden {len(store)} olay yüklendi.")
+        except Exception as e: logging.error(f"Arşivden yükleme hatası: {e}", exc_info=True)
+
+    def perform_initial_load(self):
+        logging.info("Başlangıç yüklemesi yapılıyor...")
+        if self.map_view is None: self.initialize_map_view()
+        self.check_for_earthquakes(is_initial_load=True, force_update=True)
+
+    def get_watch_zones(self): return watch_zones_from_settings(self.settings)
+
+    def set_event_data(self, store, zone_matches, cluster_index):
+        if store is not self.event_store: self.derived_cache.retain(store)
+        self.event_store = store; self.zone_matches = zone_matches or {}; self.cluster_index = cluster_index; self._map_event_info = None
+
+    def refilter_events(self):
+        """ Ağa gitmeden eldeki depoyu güncel bölgelerle (konum, yarıçap, büyüklük) yeniden eşleştirir; uzaklıklar DerivedCache'ten
+        gelir, yalnızca yeni hedef konumlar için eksik olanlar hesaplanır. Süren bir sorgu eski bölgelerle eşleştireceğinden
+        o durumda zorunlu güncelleme yapılır. """
+        if self._fetch_worker is not None: self.check_for_earthquakes(is_initial_load=True, force_update=True); return
+        store = self.event_store
+        with METRICS.timer(stage='refilter'):
+            zone_matches = process_earthquake_data(store, self.get_watch_zones(), self.settings.get('distance_method', DEFAULT_DISTANCE_METHOD), self.derived_cache)
+            self.set_event_data(store, zone_matches, build_cluster_index(store, zone_matches))
+        self.update_ui_with_data(); logging.info(f"{len(store)} olay yeni bölgelerle yerelde süzüldü (akış yeniden indirilmedi).")
+        self.status_bar.showMessage("Ayarlar uygulandı; liste ve harita eldeki verilerle güncellendi.", 5000)
+
+    def check_for_earthquakes(self, is_initial_load=False, force_update=False):
+        if self._fetch_worker is not None:
+            if not force_update: logging.info("Önceki kontrol hâlâ sürüyor, bu kontrol atlandı."); return
+            logging.info("Önceki kontrol iptal ediliyor (zorunlu güncelleme)."); self._fetch_worker.cancel()
+        self.check_timer.stop()  # Bekleyen kontrol bu kontrol bitince yeniden kurulur
+        if self.replay is not None: self.replay.begin_tick()
+        worker = EarthquakeFetchWorker(self.feed_client, self.get_watch_zones(), is_initial_load=is_initial_load, force_update=force_update, distance_method=self.settings.get('distance_method', DEFAULT_DISTANCE_METHOD),
+                                       archive=self.archive, history_hours=self.settings.get('history_hours', DEFAULT_HISTORY_HOURS), cache=self.derived_cache)
+        worker.signals.finished.connect(self.on_earthquake_data_ready); worker.signals.failed.connect(self.on_earthquake_data_failed)
+        self._fetch_worker = worker; self.thread_pool.start(worker)
+        self.status_bar.showMessage("Deprem verileri güncelleniyor...", 3000)
+
+    @Slot(object, str)
+    def on_earthquake_data_failed(self, worker, message):
+        if worker is not self._fetch_worker: return
+        self._fetch_worker = None; self.status_bar.showMessage(message, 5000); self.schedule_next_check(worker.poll, message)
+
+    @Slot(object, object)
+    def on_earthquake_data_ready(self, worker, result):
+        if worker is not self._fetch_worker:
+            if result.changed: self._carried_changes = result.changes if self._carried_changes is None else self._carried_changes.merged(result.changes)
+            logging.info("Eski bir kontrolün sonucu yok sayıldı."); return
+        self._fetch_worker = None; changes = result.changes; self.schedule_next_check(worker.poll)
+        if self._carried_changes is not None: changes = self._carried_changes.merged(changes); self._carried_changes = None
+        if not worker.force_update and changes.is_empty:
+            logging.info("Deprem verilerinde değişiklik yok."); self.status_bar.showMessage("Veriler güncel.", 3000); self.end_replay_tick(changes); return
+        logging.info(f"Değişiklikler: {changes}")
+        if worker.zone_matches is not None: self.set_event_data(result.store, worker.zone_matches, worker.cluster_index)
+        notify = not worker.is_initial_load and self.settings.get('notifications_enabled')
+        alerts = self.seen_events.observe(result.store, changes, self.settings.get('min_magnitude'), notify=notify)
+        for eq, upgraded in alerts: self.notifier.submit(eq, upgraded)
+        self.update_ui_with_data(None if worker.full_refresh or worker.zone_matches is None else changes); total_count = len(self.event_store)
+        self.status_bar.showMessage(f"Veriler güncellendi. Toplam: {total_count}.", 5000); self.end_replay_tick(changes, len(alerts))
+
+    def update_ui_with_data(self, changes=None):
+        """ changes verilirse liste yalnızca değişen olayları inceler; görünür eşleşmeler değişmediyse harita da atlanır. """
+        logging.info("Arayüz verilerle güncelleniyor...")
+        touched = self.update_nearby_list(changes)
+        if not self.map_view: logging.warning("Harita görünümü henüz başlatılmadığı için harita güncellenemedi.")
+        elif changes is None or touched: self.update_map()
+        else: logging.info("Değişiklikler bölgelerdeki olayları etkilemiyor; harita güncellenmedi.")
+
+    def update_nearby_list(self, changes=None):
+        if not self.nearby_model: return 0
+        rows, distances, zone_ids, zone_names = merge_zone_matches(self.zone_matches)
+        with METRICS.timer(stage='nearby_model'): added, updated, removed = self.nearby_model.apply(self.event_store, rows, distances, zone_ids, zone_names, changes)
+        self.nearby_table.setColumnHidden(NearbyEventsModel.ZONE_COL, len(self.zone_matches) <= 1)
+        logging.info(f"Yakındaki depremler listesi güncellendi: +{added} ~{updated} -{removed} (toplam {self.nearby_model.rowCount()}).")
+        return added + updated + removed
+
+    def update_map(self):
+        if not self.map_view: logging.warning("Harita güncellenemiyor..."); return
+        if not self._map_ready or not self.map_view.page(): logging.info("Harita sayfası henüz hazır değil; yüklendiğinde güncellenecek."); return
+        page = self.map_view.page(); zones = self.get_watch_zones(); primary = zones[0]
+        zone_data = zones_payload(zones)
+        if zone_data != self._map_zones:
+            view = None; view_target = (primary.lat, primary.lon, primary.radius_km)
+            if view_target != self._map_view_target: view = [primary.lat, primary.lon, zoom_for_radius(primary.radius_km)]; self._map_view_target = view_target
+            page.runJavaScript(f"window.depremSetZones && window.depremSetZones({json.dumps(zone_data, ensure_ascii=False)}, {json.dumps(view)});"); self._map_zones = zone_data
+            logging.info(f"Haritadaki {len(zones)} izleme bölgesi güncellendi.")
+        if self._map_viewport is None: logging.info("Haritanın görünür alanı henüz bildirilmedi; kümeler sayfanın isteğiyle yüklenecek."); return
+        with METRICS.timer(stage='map_diff'): batch = self.map_cluster_batch()
+        if MapDiffTracker.is_empty(batch): logging.info("Harita güncel, gönderilecek değişiklik yok."); return
+        page.runJavaScript(MapDiffTracker.to_js(batch), self.javascript_callback)
+        logging.info(f"Harita farkı gönderildi: +{len(batch['added'])} ~{len(batch['updated'])} -{len(batch['removed'])} (toplam {len(self._map_tracker.shown)}).")
+
+    def map_cluster_batch(self):
+        """ Son bildirilen görünür alandaki kümeleri hesaplar; sayfada gösterilenlerle farkını döndürür. """
+        current = {}; store = self.event_store
+        if self.cluster_index is not None:
+            for key, lat, lon, count, max_mag, leaf in self.cluster_index.get_clusters(*self._map_viewport):
+                row = store.row_of(key) if leaf >= 0 else None
+                tooltip = cluster_tooltip(count, max_mag) if row is None else self.derived_cache.text(key, int(store.updated[row]), 'tooltip', lambda: event_tooltip(store.record(row)))
+                current[key] = marker_payload(key, lat, lon, count, max_mag, tooltip)
+        return self._map_tracker.diff(current)
+
+    def map_viewport_changed(self, zoom, west, south, east, north):
+        self._map_viewport = (zoom, west, south, east, north); batch = self.map_cluster_batch()
+        return "" if MapDiffTracker.is_empty(batch) else json.dumps(batch, ensure_ascii=False)
+
+    def map_popup_html(self, key):
+        """ İşaretçi tıklandığında açılır pencere HTML'ini üretir (olay ya da küme). """
+        index = self.cluster_index; store = self.event_store
+        if index is None: return ""
+        cluster = ClusterIndex.parse_cluster_key(key)
+        if cluster is None:
+            record = store.get(key)
+            if record is None: return ""
+            if self._map_event_info is None:
+                rows, distances, zone_ids, zone_names = merge_zone_matches(self.zone_matches); ids = store.ids
+                self._map_event_info = {ids[row]: (distance, zone_names[zone]) for row, distance, zone in zip(rows.tolist(), distances.tolist(), zone_ids.tolist())}
+            distance, zone_name = self._map_event_info.get(key, (record.distance, PRIMARY_ZONE_NAME))
+            return self.derived_cache.text(key, record.updated, ('popup', zone_name, round(distance, 1)), lambda: event_popup_html(record, distance, zone_name, format_datetime(record.time_dt)))
+        generation, zoom, i = cluster
+        if generation != index.generation: return ""  # Küme, dizin yeniden kurulmadan önce çizilmiş bir işaretçiye ait
+        try: lat, lon, count, max_mag = index.cluster_info(zoom, i)
+        except (KeyError, IndexError): return ""
+        leaves = index.leaves(zoom, i); top = leaves[np.argsort(-index.mags[leaves], kind='stable')[:5]]
+        records = [record for record in (store.get(index.keys[j]) for j in top.tolist()) if record is not None]
+        return cluster_popup_html(count, max_mag, records, lat, lon, index.expansion_zoom(zoom, i))
+
+    @Slot(QModelIndex, QModelIndex)
+    def focus_map_on_list_item(self, current, previous):
+        if not self.nearby_table.hasFocus(): return  # Yalnızca kullanıcının tablodaki gezinmesi haritayı taşır (süzme/güncelleme değil)
+        if current.isValid() and self.map_view and self.map_view.page():
+            eq_id = current.data(NearbyEventsModel.EVENT_ID_ROLE)
+            if eq_id == self._focused_event_id: return  # Sıralama/güncelleme yüzünden satır numarası değişti, seçim aynı
+            self._focused_event_id = eq_id; eq_data = self.event_store.get(eq_id)
+            if eq_data:
+                if eq_data.lat == eq_data.lat and eq_data.lon == eq_data.lon:  # NaN değilse
+                    lat, lon = eq_data.lat, eq_data.lon
+                    js_code = f"if (window.depremFocus) {{ window.depremFocus({lat}, {lon}, 10); }} else {{ console.warn('Leaflet map object (depremMap) not found for focusing.'); }}"
+                    self.map_view.page().runJavaScript(js_code)
+                    logging.info(f"Harita listesinden odaklanıyor: {lat:.4f}, {lon:.4f}")
+                    map_tab_index = -1
+                    for i in range(self.tab_widget.count()):
+                        if self.tab_widget.widget(i) == self.map_tab: map_tab_index = i; break
+                    if map_tab_index != -1: self.tab_widget.setCurrentIndex(map_tab_index)
+
+    # closeEvent (Tepsiye gönderme eklendi)
+    def closeEvent(self, event):
+        if self.tray_icon and self.tray_icon.isVisible():
+            event.ignore(); self.hide()
+            self.tray_icon.showMessage(APP_NAME,"Uygulama arka planda çalışıyor.", QSystemTrayIcon.Information, 2000)
+            logging.info("Pencere kapatıldı (arka plana alındı).")
+        else:
+            logging.info("Uygulama kapatılıyor (tepsi ikonu yok/gizli)...")
+            self.quit_application(); event.accept()
+
+# --- Uygulama Başlangıcı ---
+def main(argv=None, replay=None, settings_path=SETTINGS_FILE):
+    """ Masaüstü arayüzünü başlatır (deprem.py giriş noktası tarafından çağrılır); replay verilirse kayıttan oynatır (deprem_replay).
+    Ayarlar settings_path INI dosyasından okunur ve oraya kaydedilir. """
+    try:
+        os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu"; logging.info("Ortam değişkeni ayarlandı: QTWEBENGINE_CHROMIUM_FLAGS=--disable-gpu")
+        if platform.system() == "Windows":
+             QCoreApplication.setAttribute(Qt.AA_UseSoftwareOpenGL)
+             logging.info("Windows algılandı, yazılım tabanlı rendering (AA_UseSoftwareOpenGL) deneniyor.")
+    except Exception as e: logging.error(f"Başlangıç ayarları yapılırken hata: {e}")
+    logging.info(f"{APP_NAME} başlatılıyor...")
+    # Özel URL şemaları QApplication'dan önce kaydedilmelidir (harita sekmesinin kendisi yine ilk açılışta yüklenir)
+    if load_settings(settings_path).get('offline_map', DEFAULT_OFFLINE_MAP): register_map_scheme()
+    try: QApplication.setAttribute(Qt.AA_EnableHighDpiScaling); QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    except AttributeError: logging.warning("Bu Qt sürümünde DPI öznitelikleri desteklenmiyor olabilir.")
+
+    QApplication.setQuitOnLastWindowClosed(False) # Pencere kapansa da çıkma
+    # QtWebEngine, QApplication'dan sonra (harita sekmesi açılırken) yüklendiği için paylaşılan OpenGL bağlamı önceden istenir
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
+    app = QApplication([sys.argv[0]] + list(sys.argv[1:] if argv is None else argv)); app.setOrganizationName("MyCompanyOrName"); app.setApplicationName(APP_NAME)
+    try:
+        window = EarthquakeMainWindow(replay, settings_path); window.show(); logging.info("Olay döngüsü başlatılıyor...")
+        return app.exec()
+    except Exception as e:
+        logging.critical("Uygulama başlatılırken kritik hata!", exc_info=True)
+        error_msg = f"Uygulamada kritik bir hata oluştu:\n\n{traceback.format_exc()}"
+        try: QMessageBox.critical(None, "Kritik Hata", error_msg)
+        except: print("\n\n" + error_msg + "\n")
+        return 1
\ No newline at end of file
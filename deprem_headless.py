@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Arayüzsüz (headless) izleme kipi: Qt ve Chromium yüklenmeden aynı sorgu/süzme/bildirim hattı (deprem_pipeline)
+# INI ayarlarıyla çalıştırılır. Bildirimler JSON satırları olarak stdout'a ve/veya yerel bir TCP soketine yazılır;
+# loglar stderr'e gider. MetricsPort ayarı (ya da --metrics-port) verilirse ölçümler yerel HTTP'den sunulur.
+# Kullanım: python deprem.py --headless [--settings DOSYA] [--socket PORT] [--metrics-port PORT] [--once]
+import argparse
+import json
+import logging
+import math
+import signal
+import socket
+import sys
+import threading
+
+from deprem_archive import EventArchive, ARCHIVE_FILE
+from deprem_cache import DerivedCache
+from deprem_changes import SeenEvents
+from deprem_log import LOG_FORMAT
+from deprem_metrics import METRICS, MetricsServer, DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT
+from deprem_pipeline import create_feed_client, poll_feed
+from deprem_scheduler import PollScheduler
+from deprem_settings import (SETTINGS_FILE, DEFAULT_ARCHIVE_ENABLED, DEFAULT_HISTORY_HOURS,
+                             DEFAULT_MIN_MAGNITUDE, format_datetime, load_settings, watch_zones_from_settings)
+from deprem_distance import DEFAULT_DISTANCE_METHOD
+from deprem_zones import merge_zone_matches
+
+DEFAULT_SOCKET_HOST = "127.0.0.1"
+SOCKET_SEND_TIMEOUT_S = 2.0  # Okumayan istemci izlemeyi bekletmesin
+
+
+def _finite(value, digits):
+    return round(float(value), digits) if value is not None and math.isfinite(value) else None
+
+
+def alert_message(record, distance=None, zone_name=None, upgraded=False):
+    """ Bildirilecek bir deprem için JSON satırı sözlüğü (NaN/sonsuz değerler null yazılır). """
+    return {'type': 'alert', 'id': record.id, 'mag': _finite(record.mag, 2), 'place': record.place, 'time': format_datetime(record.time_dt), 'time_ms': int(record.time),
+            'lat': _finite(record.lat, 4), 'lon': _finite(record.lon, 4), 'depth_km': _finite(record.depth, 1),
+            'distance_km': _finite(record.distance if distance is None else distance, 1), 'zone': zone_name, 'upgraded': upgraded}
+
+
+class JsonLineWriter:
+    """ Her mesajı bir JSON satırı olarak akışa (varsayılan stdout) yazar. """
+
+    def __init__(self, stream=None): self.stream = stream or sys.stdout
+
+    def write(self, message): self.stream.write(json.dumps(message, ensure_ascii=False) + "\n"); self.stream.flush()
+
+    def close(self): pass
+
+
+class SocketBroadcaster:
+    """ host:port üzerinde dinler; bağlı her istemciye mesajları JSON satırları olarak gönderir, kopanları bırakır. """
+
+    def __init__(self, port, host=DEFAULT_SOCKET_HOST):
+        self._server = socket.create_server((host, port)); self._clients = []; self._lock = threading.Lock()
+        self.address = self._server.getsockname()[:2]
+        threading.Thread(target=self._accept_loop, name="deprem-socket", daemon=True).start()
+        logging.info(f"Bildirim soketi dinleniyor: {self.address[0]}:{self.address[1]}")
+
+    def _accept_loop(self):
+        while True:
+            try: conn, addr = self._server.accept()
+            except OSError: return  # Sunucu kapatıldı
+            conn.settimeout(SOCKET_SEND_TIMEOUT_S)
+            with self._lock: self._clients.append(conn)
+            logging.info(f"Soket istemcisi bağlandı: {addr[0]}:{addr[1]}")
+
+    def write(self, message):
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._lock: clients = list(self._clients)
+        for conn in clients:
+            try: conn.sendall(data)
+            except OSError as e:
+                logging.info(f"Soket istemcisi bırakıldı: {e}")
+                with self._lock:
+                    if conn in self._clients: self._clients.remove(conn)
+                conn.close()
+
+    def close(self):
+        self._server.close()
+        with self._lock: clients = self._clients; self._clients = []
+        for conn in clients: conn.close()
+
+
+class HeadlessMonitor:
+    """ Akışı PollScheduler'ın belirlediği aralıklarla sorgular; eşiği geçen depremler için yazıcılara 'alert' mesajı,
+    status=True ise her sorgudan sonra bir 'poll' durum mesajı gönderir. İlk başarılı sorgu bildirim üretmez.
+    feed_client verilirse (ör. deprem_replay.ReplayFeedClient) ayarlardaki kaynaklar yerine o kullanılır. """
+
+    def __init__(self, settings, writers, status=False, interval_min=None, feed_client=None):
+        self.settings = settings; self.writers = list(writers); self.status = status
+        self.scheduler = PollScheduler.from_settings(settings, interval_min); self.last_poll = None
+        self.feed_client = feed_client or create_feed_client(settings); self.archive = None
+        if settings.get('archive_enabled', DEFAULT_ARCHIVE_ENABLED):
+            try: self.archive = EventArchive(ARCHIVE_FILE)
+            except Exception as archive_err: logging.error(f"Deprem arşivi açılamadı ({ARCHIVE_FILE}): {archive_err}")
+        self.seen_events = SeenEvents(); self.derived_cache = DerivedCache(); self._initial_load = True; self._stop = threading.Event()
+
+    def emit(self, message):
+        for writer in self.writers:
+            try: writer.write(message)
+            except Exception as e: logging.error(f"Mesaj yazılamadı ({type(writer).__name__}): {e}")
+
+    def poll_once(self):
+        """ Bir sorgu turu; gönderilen bildirim sayısını döndürür. """
+        settings = self.settings; zones = watch_zones_from_settings(settings)
+        poll = poll_feed(self.feed_client, zones, settings.get('distance_method', DEFAULT_DISTANCE_METHOD), self.archive, settings.get('history_hours', DEFAULT_HISTORY_HOURS), cache=self.derived_cache)
+        result = poll.feed; self.last_poll = poll
+        if not result.ok:
+            logging.error(f"Veri alınamadı: {result.error}")
+            if self.status: self.emit({'type': 'poll', 'ok': False, 'status_code': result.status_code, 'error': str(result.error)})
+            return 0
+        alerts = self.seen_events.observe(result.store, result.changes, settings.get('min_magnitude', DEFAULT_MIN_MAGNITUDE), notify=not self._initial_load) if result.changed else []
+        self._initial_load = False
+        if alerts:
+            rows, distances, zone_ids, zone_names = merge_zone_matches(poll.zone_matches or {}); ids = result.store.ids
+            nearest = {ids[row]: (distance, zone_names[zone_id]) for row, distance, zone_id in zip(rows.tolist(), distances.tolist(), zone_ids.tolist())}
+            for record, upgraded in alerts:
+                distance, zone_name = nearest.get(record.id, (None, None)); self.emit(alert_message(record, distance, zone_name, upgraded))
+            METRICS.inc('notifications_sent_total', len(alerts), channel='headless'); METRICS.inc('notified_events_total', len(alerts))
+            logging.info(f"{len(alerts)} deprem bildirildi.")
+        if self.status:
+            changes = result.changes
+            self.emit({'type': 'poll', 'ok': True, 'status_code': result.status_code, 'events': len(result.store), 'alerts': len(alerts),
+                       'added': len(changes.added), 'updated': len(changes.updated), 'removed': len(changes.removed)})
+        return len(alerts)
+
+    def run(self, once=False):
+        logging.info("Arayüzsüz izleme başladı.")
+        while not self._stop.is_set():
+            self.last_poll = None; error = None
+            try: self.poll_once()
+            except Exception as e: logging.error(f"Sorgu turunda beklenmedik hata: {e}", exc_info=True); error = str(e)
+            if once: break
+            self._stop.wait(self.scheduler.after_poll(self.last_poll, error).delay_s)
+        logging.info("Arayüzsüz izleme durdu.")
+
+    def stop(self): self._stop.set()
+
+    def close(self):
+        self.feed_client.close()
+        if self.archive: self.archive.close(); self.archive = None
+        for writer in self.writers: writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="deprem.py --headless", description="Arayüzsüz deprem izleme: bildirimleri JSON satırları olarak yazar.")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help=f"INI ayar dosyası (varsayılan: {SETTINGS_FILE})")
+    parser.add_argument('--socket', type=int, metavar='PORT', help=f"Bildirimleri {DEFAULT_SOCKET_HOST}:PORT üzerindeki istemcilere de gönder")
+    parser.add_argument('--no-stdout', action='store_true', help="stdout'a yazma (yalnızca soket)")
+    parser.add_argument('--status', action='store_true', help="Her sorgudan sonra bir 'poll' durum satırı yaz")
+    parser.add_argument('--interval', type=float, metavar='DK', help="Olağan sorgu aralığı (dakika); ayarlardaki CheckIntervalMin yerine. Aralık depremlerde sıklaşır, sakin dönemde uzar (AdaptivePolling)")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT', help="Ölçümleri PORT üzerinden /metrics ve /metrics.json olarak sun (0 = kapalı); ayarlardaki MetricsPort yerine")
+    parser.add_argument('--once', action='store_true', help="Tek sorgu yap ve çık")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stderr)
+    writers = [] if args.no_stdout else [JsonLineWriter()]
+    if args.socket is not None:
+        try: writers.append(SocketBroadcaster(args.socket))
+        except OSError as e: logging.critical(f"Bildirim soketi açılamadı ({args.socket}): {e}"); return 1
+    if not writers: logging.critical("Çıktı yok: --no-stdout ile birlikte --socket verilmeli."); return 2
+    settings = load_settings(args.settings); metrics_port = settings.get('metrics_port', DEFAULT_METRICS_PORT) if args.metrics_port is None else args.metrics_port; metrics_server = None
+    if metrics_port:
+        try: metrics_server = MetricsServer(metrics_port, settings.get('metrics_host', DEFAULT_METRICS_HOST))
+        except OSError as e: logging.error(f"Ölçüm uç noktası açılamadı ({metrics_port}): {e}")
+    monitor = HeadlessMonitor(settings, writers, status=args.status, interval_min=args.interval)
+    if hasattr(signal, 'SIGTERM'): signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
+    try: monitor.run(once=args.once)
+    except KeyboardInterrupt: logging.info("Kullanıcı tarafından durduruldu.")
+    finally:
+        monitor.close()
+        if metrics_server: metrics_server.close()
+    return 0
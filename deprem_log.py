@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Sabit kapasiteli halka tampon (ring buffer) log işleyicisi. Kayıtlar biçimlendirilmiş halde,
+# artan sıra numarasıyla bir deque(maxlen) içinde tutulur; süreç haftalarca çalışsa da bellek sabit kalır.
+# Arayüz tamponu belirli aralıklarla toplu okur (records_since); süzgeçler widget yerine tampon üzerinde çalışır.
+import collections
+import itertools
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_BUFFER_CAPACITY = 5000
+
+
+def filter_entries(entries, min_level=logging.NOTSET, text=None):
+    """ Seviyesi min_level ve üzeri olan, text içeren (büyük/küçük harf duyarsız) kayıtlar. """
+    text = text.casefold() if text else None
+    return [entry for entry in entries if entry[1] >= min_level and (text is None or text in entry[2].casefold())]
+
+
+class LogRingBuffer(logging.Handler):
+    """ Her kayıt (sıra no, seviye, biçimlendirilmiş mesaj) olarak saklanır; en eskiler kapasite aşılınca düşer. """
+
+    def __init__(self, capacity=LOG_BUFFER_CAPACITY, level=logging.NOTSET):
+        super().__init__(level); self.capacity = capacity; self._entries = collections.deque(maxlen=capacity); self._seq = 0
+
+    def emit(self, record):
+        try: msg = self.format(record)
+        except Exception: self.handleError(record); return
+        with self.lock: self._seq += 1; self._entries.append((self._seq, record.levelno, msg))
+
+    @property
+    def last_seq(self): return self._seq
+
+    def records_since(self, seq):
+        """ Sıra numarası seq'ten büyük kayıtlar; araya düşen (tampondan taşan) kayıtlar atlanır. """
+        with self.lock:
+            if not self._entries or seq >= self._seq: return []
+            start = max(0, seq - self._entries[0][0] + 1)
+            return list(itertools.islice(self._entries, start, None))
+
+    def query(self, min_level=logging.NOTSET, text=None, limit=None):
+        """ filter_entries ile süzülmüş kayıtlar; limit verilirse en yeni limit kayıt. """
+        with self.lock: entries = list(self._entries)
+        matches = filter_entries(entries, min_level, text)
+        return matches[-limit:] if limit else matches
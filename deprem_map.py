@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Artımlı harita güncellemeleri: temel folium haritası bir kez oluşturulur; sonraki güncellemelerde
+# yalnızca eklenen/güncellenen/silinen işaretçiler ve izleme bölgeleri JSON paketleri halinde
+# page().runJavaScript ile gönderilir. Kullanıcının kaydırma/yakınlaştırma durumu korunur.
+# İşaretçiler canvas üzerinde çizilir; sayfa görünür alanı QWebChannel ile sorar ve Python tarafı
+# (deprem_cluster) yalnızca o yakınlaştırmadaki görünür kümeleri döndürür. Açılır pencereler tıklanınca üretilir.
+# Çevrimdışı kipte karolar ve Leaflet/folium dosyaları deprem:// şemasından (deprem_tiles önbelleği) yüklenir.
+import html
+import json
+
+_QWEBCHANNEL_JS = "qrc:///qtwebchannel/qwebchannel.js"
+_MAP_SCRIPT = """
+(function() {
+    var map = %(map_name)s; window.depremMap = map;
+    var renderer = L.canvas({padding: 0.5});
+    var eventLayer = L.featureGroup().addTo(map), zoneLayer = L.featureGroup().addTo(map);
+    var markers = {}, zones = {}, bridge = null, pending = false, again = false;
+    function markerColor(mag) { return mag >= 4.0 ? 'red' : 'orange'; }
+    function markerRadius(count, mag) { return count > 1 ? Math.min(30, 8 + 3 * Math.log2(count)) : 3 + Math.max(mag, 0); }
+    function requestPopup(key, marker) {  // Açılır pencere içeriği yalnızca tıklanınca Python'dan istenir
+        if (!bridge || marker.getPopup()) return;
+        bridge.popup(key, function(html) { if (html && markers[key] === marker) { marker.bindPopup(html, {maxWidth: 300}).openPopup(); } });
+    }
+    function makeMarker(e) {  // e = [anahtar, enlem, boylam, adet, en büyük büyüklük, ipucu]
+        var color = markerColor(e[4]), cluster = e[3] > 1;
+        var marker = L.circleMarker([e[1], e[2]], {renderer: renderer, radius: markerRadius(e[3], e[4]), color: color, weight: cluster ? 2 : 1,
+                                                   fill: true, fillColor: color, fillOpacity: cluster ? 0.4 : 0.6});
+        marker.bindTooltip(e[5]); marker.on('click', function() { requestPopup(e[0], marker); }); return marker;
+    }
+    window.depremApplyDiff = function(batch) {
+        (batch.removed || []).forEach(function(id) { var m = markers[id]; if (m) { eventLayer.removeLayer(m); delete markers[id]; } });
+        (batch.updated || []).concat(batch.added || []).forEach(function(e) {
+            var old = markers[e[0]]; if (old) { eventLayer.removeLayer(old); }
+            markers[e[0]] = makeMarker(e).addTo(eventLayer);
+        });
+        return Object.keys(markers).length;
+    };
+    function requestViewport() {  // Görünür alan değişince yalnızca bu yakınlaştırmadaki görünür kümeler istenir
+        if (!bridge) return;
+        if (pending) { again = true; return; }
+        pending = true; var b = map.getBounds();
+        bridge.viewport(map.getZoom(), b.getWest(), b.getSouth(), b.getEast(), b.getNorth(), function(batch) {
+            pending = false; if (batch) { window.depremApplyDiff(JSON.parse(batch)); }
+            if (again) { again = false; requestViewport(); }
+        });
+    }
+    function targetIcon() {
+        return (L.AwesomeMarkers) ? L.AwesomeMarkers.icon({icon: 'screenshot', markerColor: 'red', prefix: 'glyphicon', iconColor: 'white'}) : new L.Icon.Default();
+    }
+    window.depremSetZones = function(list, view) {  // list = [{name, lat, lon, radius_km}], view = [enlem, boylam, zoom] ya da null
+        var keep = {};
+        list.forEach(function(z) {
+            keep[z.name] = true; var tooltip = z.name + ': ' + Math.round(z.radius_km) + ' km Yarıçap', item = zones[z.name];
+            if (item) {
+                item.marker.setLatLng([z.lat, z.lon]); item.circle.setLatLng([z.lat, z.lon]); item.circle.setRadius(z.radius_km * 1000);
+                item.circle.setTooltipContent(tooltip);
+            } else {
+                item = zones[z.name] = {
+                    marker: L.marker([z.lat, z.lon], {icon: targetIcon()}).bindPopup(z.name).addTo(zoneLayer),
+                    circle: L.circle([z.lat, z.lon], {radius: z.radius_km * 1000, color: 'red', fill: false, weight: 2, dashArray: '5, 5'}).bindTooltip(tooltip).addTo(zoneLayer)
+                };
+            }
+        });
+        Object.keys(zones).forEach(function(name) { if (!keep[name]) { zoneLayer.removeLayer(zones[name].marker); zoneLayer.removeLayer(zones[name].circle); delete zones[name]; } });
+        if (view) { map.setView([view[0], view[1]], view[2]); }
+    };
+    window.depremFocus = function(lat, lon, zoom) { map.closePopup(); map.setView([lat, lon], zoom); };
+    window.depremZoomTo = window.depremFocus;
+    if (window.QWebChannel && window.qt && qt.webChannelTransport) {
+        new QWebChannel(qt.webChannelTransport, function(channel) { bridge = channel.objects.depremBridge; map.on('moveend', requestViewport); requestViewport(); });
+    } else { console.warn('QWebChannel bulunamadı; kümeler yüklenemeyecek.'); }
+})();
+"""
+
+
+def zoom_for_radius(radius_km):
+    if radius_km < 100: return 9
+    elif radius_km < 300: return 8
+    elif radius_km < 700: return 7
+    elif radius_km < 1500: return 6
+    return 5
+
+
+def build_base_map_html(center, zoom, offline=False):
+    """ Olay içermeyen temel haritayı ve artımlı güncelleme fonksiyonlarını içeren HTML belgesini üretir.
+    offline=True ise karolar ve JS/CSS dosyaları deprem:// şemasından istenir (deprem_tiles). """
+    import folium  # Ağır bağımlılık; yalnızca harita ilk kez yüklenirken içe aktarılır
+    if offline:
+        from deprem_tiles import MAP_SCHEME, MAX_TILE_ZOOM, TILE_ATTRIBUTION, asset_url
+        m = folium.Map(location=center, zoom_start=zoom, tiles=None, prefer_canvas=True)
+        folium.TileLayer(tiles=f"{MAP_SCHEME}://tile/{{z}}/{{x}}/{{y}}.png", attr=TILE_ATTRIBUTION, name="OpenStreetMap", max_zoom=MAX_TILE_ZOOM).add_to(m)
+        m.default_js = [(name, asset_url(url)) for name, url in m.default_js]; m.default_css = [(name, asset_url(url)) for name, url in m.default_css]
+    else: m = folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap", prefer_canvas=True)
+    m.get_root().header.add_child(folium.Element(f'<script src="{_QWEBCHANNEL_JS}"></script>'))
+    m.get_root().script.add_child(folium.Element(_MAP_SCRIPT % {'map_name': m.get_name()}))
+    return m.get_root().render()
+
+
+def zones_payload(zones):
+    return [{'name': zone.name, 'lat': zone.lat, 'lon': zone.lon, 'radius_km': zone.radius_km} for zone in zones]
+
+
+def marker_payload(key, lat, lon, count, max_mag, tooltip):
+    """ Haritaya gönderilen kompakt dizi: [anahtar, enlem, boylam, adet, en büyük büyüklük, ipucu]. Tek olaylı kümelerin anahtarı olay id'sidir. """
+    return [key, round(lat, 5), round(lon, 5), count, round(max_mag, 2), tooltip]
+
+
+def event_tooltip(record): return f"{record.mag:.1f} - {record.place[:40]}..."
+
+
+def cluster_tooltip(count, max_mag): return f"{count} deprem (en büyük {max_mag:.1f})"
+
+
+def event_popup_html(record, distance, zone_name, time_str):
+    return (f"<b>Yer:</b> {html.escape(record.place)}<br><b>Büyüklük:</b> {record.mag:.1f}<br><b>Derinlik:</b> {record.depth:.1f} km"
+            f"<br><b>Zaman:</b> {time_str}<br><b>Hedefe Uzaklık:</b> {distance:.1f} km ({html.escape(zone_name)})")
+
+
+def cluster_popup_html(count, max_mag, top_records, lat, lon, expansion_zoom):
+    """ Küme açılır penceresi: özet, en büyük birkaç deprem ve kümeyi açan yakınlaştırma bağlantısı. """
+    rows = "".join(f"<br>{r.mag:.1f} - {html.escape(r.place[:40])}" for r in top_records)
+    return (f"<b>{count} deprem</b> (en büyük {max_mag:.1f}){rows}"
+            f"<br><a href='#' onclick='window.depremZoomTo({lat:.5f}, {lon:.5f}, {expansion_zoom}); return false;'>Yakınlaştır</a>")
+
+
+class MapDiffTracker:
+    """ Sayfada o an gösterilen işaretçileri (anahtar -> yük) izler ve yeni durumla arasındaki farkı üretir. """
+
+    def __init__(self): self.shown = {}
+
+    def reset(self): self.shown = {}
+
+    def diff(self, current):
+        """ current: {id: yük}. {'added': [...], 'updated': [...], 'removed': [...]} döndürür ve iç durumu günceller. """
+        shown = self.shown; added = []; updated = []
+        for eq_id, payload in current.items():
+            old = shown.get(eq_id)
+            if old is None: added.append(payload)
+            elif old != payload: updated.append(payload)
+        removed = [eq_id for eq_id in shown if eq_id not in current]
+        self.shown = dict(current)
+        return {'added': added, 'updated': updated, 'removed': removed}
+
+    @staticmethod
+    def is_empty(batch): return not (batch['added'] or batch['updated'] or batch['removed'])
+
+    @staticmethod
+    def to_js(batch): return f"window.depremApplyDiff && window.depremApplyDiff({json.dumps(batch, ensure_ascii=False)});"
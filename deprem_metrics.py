@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Hafif ölçüm katmanı: sayaçlar, süre histogramları ve monotonik (perf_counter) zamanlayıcılar. Ölçümler süreç
+# genelindeki tek bir MetricsRegistry'de (METRICS) toplanır. İstatistik sekmesi snapshot() ile okur; isteğe bağlı
+# MetricsServer aynı veriyi Prometheus metin biçiminde (/metrics) ve JSON olarak (/metrics.json) yerel HTTP'den sunar.
+import bisect
+import http.server
+import json
+import logging
+import threading
+import time
+
+METRIC_PREFIX = "deprem_"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 0  # 0 = uç nokta kapalı
+DEFAULT_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_HELP = {
+    'stage_seconds': "Veri yolu aşamalarının süresi (saniye)",
+    'polls_total': "Akış sorguları (sonuca göre)",
+    'http_responses_total': "USGS akış yanıtları (HTTP durum koduna göre)",
+    'poll_errors_total': "Başarısız akış sorguları (nedene göre)",
+    'events_processed_total': "Akıştan okunan olaylar",
+    'events_kept_total': "Süzgeçten geçip ayrıştırılan olaylar",
+    'notifications_sent_total': "Gönderilen bildirimler (kanala göre)",
+    'notified_events_total': "Bildirimlerde yer alan depremler",
+    'source_errors_total': "Okunamayan ajans akışları (kaynağa göre)",
+    'events_merged_total': "Başka bir ajansın kaydıyla birleştirilen (yinelenen) kayıtlar",
+    'tile_requests_total': "Harita karosu istekleri (önbellekte: hit, indirilecek: miss, indirilemeyen: error)",
+    'asset_requests_total': "Leaflet/folium dosyası istekleri (paketten/önbellekten: hit, indirilecek: miss)",
+    'tiles_evicted_total': "Boyut sınırı nedeniyle önbellekten silinen karolar",
+    'tiles_prefetched_total': "Önceden indirilen karolar",
+    'derived_cache_total': "Türetilmiş değer önbelleği (uzaklıklar: hit/miss/carried; biçimlendirilmiş metinler: miss)",
+    'replay_ticks_dropped_total': "Kayıttan oynatmada zamanında başlatılamayan (önceki tur uzadığı için atlanan) turlar",
+    'schedule_decisions_total': "Sorgu zamanlayıcısı kararları (türe göre: active, normal, quiet, cache, backoff, fixed)",
+}
+
+
+class Histogram:
+    """ Sabit kovalı süre histogramı; yüzdelikler kova sınırları arasında doğrusal olarak kestirilir. """
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max', 'last')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_S):
+        self.buckets = tuple(buckets); self.counts = [0] * (len(self.buckets) + 1); self.count = 0; self.sum = 0.0; self.max = 0.0; self.last = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1; self.count += 1; self.sum += value; self.last = value
+        if value > self.max: self.max = value
+
+    def quantile(self, q):
+        if not self.count: return 0.0
+        rank = q * self.count; cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets): return self.max  # +Inf kovası
+                lower = self.buckets[i - 1] if i else 0.0
+                return min(lower + (self.buckets[i] - lower) * (rank - cumulative) / count, self.max)
+            cumulative += count
+        return self.max
+
+    def snapshot(self):
+        return {'count': self.count, 'sum': self.sum, 'mean': self.sum / self.count if self.count else 0.0, 'max': self.max, 'last': self.last,
+                'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'buckets': list(zip(self.buckets, self.counts)), 'inf': self.counts[-1]}
+
+
+class _Timer:
+    """ with METRICS.timer(ad, ...) bloğunun süresini histograma yazar; elapsed blok bittikten sonra okunabilir. """
+    __slots__ = ('registry', 'name', 'labels', 'start', 'elapsed')
+
+    def __init__(self, registry, name, labels): self.registry = registry; self.name = name; self.labels = labels; self.elapsed = 0.0
+
+    def __enter__(self): self.start = time.perf_counter(); return self
+
+    def __exit__(self, *exc): self.elapsed = time.perf_counter() - self.start; self.registry.observe(self.name, self.elapsed, **self.labels)
+
+
+def _label_key(labels): return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def format_labels(labels):
+    """ (('stage', 'fetch'),) -> '{stage="fetch"}' (Prometheus kaçış kurallarıyla). """
+    if not labels: return ""
+    escaped = (f'{key}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for key, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """ İş parçacığı güvenli sayaç/histogram deposu. Ölçümler (ad, etiketler) ile anahtarlanır; ilk kullanımda oluşur. """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_S):
+        self.buckets = buckets; self._counters = {}; self._histograms = {}; self._lock = threading.Lock(); self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock: self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None: histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def timer(self, name='stage_seconds', **labels): return _Timer(self, name, labels)
+
+    def reset(self):
+        with self._lock: self._counters.clear(); self._histograms.clear(); self.started = time.time()
+
+    def counter_value(self, name, **labels):
+        with self._lock: return self._counters.get((name, _label_key(labels)), 0)
+
+    def snapshot(self):
+        """ JSON'a yazılabilir anlık görüntü; ölçümler ada ve etiketlere göre sıralıdır. """
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in sorted(self._counters.items())]
+            histograms = [dict(histogram.snapshot(), name=name, labels=dict(labels)) for (name, labels), histogram in sorted(self._histograms.items())]
+            started = self.started
+        return {'uptime_s': time.time() - started, 'counters': counters, 'histograms': histograms}
+
+    def prometheus_text(self):
+        """ Prometheus metin biçimi (0.0.4). """
+        snapshot = self.snapshot(); lines = [f"# HELP {METRIC_PREFIX}uptime_seconds Süreç başlangıcından (ya da sıfırlamadan) bu yana geçen süre",
+                                             f"# TYPE {METRIC_PREFIX}uptime_seconds gauge", f"{METRIC_PREFIX}uptime_seconds {snapshot['uptime_s']:.3f}"]
+        described = set()
+        for metric in snapshot['counters']:
+            name = METRIC_PREFIX + metric['name']
+            if name not in described: described.add(name); lines += [f"# HELP {name} {METRIC_HELP.get(metric['name'], metric['name'])}", f"# TYPE {name} counter"]
+            lines.append(f"{name}{format_labels(tuple(metric['labels'].items()))} {metric['value']}")
+        for metric in snapshot['histograms']:
+            name = METRIC_PREFIX + metric['name']; labels = tuple(metric['labels'].items()); cumulative = 0
+            if name not in described: described.add(name); lines += [f"# HELP {name} {METRIC_HELP.get(metric['name'], metric['name'])}", f"# TYPE {name} histogram"]
+            for bound, count in metric['buckets']: cumulative += count; lines.append(f"{name}_bucket{format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+            lines += [f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {metric['count']}", f"{name}_sum{format_labels(labels)} {metric['sum']:.6f}", f"{name}_count{format_labels(labels)} {metric['count']}"]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+class MetricsServer:
+    """ host:port üzerinde /metrics (Prometheus metni) ve /metrics.json uç noktalarını sunar. port=0 ise işletim sistemi seçer. """
+
+    def __init__(self, port, host=DEFAULT_METRICS_HOST, registry=METRICS):
+        self.registry = registry
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler_class()); self._server.daemon_threads = True
+        self.address = self._server.server_address[:2]
+        threading.Thread(target=self._server.serve_forever, name="deprem-metrics", daemon=True).start()
+        logging.info(f"Ölçüm uç noktası: http://{self.address[0]}:{self.address[1]}/metrics")
+
+    def close(self): self._server.shutdown(); self._server.server_close()
+
+    def _handler_class(self):
+        registry = self.registry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0].rstrip('/')
+                if path == '/metrics': body = registry.prometheus_text().encode('utf-8'); content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == '/metrics.json': body = json.dumps(registry.snapshot(), ensure_ascii=False).encode('utf-8'); content_type = "application/json"
+                else: self.send_error(404); return
+                self.send_response(200); self.send_header('Content-Type', content_type); self.send_header('Content-Length', str(len(body))); self.end_headers(); self.wfile.write(body)
+
+            def log_message(self, *args): pass
+        return Handler
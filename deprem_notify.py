@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Kuyruklu bildirim dağıtıcısı. Bildirimler arayüz iş parçacığından kuyruğa atılır; tek bir arka plan işçisi
+# kısa bir pencere (coalesce_s) içindeki depremleri tek bir özet bildirimde birleştirir ve jeton kovası
+# (rate_limit / rate_period_s) ile sıklığı sınırlar. Sınır aşılınca depremler düşürülmez, sonraki özete eklenir.
+# Ses tek, uzun ömürlü bir ses işçisinde çalınır; ikon ve ses yolları bir kez çözülür (ses verisi yalnızca Windows'ta bellekte tutulur).
+import logging
+import os
+import queue
+import threading
+import time
+
+from deprem_metrics import METRICS
+from deprem_settings import DEFAULT_NOTIFY_COALESCE_S, DEFAULT_NOTIFY_RATE_LIMIT, DEFAULT_NOTIFY_RATE_PERIOD_S, format_datetime
+
+try:
+    import winsound  # Windows: WAV verisi bellekten (SND_MEMORY) çalınır
+except ImportError:
+    winsound = None
+
+try:
+    from playsound import playsound
+    PLAYSOUND_AVAILABLE = True
+except ImportError:
+    PLAYSOUND_AVAILABLE = False
+    if winsound is None: print("Uyarı: 'playsound' kütüphanesi bulunamadı. Bildirim sesleri çalınamayacak. Yüklemek için: pip install playsound==1.2.2")
+
+NOTIFICATION_TIMEOUT_S = 15
+_STOP = object()
+
+
+def _distance_text(record):
+    dist = record.distance
+    return f" (Hedefe ~{dist:.0f} km)" if dist != float('inf') and dist >= 0 else ""
+
+
+def summarize(alerts):
+    """ [(kayıt, yükseltme_mi), ...] listesinden (başlık, mesaj); birden fazla deprem tek bir özet olur. """
+    if len(alerts) == 1:
+        record, upgraded = alerts[0]
+        title = f"Deprem Bildirimi: {record.mag:.1f}" + (" (büyüklük güncellendi)" if upgraded else "")
+        return title, f"{record.place}{_distance_text(record)}\n{format_datetime(record.time_dt)}"
+    records = [record for record, _ in alerts]; strongest = max(records, key=lambda r: r.mag); nearest = min(records, key=lambda r: r.distance)
+    title = f"Deprem Bildirimi: {len(records)} yeni deprem (en büyük M{strongest.mag:.1f})"
+    message = f"En büyük: M{strongest.mag:.1f} {strongest.place}{_distance_text(strongest)}\n{format_datetime(strongest.time_dt)}"
+    if nearest is not strongest and nearest.distance != float('inf'): message += f"\nEn yakın: M{nearest.mag:.1f} {nearest.place}{_distance_text(nearest)}"
+    return title, message
+
+
+class TokenBucket:
+    """ capacity jeton; her period_s saniyede capacity jeton yenilenir. """
+
+    def __init__(self, capacity, period_s):
+        self.capacity = max(int(capacity), 1); self.rate = self.capacity / max(float(period_s), 1e-3)
+        self._tokens = float(self.capacity); self._stamp = time.monotonic()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate); self._stamp = now
+
+    def try_acquire(self, now=None):
+        self._refill(time.monotonic() if now is None else now)
+        if self._tokens >= 1.0: self._tokens -= 1.0; return True
+        return False
+
+    def wait_time(self, now=None):
+        """ Bir sonraki jetona kadar kalan saniye (jeton varsa 0). """
+        self._refill(time.monotonic() if now is None else now)
+        return 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self.rate
+
+
+class AudioWorker:
+    """ Tek bir arka plan iş parçacığında ses çalar. Sırada en fazla bir ses bekler; fazlası atlanır (üst üste binmez).
+    Windows'ta WAV dosyası bir kez okunup bellekte tutulur (winsound, SND_MEMORY). Linux/macOS'ta ve WAV dışı dosyalarda
+    playsound yalnızca dosya yolu kabul ettiğinden dosya her bildirimde yeniden açılıp çözülür. """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=1); self._thread = None; self._cache_path = None; self._cache_data = None
+
+    def play(self, path):
+        if self._thread is None: self._thread = threading.Thread(target=self._run, name="deprem-ses", daemon=True); self._thread.start()
+        try: self._queue.put_nowait(path)
+        except queue.Full: logging.info("Bildirim sesi zaten sırada; yenisi atlandı.")
+
+    def close(self):
+        if self._thread is None: return
+        try: self._queue.put_nowait(_STOP)
+        except queue.Full: pass  # İş parçacığı daemon; süreçle birlikte biter
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            if path is _STOP: return
+            try: self._play(path); logging.info(f"Bildirim sesi çalındı: {path}")
+            except Exception as e: logging.error(f"Bildirim sesi çalınamadı ({path}): {e}", exc_info=False)
+
+    def _play(self, path):
+        if winsound is not None and path.lower().endswith('.wav'):
+            if self._cache_path != path:
+                with open(path, 'rb') as sound_file: self._cache_data = sound_file.read()
+                self._cache_path = path
+            winsound.PlaySound(self._cache_data, winsound.SND_MEMORY)
+        elif PLAYSOUND_AVAILABLE: playsound(path)
+        else: logging.warning(f"Ses dosyası '{path}' çalınamıyor: playsound yok.")
+
+
+class NotificationDispatcher:
+    """ submit() iş parçacığı güvenlidir ve beklemez. Aynı deprem pencere içinde birden çok kez gelirse bir kez sayılır. """
+
+    def __init__(self, app_name, icon_path=None, sound_path=None, coalesce_s=DEFAULT_NOTIFY_COALESCE_S,
+                 rate_limit=DEFAULT_NOTIFY_RATE_LIMIT, rate_period_s=DEFAULT_NOTIFY_RATE_PERIOD_S):
+        self.app_name = app_name; self.icon_path = icon_path if icon_path and os.path.exists(icon_path) else None
+        self._queue = queue.Queue(); self._lock = threading.Lock(); self._thread = None
+        self._audio = AudioWorker(); self._notifier = None; self._notifier_failed = False
+        self.configure(sound_path, coalesce_s, rate_limit, rate_period_s)
+
+    @classmethod
+    def from_settings(cls, app_name, icon_path, settings):
+        dispatcher = cls(app_name, icon_path); dispatcher.apply_settings(settings); return dispatcher
+
+    def apply_settings(self, settings):
+        self.configure(settings.get('notification_sound'), settings.get('notify_coalesce_s', DEFAULT_NOTIFY_COALESCE_S),
+                       settings.get('notify_rate_limit', DEFAULT_NOTIFY_RATE_LIMIT), settings.get('notify_rate_period_s', DEFAULT_NOTIFY_RATE_PERIOD_S))
+
+    def configure(self, sound_path=None, coalesce_s=DEFAULT_NOTIFY_COALESCE_S, rate_limit=DEFAULT_NOTIFY_RATE_LIMIT, rate_period_s=DEFAULT_NOTIFY_RATE_PERIOD_S):
+        """ Ses yolu burada bir kez doğrulanır; rate_limit <= 0 sınırı kaldırır. """
+        if sound_path and not os.path.exists(sound_path): logging.warning(f"Ses dosyası '{sound_path}' bulunamadı; bildirimler sessiz olacak."); sound_path = None
+        with self._lock:
+            self.sound_path = sound_path or None; self.coalesce_s = max(float(coalesce_s), 0.0)
+            self._bucket = TokenBucket(rate_limit, rate_period_s) if rate_limit and rate_limit > 0 else None
+
+    def submit(self, record, upgraded=False):
+        if self._thread is None: self._thread = threading.Thread(target=self._run, name="deprem-bildirim", daemon=True); self._thread.start()
+        self._queue.put((record, upgraded))
+
+    def close(self, timeout=2.0):
+        if self._thread is not None: self._queue.put(_STOP); self._thread.join(timeout); self._thread = None
+        self._audio.close()
+
+    def _run(self):
+        pending = {}; deadline = 0.0
+        while True:
+            with self._lock: bucket = self._bucket; coalesce_s = self.coalesce_s
+            timeout = None
+            if pending: now = time.monotonic(); timeout = max(deadline - now, bucket.wait_time(now) if bucket else 0.0, 0.0)
+            try: item = self._queue.get(timeout=timeout)
+            except queue.Empty: item = None
+            if item is _STOP:
+                if pending: logging.info(f"Kapanırken {len(pending)} bildirim gönderilmedi.")
+                return
+            if item is not None:
+                record, upgraded = item
+                if not pending: deadline = time.monotonic() + coalesce_s
+                previous = pending.pop(record.id, None); pending[record.id] = (record, upgraded or (previous is not None and previous[1]))
+            if pending and time.monotonic() >= deadline and (bucket is None or bucket.try_acquire()):
+                alerts = list(pending.values()); pending.clear()
+                try: self._deliver(alerts)
+                except Exception as e: logging.error(f"Bildirim işlemi sırasında hata: {e}", exc_info=False)
+
+    def _deliver(self, alerts):
+        title, message = summarize(alerts); logging.info(f"Bildirim gönderiliyor ({len(alerts)} deprem): {title} - {message}")
+        METRICS.inc('notifications_sent_total', channel='desktop'); METRICS.inc('notified_events_total', len(alerts))
+        notifier = self._get_notifier()
+        if notifier is not None:
+            try: notifier.notify(title=title, message=message, app_name=self.app_name, app_icon=self.icon_path, timeout=NOTIFICATION_TIMEOUT_S)
+            except Exception as notify_err: logging.error(f"Plyer bildirimi gönderilemedi: {notify_err}")
+        with self._lock: sound_path = self.sound_path
+        if sound_path: self._audio.play(sound_path)
+
+    def _get_notifier(self):
+        if self._notifier is None and not self._notifier_failed:
+            try: from plyer import notification; self._notifier = notification
+            except Exception as import_err: self._notifier_failed = True; logging.error(f"Plyer yüklenemedi, masaüstü bildirimleri gösterilmeyecek: {import_err}")
+        return self._notifier
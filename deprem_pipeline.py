@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Qt'den bağımsız sorgu hattı: akışı sorgular, değişiklikleri arşive yazar, gerekiyorsa geçmişi arşivden
+# alır ve izleme bölgesi eşleşmelerini hesaplar. Masaüstü arayüzünün arka plan işçisi ve arayüzsüz
+# (headless) izleme kipi aynı hattı kullanır. Aşama süreleri ve sorgu sonuçları deprem_metrics'e yazılır.
+# Uzaklıklar isteğe bağlı DerivedCache (deprem_cache) üzerinden alınır; değişmeyen olaylar için yeniden hesaplanmaz.
+import logging
+import time
+
+from deprem_distance import DEFAULT_DISTANCE_METHOD
+from deprem_feed import USGSFeedClient, DEFAULT_FEED_WINDOW
+from deprem_metrics import METRICS
+from deprem_settings import DEFAULT_HISTORY_HOURS, DEFAULT_DELTA_FEED
+from deprem_sources import (MultiSourceFeedClient, SOURCE_CLASSES, DEFAULT_FEED_SOURCES, DEFAULT_DEDUPE_TIME_S, DEFAULT_DEDUPE_DISTANCE_KM, DEFAULT_DEDUPE_MAGNITUDE,
+                            parse_source_names)
+from deprem_stream import FeaturePrefilter
+from deprem_zones import GridSpatialIndex, match_zones
+
+
+def process_earthquake_data(store, zones, method=DEFAULT_DISTANCE_METHOD, cache=None):
+    """ Arka planda çalışır: ana bölgeye uzaklıkları depo sütununa yazar, uzamsal indeksi bir kez
+    kurar ve her izleme bölgesi için {bölge adı: (satırlar, uzaklıklar)} eşleşmelerini döndürür.
+    cache (DerivedCache) verilirse uzaklıklar önbellekten alınır, yalnızca eksik olanlar hesaplanır. """
+    distance_fn = (lambda target, rows: cache.distances(store, target, method, rows)) if cache is not None else None
+    if zones:
+        with METRICS.timer(stage='distance'):
+            if cache is None: store.compute_distances(zones[0].location, method)
+            else: store.distance[:] = cache.distances(store, zones[0].location, method)
+    with METRICS.timer(stage='filter'): return match_zones(zones, store.lat, store.lon, store.mag, method, index=GridSpatialIndex(store.lat, store.lon), distance_fn=distance_fn)
+
+
+def feed_source_config(settings):
+    """ Akış istemcisinin yeniden kurulmasını gerektiren ayarlar (kaynaklar, adresler, toleranslar). """
+    return (tuple(parse_source_names(settings.get('feed_sources', DEFAULT_FEED_SOURCES))),) + tuple(settings.get(f'{name}_url') for name in SOURCE_CLASSES) + \
+        (settings.get('dedupe_time_s', DEFAULT_DEDUPE_TIME_S), settings.get('dedupe_distance_km', DEFAULT_DEDUPE_DISTANCE_KM), settings.get('dedupe_magnitude', DEFAULT_DEDUPE_MAGNITUDE))
+
+
+def create_feed_client(settings):
+    """ Yalnızca USGS seçiliyse USGSFeedClient, aksi halde ajansları eşzamanlı çekip birleştiren MultiSourceFeedClient. """
+    names = parse_source_names(settings.get('feed_sources', DEFAULT_FEED_SOURCES)); window = settings.get('feed_window', DEFAULT_FEED_WINDOW)
+    usgs = USGSFeedClient(delta_mode=settings.get('delta_feed', DEFAULT_DELTA_FEED)) if 'usgs' in names else None
+    if names == ['usgs']: usgs.set_window(window); return usgs
+    sources = [SOURCE_CLASSES[name](settings.get(f'{name}_url')) for name in names if name != 'usgs']
+    client = MultiSourceFeedClient(usgs, sources, names, settings.get('dedupe_time_s', DEFAULT_DEDUPE_TIME_S), settings.get('dedupe_distance_km', DEFAULT_DEDUPE_DISTANCE_KM),
+                                   settings.get('dedupe_magnitude', DEFAULT_DEDUPE_MAGNITUDE))
+    client.delta_mode = settings.get('delta_feed', DEFAULT_DELTA_FEED); client.set_window(window)
+    logging.info(f"Veri kaynakları (öncelik sırasıyla): {', '.join(names)}")
+    return client
+
+
+class PollResult:
+    """ feed: FeedResult; zone_matches: eşleştirme yapılmadıysa None; full_refresh: True ise tüketiciler
+    değişiklik kümesi yerine tüm eşleşmeleri karşılaştırmalıdır (zorunlu güncelleme ya da arşivden geçmiş). """
+    __slots__ = ('feed', 'zone_matches', 'full_refresh')
+
+    def __init__(self, feed, zone_matches=None, full_refresh=False): self.feed = feed; self.zone_matches = zone_matches; self.full_refresh = full_refresh
+
+
+def poll_feed(feed_client, zones, method=DEFAULT_DISTANCE_METHOD, archive=None, history_hours=DEFAULT_HISTORY_HOURS, force_update=False, cancelled=None, cache=None):
+    """ Akışı bir kez sorgular. cancelled() True dönerse arşive yazıldıktan sonra eşleştirme atlanır. Genel eşiğin altında
+    kalıp hiçbir izleme bölgesine düşmeyen olaylar akış ayrıştırılırken atılır (FeaturePrefilter). Bölgeler daraldığında
+    (eşik yükseldi, yarıçap küçüldü) eski süzgeç korunur: depo yerelde süzülür, akış yeniden indirilmez. """
+    prefilter = FeaturePrefilter.for_zones(zones); current = feed_client.prefilter
+    if current is None or not current.covers(prefilter): feed_client.set_prefilter(prefilter)
+    with METRICS.timer(stage='poll'): result = feed_client.fetch()
+    poll = PollResult(result, full_refresh=force_update); METRICS.inc('polls_total', result='ok' if result.ok else 'error')
+    if not result.ok: return poll
+    if archive and result.changed:
+        changes = result.changes; store = result.store
+        try:
+            with METRICS.timer(stage='archive_write'): archive.upsert_store(store, [store.row_of(eq_id) for eq_id in changes.added + changes.updated]); archive.delete(changes.deleted)
+        except Exception as archive_err: logging.error(f"Arşive yazılamadı: {archive_err}")
+    if cache is not None and result.changed: cache.invalidate(result.changes)
+    if cancelled is not None and cancelled(): return poll
+    # Akış değişmediyse (304 / aynı olaylar) uzaklıklar zaten hesaplı; zorunlu güncellemede hedef değişmiş olabilir
+    if result.changed or force_update:
+        if archive and history_hours * 3600 * 1000 > feed_client.window_ms:
+            with METRICS.timer(stage='archive_query'): result.store = archive.query(start_ms=time.time() * 1000 - history_hours * 3600 * 1000)
+            poll.full_refresh = True
+            logging.info(f"Arşivden son {history_hours} saatin {len(result.store)} olayı alındı.")
+        poll.zone_matches = process_earthquake_data(result.store, zones, method, cache)
+    return poll
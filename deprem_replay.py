@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Kayıttan oynatma (replay) ve benzetim: kaydedilmiş bir akış (GeoJSON; USGS özet akışı ya da FDSN sorgu çıktısı) ya da
+# deprem arşivi, hızlandırılmış bir saatle (1x - 1000x) yeniden yayınlanır. ReplayFeedClient canlı akış istemcileriyle
+# aynı arayüzü sunduğundan olaylar aynı hattan geçer: değişiklik tespiti, bölge eşleştirme, yakındaki depremler listesi,
+# harita ve bildirimler. Her tur için gecikme ve zamanında başlatılamayan (düşen) turlar ölçülür; Kahramanmaraş 2023 gibi
+# binlerce olaylık dizilerde eşiklerin ve arayüzün davranışı böyle denenir. Oynatma arşive yazmaz.
+# Kullanım: python deprem.py --replay KAYIT [--speed 60] [--tick 1] [--start 2023-02-06T01:00] [--gui]
+import argparse
+import datetime
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from deprem_archive import EventArchive
+from deprem_changes import ChangeSet, diff_stores
+from deprem_feed import FEED_WINDOWS, DEFAULT_FEED_WINDOW, FeedResult
+from deprem_log import LOG_FORMAT
+from deprem_metrics import METRICS
+from deprem_settings import SETTINGS_FILE, load_settings
+from deprem_store import EventStore, ms_to_datetime
+from deprem_stream import FeatureStream, STREAM_CHUNK_SIZE
+
+MIN_REPLAY_SPEED = 1.0
+MAX_REPLAY_SPEED = 1000.0
+DEFAULT_REPLAY_SPEED = 60.0
+DEFAULT_TICK_S = 1.0  # Turlar arası gerçek süre; her tur benzetimde speed * tick_s saniye ilerler
+ARCHIVE_SUFFIXES = ('.sqlite3', '.sqlite', '.db')
+
+
+def parse_utc(text):
+    """ '2023-02-06T01:17' biçimindeki (saat dilimi yoksa UTC) zamanı milisaniyeye çevirir. """
+    parsed = datetime.datetime.fromisoformat(text)
+    return int((parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)).timestamp() * 1000)
+
+
+def load_recording(path, start_ms=None, end_ms=None):
+    """ Kaydı EventStore olarak yükler: .sqlite3/.sqlite/.db deprem arşivi, diğerleri GeoJSON FeatureCollection (akış halinde
+    ayrıştırılır). start_ms verilirse başlangıçtan bir akış penceresi (en uzun: 30 gün) öncesine kadarki olaylar tutulur. """
+    lower_ms = None if start_ms is None else start_ms - max(FEED_WINDOWS.values())
+    if os.path.splitext(path)[1].lower() in ARCHIVE_SUFFIXES:
+        archive = EventArchive(path)
+        try: return archive.query(start_ms=lower_ms, end_ms=end_ms)
+        finally: archive.close()
+    with open(path, 'rb') as recording: store = EventStore.from_values(FeatureStream(iter(lambda: recording.read(STREAM_CHUNK_SIZE), b'')))
+    times = store.time; outside = np.zeros(len(store), dtype=bool)
+    if lower_ms is not None: outside |= times < lower_ms
+    if end_ms is not None: outside |= times > end_ms
+    if outside.any(): ids = store.ids; store.remove([ids[row] for row in np.flatnonzero(outside).tolist()])
+    return store
+
+
+class ReplayClock:
+    """ Benzetim saati: başlatıldığı (restart) andan itibaren start_ms'ten gerçek zamanın speed katı hızla ilerler. """
+
+    def __init__(self, start_ms, speed=DEFAULT_REPLAY_SPEED, clock=time.monotonic):
+        if not MIN_REPLAY_SPEED <= speed <= MAX_REPLAY_SPEED: raise ValueError(f"Oynatma hızı {MIN_REPLAY_SPEED:g}x - {MAX_REPLAY_SPEED:g}x aralığında olmalı: {speed:g}")
+        self.start_ms = int(start_ms); self.speed = float(speed); self._clock = clock; self._origin = clock()
+
+    def restart(self): self._origin = self._clock()
+
+    def now_ms(self): return self.start_ms + int((self._clock() - self._origin) * 1000.0 * self.speed)
+
+
+class ReplayFeedClient:
+    """ USGSFeedClient ile aynı arayüz (fetch, set_window, set_prefilter, window_ms, delta_mode, prefilter, reset, close).
+    fetch() benzetim saatine kadar yayımlanmış olayları akış penceresi içinde döndürür; değişiklik kümesi yeni görünen ve
+    pencereden düşen olaylardır. Süzgeç ya da pencere değişince pencere baştan kurulur ve canlı akıştaki gibi karşılaştırılır. """
+
+    def __init__(self, recording, clock, window=DEFAULT_FEED_WINDOW):
+        order = recording.sort_rows(np.arange(len(recording)), 'time'); values = list(recording.iter_values())
+        self._values = [values[row] for row in order.tolist()]; self._times = recording.time[order]
+        self.clock = clock; self.window_ms = FEED_WINDOWS[window]; self.delta_mode = True; self.prefilter = None; self.fresh_for_s = None
+        self._store = EventStore(); self._cursor = None; self._lock = threading.Lock()
+
+    def __len__(self): return len(self._values)
+
+    @property
+    def published(self): return self._cursor or 0
+
+    @property
+    def finished(self): return self._cursor is not None and self._cursor >= len(self._values)
+
+    def close(self): pass
+
+    def reset(self):
+        with self._lock: self._store = EventStore(); self._cursor = None
+
+    def set_window(self, window):
+        with self._lock:
+            if FEED_WINDOWS[window] != self.window_ms: self.window_ms = FEED_WINDOWS[window]; self._cursor = None
+
+    def set_prefilter(self, prefilter):
+        with self._lock:
+            if prefilter != self.prefilter: self.prefilter = prefilter; self._cursor = None
+
+    def _rows(self, start, end):
+        prefilter = self.prefilter; rows = self._values[start:end]
+        return rows if prefilter is None else [values for values in rows if prefilter.accepts(values[1], values[2], values[4])]
+
+    def fetch(self):
+        with self._lock:
+            now_ms = self.clock.now_ms(); window_start_ms = now_ms - self.window_ms
+            end = int(np.searchsorted(self._times, now_ms, 'right')); start = int(np.searchsorted(self._times, window_start_ms, 'left'))
+            if self._cursor is None:
+                # İlk tur ya da süzgeç/pencere değişimi: pencere baştan kurulur (canlı istemcideki temel akış gibi)
+                previous = self._store; self._store = EventStore.from_values(self._rows(start, end))
+                changes = diff_stores(previous, self._store, window_start_ms)
+            else:
+                added, updated = self._store.upsert_values(self._rows(max(self._cursor, start), end))
+                changes = ChangeSet(added, updated, (), self._store.remove_older_than(window_start_ms))
+            self._cursor = end
+            return FeedResult(self._store.copy(), changes=changes, status_code=200)
+
+
+class ReplayStats:
+    """ Tur istatistikleri: gecikme (turun başlangıcından değişikliklerin liste, harita ve bildirimlere yansımasına kadar),
+    tur başına olay sayıları ve düşen turlar (önceki tur uzadığı için zamanında başlatılamayanlar). """
+
+    def __init__(self): self.latencies = []; self.events = 0; self.max_tick_events = 0; self.alerts = 0; self.dropped = 0
+
+    def record(self, latency_s, changes, alerts=0):
+        count = len(changes.added) + len(changes.updated); self.latencies.append(latency_s); self.events += count
+        self.max_tick_events = max(self.max_tick_events, count); self.alerts += alerts
+        METRICS.observe('stage_seconds', latency_s, stage='replay_tick')
+
+    def drop(self, count):
+        if count > 0: self.dropped += count; METRICS.inc('replay_ticks_dropped_total', count)
+
+    def summary(self):
+        ticks = len(self.latencies); latencies = np.array(self.latencies) * 1000.0 if ticks else np.zeros(1)
+        return {'ticks': ticks, 'dropped': self.dropped, 'dropped_ratio': self.dropped / (ticks + self.dropped) if ticks + self.dropped else 0.0,
+                'events': self.events, 'max_tick_events': self.max_tick_events, 'alerts': self.alerts,
+                'latency_ms': {'mean': float(latencies.mean()), 'p50': float(np.percentile(latencies, 50)), 'p95': float(np.percentile(latencies, 95)),
+                               'p99': float(np.percentile(latencies, 99)), 'max': float(latencies.max())}}
+
+    def format(self):
+        s = self.summary(); latency = s['latency_ms']
+        return (f"{s['ticks']} tur, {s['dropped']} düşen tur (%{s['dropped_ratio'] * 100:.1f}), {s['events']} olay (turda en çok {s['max_tick_events']}), "
+                f"{s['alerts']} bildirim; tur gecikmesi ort. {latency['mean']:.1f} ms, p50 {latency['p50']:.1f}, p95 {latency['p95']:.1f}, p99 {latency['p99']:.1f}, en çok {latency['max']:.1f} ms")
+
+
+class ReplaySession:
+    """ Oynatma oturumu: benzetim saati, akış istemcisi, tur zamanlaması ve istatistikler. Turlar gerçek zamanda tick_s
+    aralıklı dilimlerde başlar; bir tur bir ya da daha fazla dilimi aşarsa aradaki turlar düşmüş sayılır (kare düşmesi gibi). """
+
+    def __init__(self, recording, speed=DEFAULT_REPLAY_SPEED, tick_s=DEFAULT_TICK_S, start_ms=None, window=DEFAULT_FEED_WINDOW, clock=time.monotonic):
+        if not len(recording): raise ValueError("Kayıtta oynatılacak olay yok.")
+        if tick_s <= 0: raise ValueError(f"Tur aralığı pozitif olmalı: {tick_s:g}")
+        # Varsayılan başlangıç ilk olaydan bir tur öncesidir: ilk tur (bildirim yapılmayan ilk yükleme) boş kalır, ana şok bildirilir
+        start_ms = int(recording.time.min() - speed * tick_s * 1000.0) if start_ms is None else int(start_ms)
+        self.tick_s = float(tick_s); self._clock = clock; self.clock = ReplayClock(start_ms, speed, clock)
+        self.client = ReplayFeedClient(recording, self.clock, window); self.stats = ReplayStats()
+        self._origin = clock(); self._slot = None; self._tick_started = None
+        logging.info(f"Kayıttan oynatma: {len(recording)} olay, {format_sim_time(start_ms)} UTC'den itibaren {speed:g}x hızla, {tick_s:g} sn'de bir tur.")
+
+    @property
+    def speed(self): return self.clock.speed
+
+    @property
+    def finished(self): return self.client.finished
+
+    def begin_tick(self):
+        now = self._clock()
+        if self._slot is None: self.clock.restart(); self._origin = now  # Saat ilk turla başlar (arayüzün açılış süresi sayılmaz)
+        slot = int(round((now - self._origin) / self.tick_s))
+        if self._slot is not None: self.stats.drop(slot - self._slot - 1); slot = max(slot, self._slot + 1)
+        self._slot = slot; self._tick_started = now
+
+    def end_tick(self, changes, alerts=0):
+        if self._tick_started is None: return 0.0
+        latency = self._clock() - self._tick_started; self._tick_started = None; self.stats.record(latency, changes, alerts)
+        return latency
+
+    def next_delay_s(self):
+        """ Bir sonraki tur diliminin başlamasına kalan gerçek süre (gecikmiş turlarda 0). """
+        slot = 0 if self._slot is None else self._slot + 1
+        return max(self._origin + slot * self.tick_s - self._clock(), 0.0)
+
+    def status_text(self):
+        latency = self.stats.latencies[-1] * 1000.0 if self.stats.latencies else 0.0
+        return (f"Oynatma {self.speed:g}x — {format_sim_time(self.clock.now_ms())} UTC — {self.client.published}/{len(self.client)} olay — "
+                f"son tur {latency:.0f} ms, düşen tur {self.stats.dropped}")
+
+
+def format_sim_time(time_ms):
+    dt = ms_to_datetime(time_ms); return dt.strftime('%Y-%m-%d %H:%M:%S') if dt else "N/A"
+
+
+def run_headless(session, settings, writers, status=False, stop=None):
+    """ Oturumu arayüzsüz oynatır: her tur HeadlessMonitor.poll_once ile canlı izlemeyle aynı işlenir (bildirimler writers'a
+    'alert' mesajı olarak yazılır). Özet sözlüğünü döndürür. """
+    from deprem_headless import HeadlessMonitor
+    monitor = HeadlessMonitor(dict(settings, archive_enabled=False), writers, status=status, feed_client=session.client); stop = stop or threading.Event()
+    try:
+        while not stop.is_set():
+            session.begin_tick(); alerts = monitor.poll_once(); poll = monitor.last_poll
+            session.end_tick(poll.feed.changes if poll is not None else ChangeSet(), alerts)
+            if session.finished: break
+            stop.wait(session.next_delay_s())
+    finally: monitor.close()
+    return session.stats.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="deprem.py --replay", description="Kaydedilmiş deprem dizisini hızlandırılmış saatle canlı akış gibi oynatır.")
+    parser.add_argument('recording', help="GeoJSON kaydı (USGS özet akışı / FDSN sorgusu) ya da deprem arşivi (.sqlite3)")
+    parser.add_argument('--speed', type=float, default=DEFAULT_REPLAY_SPEED, help=f"Benzetim hızı ({MIN_REPLAY_SPEED:g}-{MAX_REPLAY_SPEED:g}x, varsayılan {DEFAULT_REPLAY_SPEED:g})")
+    parser.add_argument('--tick', type=float, default=DEFAULT_TICK_S, metavar='SN', help=f"Turlar arası gerçek süre (varsayılan {DEFAULT_TICK_S:g} sn)")
+    parser.add_argument('--start', type=parse_utc, metavar='ZAMAN', help="Oynatmanın başlayacağı an (UTC, ör. 2023-02-06T01:00); varsayılan ilk olaydan bir tur önce")
+    parser.add_argument('--end', type=parse_utc, metavar='ZAMAN', help="Bu andan sonraki olaylar oynatılmaz (UTC)")
+    parser.add_argument('--window', choices=sorted(FEED_WINDOWS), default=DEFAULT_FEED_WINDOW, help="Akış penceresi (canlı temel akış gibi)")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help=f"INI ayar dosyası (izleme bölgeleri, eşikler; varsayılan: {SETTINGS_FILE})")
+    parser.add_argument('--gui', action='store_true', help="Masaüstü arayüzünde oynat (liste, harita ve masaüstü bildirimleri)")
+    parser.add_argument('--status', action='store_true', help="Arayüzsüz kipte her turdan sonra bir 'poll' durum satırı yaz")
+    args = parser.parse_args(argv)
+    if not args.gui: logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stderr)
+    try:
+        if not MIN_REPLAY_SPEED <= args.speed <= MAX_REPLAY_SPEED: raise ValueError(f"Oynatma hızı {MIN_REPLAY_SPEED:g}x - {MAX_REPLAY_SPEED:g}x aralığında olmalı: {args.speed:g}")
+        started = time.perf_counter(); recording = load_recording(args.recording, args.start, args.end)
+        logging.info(f"Kayıt yüklendi: {args.recording} ({len(recording)} olay, {time.perf_counter() - started:.2f} sn)")
+        if args.gui:
+            from deprem_gui import main as gui_main
+            return gui_main([], replay=ReplaySession(recording, args.speed, args.tick, args.start, args.window), settings_path=args.settings)
+        session = ReplaySession(recording, args.speed, args.tick, args.start, args.window)
+    except (OSError, ValueError) as e: logging.critical(f"Oynatma başlatılamadı: {e}"); return 2
+    from deprem_headless import JsonLineWriter
+    writer = JsonLineWriter()
+    try: summary = run_headless(session, load_settings(args.settings), [writer], status=args.status)
+    except KeyboardInterrupt: logging.info("Kullanıcı tarafından durduruldu."); summary = session.stats.summary()
+    logging.info(f"Oynatma bitti: {session.stats.format()}"); writer.write(dict(summary, type='replay', speed=session.speed, tick_s=session.tick_s))
+    return 0
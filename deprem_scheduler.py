@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Uyarlanır sorgu zamanlayıcısı (Qt'den bağımsız): her sorgu turundan sonra bir sonraki sorgunun ne zaman yapılacağına
+# karar verir. İzleme bölgelerinde deprem olunca aralık sıklaşır ve Omori yasasına (artçı sıklığı ~ 1 / (t + c)) uygun
+# olarak zamanla açılır; değişiklik olmayan sorgular aralığı seyreltir. Yanıtın önbellek başlıkları (Cache-Control /
+# Expires) dolmadan sorgu yapılmaz; hatalarda titreşimli (jitter) üstel geri çekilme uygulanır. Her karar gerekçesiyle loglanır.
+import logging
+import random
+import time
+
+from deprem_metrics import METRICS
+from deprem_settings import DEFAULT_CHECK_INTERVAL_MIN, DEFAULT_ADAPTIVE_POLLING, DEFAULT_MIN_INTERVAL_S, DEFAULT_MAX_INTERVAL_MIN
+
+DEFAULT_ACTIVITY_DECAY_S = 600.0  # Omori c: depremden bu kadar sonra aralık en kısa aralığın iki katına çıkar
+DEFAULT_RELAX_FACTOR = 1.5  # Değişiklik olmayan her sorguda aralık bu oranla uzar
+DEFAULT_BACKOFF_BASE_S = 30.0
+
+
+def format_delay(seconds):
+    """ 95 -> '1 dk 35 sn'. """
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes} dk {seconds} sn" if minutes and seconds else (f"{minutes} dk" if minutes else f"{seconds} sn")
+
+
+class PollDecision:
+    """ delay_s: bir sonraki sorguya kadar beklenecek süre; kind: karar türü (metrik etiketi); reason: loglanan gerekçe. """
+    __slots__ = ('delay_s', 'kind', 'reason')
+
+    def __init__(self, delay_s, kind, reason): self.delay_s = delay_s; self.kind = kind; self.reason = reason
+
+    @property
+    def delay_ms(self): return int(self.delay_s * 1000)
+
+    def __repr__(self): return f"PollDecision({self.delay_s:.1f}, {self.kind!r}, {self.reason!r})"
+
+
+class PollScheduler:
+    """ after_poll(poll) son sorgu turunun PollResult'ından (ya da başarısız turda None) bir PollDecision üretir.
+    interval_s kullanıcının kontrol aralığıdır: sakin dönemde aralık bundan başlayıp max_interval_s'e kadar uzar,
+    bölgede deprem olduğunda min_interval_s'e iner. adaptive=False ise aralık sabittir (önbellek ve geri çekilme yine uygulanır). """
+
+    def __init__(self, interval_s, min_interval_s=DEFAULT_MIN_INTERVAL_S, max_interval_s=DEFAULT_MAX_INTERVAL_MIN * 60, adaptive=DEFAULT_ADAPTIVE_POLLING,
+                 activity_decay_s=DEFAULT_ACTIVITY_DECAY_S, relax_factor=DEFAULT_RELAX_FACTOR, backoff_base_s=DEFAULT_BACKOFF_BASE_S, rng=None, clock=time.time):
+        self.activity_decay_s = activity_decay_s; self.relax_factor = relax_factor; self.backoff_base_s = backoff_base_s
+        self._rng = rng or random.Random(); self._clock = clock
+        self.configure(interval_s, min_interval_s, max_interval_s, adaptive)
+        self.failures = 0; self.quiet_polls = 0; self.last_activity = None  # (olay zamanı ms, büyüklük, bölge adı)
+
+    @classmethod
+    def from_settings(cls, settings, interval_min=None, **kwargs):
+        scheduler = cls(60.0, **kwargs); scheduler.apply_settings(settings, interval_min); return scheduler
+
+    def configure(self, interval_s, min_interval_s, max_interval_s, adaptive):
+        self.min_interval_s = max(float(min_interval_s), 1.0); self.interval_s = max(float(interval_s), self.min_interval_s)
+        self.max_interval_s = max(float(max_interval_s), self.interval_s); self.adaptive = bool(adaptive)
+
+    def apply_settings(self, settings, interval_min=None):
+        interval_min = interval_min or max(settings.get('check_interval_min', DEFAULT_CHECK_INTERVAL_MIN), 1)
+        self.configure(interval_min * 60, settings.get('min_interval_s', DEFAULT_MIN_INTERVAL_S), settings.get('max_interval_min', DEFAULT_MAX_INTERVAL_MIN) * 60,
+                       settings.get('adaptive_polling', DEFAULT_ADAPTIVE_POLLING))
+        logging.info(f"Sorgu zamanlayıcısı: aralık {format_delay(self.interval_s)}" + (f" (uyarlanır: {format_delay(self.min_interval_s)} - {format_delay(self.max_interval_s)})" if self.adaptive else " (sabit)"))
+
+    def reset(self): self.failures = 0; self.quiet_polls = 0; self.last_activity = None
+
+    def _observe_activity(self, poll):
+        """ Bölgelerle eşleşen en yeni depremi last_activity'ye yazar. Eşleşmeler her seferinde tüm depo için hesaplanır;
+        eşleştirme yapılmayan (değişiklik olmayan) turlarda önceki değer korunur. """
+        if poll.zone_matches is None: return
+        store = poll.feed.store; latest = None
+        for zone_name, (rows, _) in poll.zone_matches.items():
+            if not len(rows): continue
+            times = store.time[rows]; row = rows[int(times.argmax())]
+            if latest is None or store.time[row] > latest[0]: latest = (int(store.time[row]), float(store.mag[row]), zone_name)
+        self.last_activity = latest
+
+    def _backoff(self, error):
+        self.failures += 1; self.quiet_polls = 0
+        ceiling = min(self.backoff_base_s * 2 ** (self.failures - 1), self.max_interval_s)
+        delay = ceiling / 2 + self._rng.uniform(0.0, ceiling / 2)  # Eşit titreşim: istemciler aynı anda yeniden denemesin
+        return PollDecision(delay, 'backoff', f"{self.failures}. ardışık hata ({error}); üstel geri çekilme (üst sınır {format_delay(ceiling)})")
+
+    def _adaptive_delay(self, changed):
+        self.quiet_polls = 0 if changed else self.quiet_polls + 1
+        if self.last_activity is not None:
+            event_ms, mag, zone_name = self.last_activity; elapsed_s = max(self._clock() - event_ms / 1000, 0.0)
+            delay = self.min_interval_s * (1.0 + elapsed_s / self.activity_decay_s)
+            if delay < self.interval_s:
+                return PollDecision(delay, 'active', f"{zone_name} bölgesinde M{mag:.1f} deprem {format_delay(elapsed_s)} önce; aralık sıklaştırıldı")
+        if self.quiet_polls:
+            delay = min(self.interval_s * self.relax_factor ** self.quiet_polls, self.max_interval_s)
+            return PollDecision(delay, 'quiet', f"{self.quiet_polls} sorgudur değişiklik yok; aralık seyreltildi")
+        return PollDecision(self.interval_s, 'normal', "yeni veri geldi; olağan aralık")
+
+    def after_settings_change(self):
+        """ Ayarlar değişince bekleyen sorgunun yeni aralıkla yeniden kurulması için karar: bölgede yakın zamanda deprem
+        olduysa sıklaştırılmış aralık, aksi halde (seyreltme sayacı sıfırlanarak) yeni olağan aralık. """
+        self.quiet_polls = 0; decision = PollDecision(self.interval_s, 'settings', "ayarlar değişti; yeni aralık")
+        if self.adaptive and self.last_activity is not None:
+            active = self._adaptive_delay(True)
+            if active.kind == 'active': decision = active
+        METRICS.inc('schedule_decisions_total', kind=decision.kind)
+        logging.info(f"Sonraki sorgu {format_delay(decision.delay_s)} sonra: {decision.reason}.")
+        return decision
+
+    def after_poll(self, poll, error=None):
+        """ Son turun sonucuna göre bir sonraki sorgunun zamanını belirler; kararı loglar ve metriklere yazar. """
+        if poll is None or not poll.feed.ok: decision = self._backoff(error or (poll.feed.error if poll is not None else "bilinmeyen hata"))
+        else:
+            self.failures = 0; self._observe_activity(poll); result = poll.feed
+            decision = self._adaptive_delay(result.changed) if self.adaptive else PollDecision(self.interval_s, 'fixed', "sabit aralık")
+            fresh_for_s = result.fresh_for_s
+            if fresh_for_s is not None and decision.delay_s < fresh_for_s:
+                # Yanıt hâlâ tazeyken sorgulamak aynı içeriği (ya da 304) döndürür
+                decision = PollDecision(min(fresh_for_s, self.max_interval_s), 'cache', f"{decision.reason}; yanıt {format_delay(fresh_for_s)} daha taze (Cache-Control/Expires)")
+        METRICS.inc('schedule_decisions_total', kind=decision.kind)
+        logging.info(f"Sonraki sorgu {format_delay(decision.delay_s)} sonra: {decision.reason}.")
+        return decision
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Ayarlar ve uygulama sabitleri (Qt'den bağımsız): INI dosyasının okunması/yazılması masaüstü arayüzü
+# ile arayüzsüz (headless) izleme kipinde ortaktır.
+import configparser
+import logging
+import os
+import sys
+
+from deprem_distance import DISTANCE_METHODS, DEFAULT_DISTANCE_METHOD
+from deprem_feed import FEED_WINDOWS, DEFAULT_FEED_WINDOW
+from deprem_metrics import DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT
+from deprem_sources import (DEFAULT_FEED_SOURCES, DEFAULT_DEDUPE_TIME_S, DEFAULT_DEDUPE_DISTANCE_KM, DEFAULT_DEDUPE_MAGNITUDE, EMSC_URL, AFAD_URL, KANDILLI_URL,
+                            parse_source_names)
+from deprem_tiles import DEFAULT_OFFLINE_MAP, DEFAULT_TILE_URL, DEFAULT_TILE_CACHE_MB, DEFAULT_TILE_PREFETCH
+from deprem_zones import WatchZone, parse_watch_zones, format_watch_zones
+
+# --- Constants & Defaults ---
+APP_NAME = "Deprem Takip Uygulaması"; SETTINGS_FILE = "deprem_takip_ayarlar.ini"
+DEFAULT_MIN_MAGNITUDE = 3.0; DEFAULT_CHECK_INTERVAL_MIN = 5
+DEFAULT_TARGET_LAT = 41.0082; DEFAULT_TARGET_LON = 28.9784
+DEFAULT_RADIUS_KM = 150; DEFAULT_NOTIFICATIONS_ENABLED = True
+DEFAULT_NOTIFICATION_SOUND = "default_notification.wav"; DEFAULT_THEME = "dark-blue"
+DEFAULT_DELTA_FEED = True; DEFAULT_WATCH_ZONES = ""
+DEFAULT_ARCHIVE_ENABLED = True; DEFAULT_HISTORY_HOURS = 24; MAX_HISTORY_HOURS = 24 * 365
+DEFAULT_ADAPTIVE_POLLING = True; DEFAULT_MIN_INTERVAL_S = 60.0; DEFAULT_MAX_INTERVAL_MIN = 30.0  # Uyarlanır sorgu aralığının alt/üst sınırları
+DEFAULT_NOTIFY_COALESCE_S = 5.0; DEFAULT_NOTIFY_RATE_LIMIT = 3; DEFAULT_NOTIFY_RATE_PERIOD_S = 60.0  # Bildirim birleştirme penceresi ve sıklık sınırı
+PRIMARY_ZONE_NAME = "Hedef Konum"
+MAX_RADIUS_KM = 20001
+APP_ICON_FILE = 'notification_icon.ico'
+
+
+# --- Yardımcı Fonksiyon: Paketlendiğinde dosya yolunu bulmak için ---
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+        # logging.info(f"Kaynak yolu _MEIPASS kullanılarak çözümleniyor: {base_path}") # Çok fazla log üretebilir
+    except Exception:
+        # _MEIPASS ayarlı değilse, normal geliştirme modundayız demektir
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        # logging.info(f"Kaynak yolu geliştirme modu kullanılarak çözümleniyor: {base_path}")
+
+    joined_path = os.path.join(base_path, relative_path)
+    # logging.info(f"Kaynak için tam yol '{relative_path}': {joined_path}") # Çok fazla log üretebilir
+    return joined_path
+
+
+def format_datetime(dt):
+    if dt: return dt.strftime('%Y-%m-%d %H:%M:%S')
+    return "N/A"
+
+
+def default_settings():
+    return {'min_magnitude': DEFAULT_MIN_MAGNITUDE, 'check_interval_min': DEFAULT_CHECK_INTERVAL_MIN, 'target_lat': DEFAULT_TARGET_LAT, 'target_lon': DEFAULT_TARGET_LON,
+            'radius_km': DEFAULT_RADIUS_KM, 'notifications_enabled': DEFAULT_NOTIFICATIONS_ENABLED, 'notification_sound': DEFAULT_NOTIFICATION_SOUND, 'theme': DEFAULT_THEME,
+            'delta_feed': DEFAULT_DELTA_FEED, 'distance_method': DEFAULT_DISTANCE_METHOD, 'watch_zones': DEFAULT_WATCH_ZONES, 'archive_enabled': DEFAULT_ARCHIVE_ENABLED,
+            'history_hours': DEFAULT_HISTORY_HOURS, 'notify_coalesce_s': DEFAULT_NOTIFY_COALESCE_S, 'notify_rate_limit': DEFAULT_NOTIFY_RATE_LIMIT,
+            'notify_rate_period_s': DEFAULT_NOTIFY_RATE_PERIOD_S, 'feed_window': DEFAULT_FEED_WINDOW, 'metrics_port': DEFAULT_METRICS_PORT, 'metrics_host': DEFAULT_METRICS_HOST,
+            'feed_sources': DEFAULT_FEED_SOURCES, 'emsc_url': EMSC_URL, 'afad_url': AFAD_URL, 'kandilli_url': KANDILLI_URL, 'dedupe_time_s': DEFAULT_DEDUPE_TIME_S,
+            'dedupe_distance_km': DEFAULT_DEDUPE_DISTANCE_KM, 'dedupe_magnitude': DEFAULT_DEDUPE_MAGNITUDE, 'adaptive_polling': DEFAULT_ADAPTIVE_POLLING,
+            'min_interval_s': DEFAULT_MIN_INTERVAL_S, 'max_interval_min': DEFAULT_MAX_INTERVAL_MIN, 'offline_map': DEFAULT_OFFLINE_MAP, 'tile_url': DEFAULT_TILE_URL,
+            'tile_cache_mb': DEFAULT_TILE_CACHE_MB, 'tile_prefetch': DEFAULT_TILE_PREFETCH}
+
+
+def _default_sound_path():
+    try:
+        default_sound_full_path = resource_path(DEFAULT_NOTIFICATION_SOUND)
+        return default_sound_full_path if os.path.exists(default_sound_full_path) else ""
+    except Exception as res_err: logging.error(f"Varsayılan ses yolu alınamadı: {res_err}"); return ""
+
+
+def load_settings(path=SETTINGS_FILE):
+    """ INI dosyasındaki [Settings] bölümünü okur; dosya yoksa ya da hatalıysa varsayılanları döndürür. """
+    config = configparser.ConfigParser(interpolation=None); settings = default_settings()
+    if not config.read(path, encoding='utf-8'):
+        logging.warning(f"{path} bulunamadı. Varsayılan ayarlar kullanılacak."); settings['notification_sound'] = _default_sound_path(); return settings
+    logging.info(f"Ayarlar {path} dosyasından yüklendi.")
+    if 'Settings' not in config: logging.warning(f"{path} dosyasında [Settings] bölümü bulunamadı."); return settings
+    cfg_sec = config['Settings']
+    try:
+        settings.update({'min_magnitude': cfg_sec.getfloat('MinMagnitude', DEFAULT_MIN_MAGNITUDE), 'check_interval_min': cfg_sec.getint('CheckIntervalMin', DEFAULT_CHECK_INTERVAL_MIN),
+                         'target_lat': cfg_sec.getfloat('TargetLat', DEFAULT_TARGET_LAT), 'target_lon': cfg_sec.getfloat('TargetLon', DEFAULT_TARGET_LON),
+                         'radius_km': cfg_sec.getint('RadiusKm', DEFAULT_RADIUS_KM), 'notifications_enabled': cfg_sec.getboolean('NotificationsEnabled', DEFAULT_NOTIFICATIONS_ENABLED),
+                         'notification_sound': cfg_sec.get('NotificationSound', ""), 'theme': cfg_sec.get('Theme', DEFAULT_THEME), 'delta_feed': cfg_sec.getboolean('DeltaFeed', DEFAULT_DELTA_FEED),
+                         'distance_method': cfg_sec.get('DistanceMethod', DEFAULT_DISTANCE_METHOD), 'watch_zones': format_watch_zones(parse_watch_zones(cfg_sec.get('WatchZones', DEFAULT_WATCH_ZONES), reserved=(PRIMARY_ZONE_NAME,))),
+                         'archive_enabled': cfg_sec.getboolean('ArchiveEnabled', DEFAULT_ARCHIVE_ENABLED),
+                         'history_hours': min(max(cfg_sec.getint('HistoryHours', DEFAULT_HISTORY_HOURS), 1), MAX_HISTORY_HOURS),
+                         'notify_coalesce_s': max(cfg_sec.getfloat('NotifyCoalesceSec', DEFAULT_NOTIFY_COALESCE_S), 0.0), 'notify_rate_limit': cfg_sec.getint('NotifyRateLimit', DEFAULT_NOTIFY_RATE_LIMIT),
+                         'notify_rate_period_s': max(cfg_sec.getfloat('NotifyRatePeriodSec', DEFAULT_NOTIFY_RATE_PERIOD_S), 1.0), 'feed_window': cfg_sec.get('FeedWindow', DEFAULT_FEED_WINDOW),
+                         'metrics_port': min(max(cfg_sec.getint('MetricsPort', DEFAULT_METRICS_PORT), 0), 65535), 'metrics_host': cfg_sec.get('MetricsHost', DEFAULT_METRICS_HOST),
+                         'feed_sources': ", ".join(parse_source_names(cfg_sec.get('FeedSources', DEFAULT_FEED_SOURCES))), 'emsc_url': cfg_sec.get('EmscUrl', EMSC_URL),
+                         'afad_url': cfg_sec.get('AfadUrl', AFAD_URL), 'kandilli_url': cfg_sec.get('KandilliUrl', KANDILLI_URL),
+                         'dedupe_time_s': max(cfg_sec.getfloat('DedupeTimeSec', DEFAULT_DEDUPE_TIME_S), 1.0), 'dedupe_distance_km': max(cfg_sec.getfloat('DedupeDistanceKm', DEFAULT_DEDUPE_DISTANCE_KM), 1.0),
+                         'dedupe_magnitude': max(cfg_sec.getfloat('DedupeMagnitude', DEFAULT_DEDUPE_MAGNITUDE), 0.0),
+                         'adaptive_polling': cfg_sec.getboolean('AdaptivePolling', DEFAULT_ADAPTIVE_POLLING), 'min_interval_s': max(cfg_sec.getfloat('MinIntervalSec', DEFAULT_MIN_INTERVAL_S), 10.0),
+                         'max_interval_min': max(cfg_sec.getfloat('MaxIntervalMin', DEFAULT_MAX_INTERVAL_MIN), 1.0),
+                         'offline_map': cfg_sec.getboolean('OfflineMap', DEFAULT_OFFLINE_MAP), 'tile_url': cfg_sec.get('TileUrl', DEFAULT_TILE_URL),
+                         'tile_cache_mb': max(cfg_sec.getint('TileCacheMB', DEFAULT_TILE_CACHE_MB), 10), 'tile_prefetch': cfg_sec.getboolean('TilePrefetch', DEFAULT_TILE_PREFETCH)})
+        if settings['distance_method'] not in DISTANCE_METHODS: logging.warning(f"Bilinmeyen uzaklık yöntemi: {settings['distance_method']}. Varsayılan kullanılacak."); settings['distance_method'] = DEFAULT_DISTANCE_METHOD
+        if settings['feed_window'] not in FEED_WINDOWS: logging.warning(f"Bilinmeyen akış penceresi: {settings['feed_window']}. Varsayılan kullanılacak."); settings['feed_window'] = DEFAULT_FEED_WINDOW
+        sound_path = settings['notification_sound']
+        if sound_path and not os.path.dirname(sound_path) and os.path.basename(sound_path) == DEFAULT_NOTIFICATION_SOUND: settings['notification_sound'] = _default_sound_path()
+        elif sound_path and not os.path.exists(sound_path): logging.warning(f"Ayarlardan okunan ses dosyası bulunamadı: {sound_path}"); settings['notification_sound'] = ""
+    except (ValueError, configparser.Error) as e: logging.error(f"Ayarlar okunurken hata: {e}. Varsayılanlar kullanılacak.", exc_info=False); settings = default_settings()
+    return settings
+
+
+def save_settings(settings, path=SETTINGS_FILE):
+    """ Ayarları INI dosyasına yazar; yazma hatasında IOError yükseltir. """
+    config = configparser.ConfigParser(interpolation=None)
+    config['Settings'] = {'MinMagnitude': str(settings['min_magnitude']), 'CheckIntervalMin': str(settings['check_interval_min']), 'TargetLat': str(settings['target_lat']),
+                          'TargetLon': str(settings['target_lon']), 'RadiusKm': str(settings['radius_km']), 'NotificationsEnabled': str(settings['notifications_enabled']),
+                          'NotificationSound': str(settings['notification_sound']), 'Theme': str(settings['theme']), 'DeltaFeed': str(settings['delta_feed']),
+                          'DistanceMethod': str(settings['distance_method']), 'WatchZones': str(settings['watch_zones']), 'ArchiveEnabled': str(settings['archive_enabled']),
+                          'HistoryHours': str(settings['history_hours']), 'NotifyCoalesceSec': str(settings['notify_coalesce_s']), 'NotifyRateLimit': str(settings['notify_rate_limit']),
+                          'NotifyRatePeriodSec': str(settings['notify_rate_period_s']), 'FeedWindow': str(settings['feed_window']),
+                          'MetricsPort': str(settings['metrics_port']), 'MetricsHost': str(settings['metrics_host']),
+                          'FeedSources': str(settings['feed_sources']), 'EmscUrl': str(settings['emsc_url']), 'AfadUrl': str(settings['afad_url']), 'KandilliUrl': str(settings['kandilli_url']),
+                          'DedupeTimeSec': str(settings['dedupe_time_s']), 'DedupeDistanceKm': str(settings['dedupe_distance_km']), 'DedupeMagnitude': str(settings['dedupe_magnitude']),
+                          'AdaptivePolling': str(settings['adaptive_polling']), 'MinIntervalSec': str(settings['min_interval_s']), 'MaxIntervalMin': str(settings['max_interval_min']),
+                          'OfflineMap': str(settings['offline_map']), 'TileUrl': str(settings['tile_url']), 'TileCacheMB': str(settings['tile_cache_mb']), 'TilePrefetch': str(settings['tile_prefetch'])}
+    with open(path, 'w', encoding='utf-8') as configfile: config.write(configfile)
+    logging.info(f"Ayarlar {path} dosyasına kaydedildi.")
+
+
+def watch_zones_from_settings(settings):
+    """ Ana hedef bölgesi (Hedef Konum) ve ek izleme bölgeleri; ana bölge her zaman ilk sıradadır. """
+    primary = WatchZone(PRIMARY_ZONE_NAME, settings.get('target_lat'), settings.get('target_lon'), settings.get('radius_km'), settings.get('min_magnitude'))
+    return [primary] + parse_watch_zones(settings.get('watch_zones', DEFAULT_WATCH_ZONES), reserved=(PRIMARY_ZONE_NAME,))
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# Çok kaynaklı akış: USGS'nin yanında EMSC, AFAD ve Kandilli (KOERI) akışları kendi bağdaştırıcılarıyla eşzamanlı
+# (ThreadPoolExecutor) çekilir. Aynı depremin farklı ajanslardaki kayıtları zaman kovası + uzamsal hücre karmasıyla
+# (EventMatcher) O(n) ortalama maliyetle eşleştirilip tek olaya indirgenir; ikili (O(n²)) karşılaştırma yapılmaz.
+# Birleşen olayın değerleri öncelik sırasındaki ilk kaynaktan alınır, id'si ise olay ilk görüldüğündeki id olarak
+# korunur (sonradan başka bir ajans eklense de bildirim tekrarlanmaz). Adresler ayarlanabilir; yerel sunucularla denenebilir.
+import calendar
+import concurrent.futures
+import logging
+import math
+import re
+import threading
+import time
+
+import requests
+
+from deprem_changes import diff_stores
+from deprem_distance import haversine_km
+from deprem_feed import FeedResult, cache_lifetime_s, create_session, FEED_WINDOW_MS, FEED_WINDOWS, REQUEST_TIMEOUT_S
+from deprem_metrics import METRICS
+from deprem_store import EventStore
+from deprem_zones import KM_PER_DEGREE
+
+SOURCE_NAMES = ('usgs', 'emsc', 'afad', 'kandilli')
+DEFAULT_FEED_SOURCES = "usgs"
+EMSC_URL = "https://www.seismicportal.eu/fdsnws/event/1/query"
+AFAD_URL = "https://deprem.afad.gov.tr/apiv2/event/filter"
+KANDILLI_URL = "http://www.koeri.boun.edu.tr/scripts/lst0.asp"
+DEFAULT_DEDUPE_TIME_S = 30.0; DEFAULT_DEDUPE_DISTANCE_KM = 50.0; DEFAULT_DEDUPE_MAGNITUDE = 1.0  # Aynı deprem sayılma toleransları
+SOURCE_EVENT_LIMIT = 5000
+KANDILLI_UTC_OFFSET_H = 3  # KOERI listesi Türkiye saatiyle (UTC+3) yayımlanır
+_HOUR_MS = 3600 * 1000
+_ISO_TIME = re.compile(r'(\d{4})[-.](\d{2})[-.](\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?')
+_KANDILLI_LINE = re.compile(r'^(\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2})\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(\d+(?:\.\d+)?)\s+(\S+)\s+(\S+)\s+(\S+)\s+(.+?)\s*$')
+_KANDILLI_REVISION = re.compile(r'REVIZE(\d+)')
+
+
+def parse_time_ms(text, utc_offset_h=0):
+    """ '2023-02-06T01:17:35.3Z', '2023-02-06 01:17:35' ya da '2023.02.06 04:17:35' -> UTC milisaniye; tanınmazsa 0. """
+    match = _ISO_TIME.match(text.strip()) if text else None
+    if not match: return 0
+    year, month, day, hour, minute, second, fraction = match.groups()
+    seconds = calendar.timegm((int(year), int(month), int(day), int(hour), int(minute), int(second))) - utc_offset_h * 3600
+    return seconds * 1000 + (int((fraction + "00")[:3]) if fraction else 0)
+
+
+def _float(value, default=math.nan):
+    try: return float(value) if value is not None else default
+    except (TypeError, ValueError): return default
+
+
+def parse_source_names(text):
+    """ 'usgs, afad kandilli' -> ['usgs', 'afad', 'kandilli'] (sıra öncelik sırasıdır); bilinmeyen adlar atlanır, boşsa ['usgs']. """
+    names = []
+    for name in re.split(r'[\s,;]+', (text or "").lower()):
+        if not name or name in names: continue
+        if name in SOURCE_NAMES: names.append(name)
+        else: logging.warning(f"Bilinmeyen veri kaynağı atlandı: {name}")
+    return names or ['usgs']
+
+
+class FeedSource:
+    """ Tek bir ajans akışının bağdaştırıcısı. fetch() (satırlar, değişti_mi) döndürür; satırlar feature_values() biçimindedir,
+    id'ler ajans önekiyle (ör. 'afad:12345') tekilleştirilir. 304 yanıtında önceki satırlar döner. Hatalar yükseltilir. """
+    name = None; DEFAULT_URL = None
+
+    def __init__(self, url=None, timeout=REQUEST_TIMEOUT_S, session=None):
+        self.url = url or self.DEFAULT_URL; self.timeout = timeout; self.session = session or create_session()
+        self._validators = (None, None); self._rows = []; self.fresh_for_s = None
+
+    def __repr__(self): return f"{type(self).__name__}({self.url})"
+
+    def params(self, window_ms, now_ms): return None
+
+    def parse(self, response):
+        """ Yanıttan satır değerleri üretir (None olanlar atlanır). """
+        raise NotImplementedError
+
+    def fetch(self, window_ms, now_ms=None):
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms; headers = {}; etag, last_modified = self._validators
+        if etag: headers['If-None-Match'] = etag
+        if last_modified: headers['If-Modified-Since'] = last_modified
+        with self.session.get(self.url, params=self.params(window_ms, now_ms), headers=headers, timeout=self.timeout) as response:
+            METRICS.inc('http_responses_total', code=response.status_code, source=self.name); self.fresh_for_s = cache_lifetime_s(response.headers)
+            if response.status_code == 304: return self._rows, False
+            response.raise_for_status(); start_ms = now_ms - window_ms
+            rows = [values for values in self.parse(response) if values is not None and values[5] >= start_ms]
+            self._validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        changed = rows != self._rows; self._rows = rows
+        return rows, changed
+
+    def close(self): self.session.close()
+
+
+class EMSCSource(FeedSource):
+    """ EMSC FDSN olay servisi (format=json: GeoJSON, özelliklerde ISO zaman, lat/lon/depth ve flynn_region). """
+    name = 'emsc'; DEFAULT_URL = EMSC_URL
+
+    def params(self, window_ms, now_ms):
+        # Başlangıç saate yuvarlanır: aynı saat içindeki sorgular aynı adrese gider (önbellek / koşullu istek)
+        start = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime((now_ms - window_ms) // _HOUR_MS * _HOUR_MS / 1000))
+        return {'format': 'json', 'start': start, 'limit': SOURCE_EVENT_LIMIT, 'orderby': 'time'}
+
+    def parse(self, response):
+        for feature in response.json().get('features') or ():
+            props = feature.get('properties') or {}; eq_id = props.get('unid') or feature.get('id')
+            if not eq_id: continue
+            coordinates = (feature.get('geometry') or {}).get('coordinates') or ()
+            lat = _float(props.get('lat', coordinates[1] if len(coordinates) > 1 else None)); lon = _float(props.get('lon', coordinates[0] if coordinates else None))
+            time_ms = parse_time_ms(props.get('time')); updated_ms = parse_time_ms(props.get('lastupdate')) or time_ms
+            yield (f"emsc:{eq_id}", lat, lon, _float(props.get('depth')), _float(props.get('mag'), 0.0), time_ms, updated_ms,
+                   (props.get('flynn_region') or "Bilinmeyen yer").title() + " (EMSC)")
+
+
+class AFADSource(FeedSource):
+    """ AFAD olay servisi (apiv2/event/filter: JSON dizi, sayılar dizge olarak, zamanlar UTC). """
+    name = 'afad'; DEFAULT_URL = AFAD_URL
+
+    def params(self, window_ms, now_ms):
+        fmt = lambda ms: time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ms / 1000))
+        end_ms = (now_ms // _HOUR_MS + 1) * _HOUR_MS
+        return {'start': fmt((now_ms - window_ms) // _HOUR_MS * _HOUR_MS), 'end': fmt(end_ms), 'orderby': 'timedesc', 'limit': SOURCE_EVENT_LIMIT, 'format': 'json'}
+
+    def parse(self, response):
+        for event in response.json() or ():
+            eq_id = event.get('eventID')
+            if not eq_id: continue
+            time_ms = parse_time_ms(event.get('date')); updated_ms = parse_time_ms(event.get('lastUpdateDate')) or time_ms
+            place = event.get('location') or ", ".join(part for part in (event.get('district'), event.get('province')) if part) or "Bilinmeyen yer"
+            yield (f"afad:{eq_id}", _float(event.get('latitude')), _float(event.get('longitude')), _float(event.get('depth')),
+                   _float(event.get('magnitude'), 0.0), time_ms, updated_ms, f"{place} (AFAD)")
+
+
+class KandilliSource(FeedSource):
+    """ KOERI son depremler listesi (lst0.asp: <pre> içinde sabit sütunlu metin, Windows-1254, Türkiye saati).
+    Büyüklük olarak Mw, yoksa ML, yoksa MD alınır; 'REVIZEnn' nitelikleri 'updated' değerini artırır. """
+    name = 'kandilli'; DEFAULT_URL = KANDILLI_URL
+
+    def parse(self, response):
+        text = response.content.decode(response.encoding if response.encoding and response.encoding.lower() not in ('iso-8859-1', 'latin-1') else 'cp1254', errors='replace')
+        for line in text.splitlines():
+            match = _KANDILLI_LINE.match(line.strip())
+            if not match: continue
+            stamp, lat, lon, depth, md, ml, mw, rest = match.groups()
+            mag = next((_float(value) for value in (mw, ml, md) if _float(value) == _float(value)), 0.0)  # '-.-' -> NaN
+            parts = re.split(r'\s{2,}', rest); place = parts[0].strip() or "Bilinmeyen yer"
+            revision = _KANDILLI_REVISION.search(rest); time_ms = parse_time_ms(stamp, KANDILLI_UTC_OFFSET_H)
+            yield (f"kandilli:{stamp.replace('.', '').replace(':', '').replace(' ', '')}", float(lat), float(lon), float(depth), mag,
+                   time_ms, time_ms + (int(revision.group(1)) if revision else 0), f"{place.title()} (Kandilli)")
+
+
+SOURCE_CLASSES = {'emsc': EMSCSource, 'afad': AFADSource, 'kandilli': KandilliSource}
+
+
+class EventMatcher:
+    """ Zaman kovası + uzamsal hücre karmasıyla ajanslar arası eşleştirme. Kovalar time_tol_s, hücreler distance_km
+    genişliğindedir; bir kayıt için yalnızca komşu kova/hücrelerdeki kümeler incelenir. Eşleşme için küme başıyla
+    zaman, uzaklık ve büyüklük farkı toleranslar içinde olmalı ve kümede aynı kaynaktan başka kayıt bulunmamalıdır. """
+
+    def __init__(self, time_tol_s=DEFAULT_DEDUPE_TIME_S, distance_km=DEFAULT_DEDUPE_DISTANCE_KM, mag_tol=DEFAULT_DEDUPE_MAGNITUDE):
+        self.time_tol_ms = max(int(time_tol_s * 1000), 1); self.distance_km = float(distance_km); self.mag_tol = float(mag_tol)
+        self.cell_deg = max(self.distance_km * 1.01 / KM_PER_DEGREE, 0.01); self.n_cols = int(math.ceil(360.0 / self.cell_deg))
+        self.clusters = []  # [[(kaynak, satır değerleri), ...], ...]; ilk öğe küme başıdır
+        self._cells = {}  # (zaman kovası, enlem hücresi, boylam hücresi) -> küme indeksleri
+
+    def __len__(self): return len(self.clusters)
+
+    def _cell(self, lat, lon): return int((lat + 90.0) // self.cell_deg), int(((lon + 180.0) % 360.0) // self.cell_deg) % self.n_cols
+
+    def _candidates(self, bucket, lat, lon):
+        row, col = self._cell(lat, lon)
+        # Enlem yönünde bir hücre yeterli; boylam yönünde hücre genişliği enlemle daraldığı için daha fazla sütun gerekir
+        cos_lat = math.cos(math.radians(min(abs(lat) + self.cell_deg, 90.0)))
+        span = self.n_cols if cos_lat <= 0 else min(int(math.ceil(1.0 / cos_lat)), self.n_cols)
+        cols = range(self.n_cols) if 2 * span + 1 >= self.n_cols else [(col + offset) % self.n_cols for offset in range(-span, span + 1)]
+        cells = self._cells
+        for b in (bucket - 1, bucket, bucket + 1):
+            for r in (row - 1, row, row + 1):
+                for c in cols: yield from cells.get((b, r, c), ())
+
+    def add(self, source, values):
+        """ Kaydı uygun kümeye ekler ya da yeni küme açar; küme indeksini döndürür. """
+        lat, lon, mag, time_ms = values[1], values[2], values[4], values[5]; bucket = time_ms // self.time_tol_ms
+        located = lat == lat and lon == lon
+        best = None; best_score = None
+        for index in (self._candidates(bucket, lat, lon) if located else ()):
+            cluster = self.clusters[index]; head = cluster[0][1]
+            dt = abs(head[5] - time_ms)
+            if dt > self.time_tol_ms or abs(head[4] - mag) > self.mag_tol or any(member == source for member, _ in cluster): continue
+            distance = float(haversine_km(head[1], head[2], lat, lon))
+            if distance > self.distance_km: continue
+            score = dt / self.time_tol_ms + distance / self.distance_km
+            if best_score is None or score < best_score: best = index; best_score = score
+        if best is not None: self.clusters[best].append((source, values)); return best
+        index = len(self.clusters); self.clusters.append([(source, values)])
+        if located: self._cells.setdefault((bucket,) + self._cell(lat, lon), []).append(index)  # Konumsuz kayıtlar eşleştirilmez
+        return index
+
+
+class MultiSourceFeedClient:
+    """ USGSFeedClient ile aynı arayüz (fetch, set_window, set_prefilter, window_ms, delta_mode, reset, close).
+    usgs_client USGS'yi (temel + saatlik delta mantığıyla), sources diğer ajansları çeker; priority kaynak adlarını
+    değerlerin seçileceği sıraya dizer. Ajans satırları ham tutulur, süzgeç birleştirme sırasında uygulanır. Bir kaynak
+    hata verirse son başarılı satırları kullanılmaya devam eder. """
+
+    def __init__(self, usgs_client=None, sources=(), priority=None, time_tol_s=DEFAULT_DEDUPE_TIME_S,
+                 distance_km=DEFAULT_DEDUPE_DISTANCE_KM, mag_tol=DEFAULT_DEDUPE_MAGNITUDE):
+        self.usgs = usgs_client; self.sources = list(sources); self.prefilter = None
+        self.priority = list(priority or ([] if usgs_client is None else ['usgs']) + [source.name for source in self.sources])
+        self.time_tol_s = time_tol_s; self.distance_km = distance_km; self.mag_tol = mag_tol
+        self.window_ms = usgs_client.window_ms if usgs_client is not None else FEED_WINDOW_MS; self._delta_mode = True
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.sources) + 1, thread_name_prefix="deprem-kaynak")
+        self._rows = {}; self._store = EventStore(); self._canonical = {}; self._versions = {}; self._dirty = True
+        self._lock = threading.Lock()
+
+    @property
+    def delta_mode(self): return self.usgs.delta_mode if self.usgs is not None else self._delta_mode
+
+    @delta_mode.setter
+    def delta_mode(self, value):
+        if self.usgs is not None: self.usgs.delta_mode = value
+        self._delta_mode = value
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self.usgs is not None: self.usgs.close()
+        for source in self.sources: source.close()
+
+    def reset(self):
+        with self._lock:
+            if self.usgs is not None: self.usgs.reset()
+            self._rows.clear(); self._store = EventStore(); self._canonical.clear(); self._versions.clear(); self._dirty = True
+
+    def set_window(self, window):
+        if self.usgs is not None: self.usgs.set_window(window)
+        with self._lock:
+            if self.window_ms != FEED_WINDOWS[window]: self.window_ms = FEED_WINDOWS[window]; self._dirty = True
+
+    def set_prefilter(self, prefilter):
+        if self.usgs is not None: self.usgs.set_prefilter(prefilter)
+        with self._lock:
+            if prefilter != self.prefilter: self.prefilter = prefilter; self._dirty = True
+
+    def _fetch_source(self, source, now_ms):
+        with METRICS.timer(stage='source_fetch', source=source.name): rows, changed = source.fetch(self.window_ms, now_ms)
+        logging.info(f"{source.name}: {len(rows)} olay{'' if changed else ' (değişmedi)'}.")
+        return rows, changed
+
+    def fetch(self):
+        """ Tüm kaynakları eşzamanlı sorgular, kayıtları birleştirir ve önceki tura göre ChangeSet içeren bir FeedResult döndürür. """
+        with self._lock:
+            now_ms = int(time.time() * 1000); futures = {}; errors = []; changed = self._dirty; fresh = []
+            sources = {source.name: source for source in self.sources}
+            if self.usgs is not None: futures['usgs'] = self._executor.submit(self.usgs.fetch)
+            for source in sources.values(): futures[source.name] = self._executor.submit(self._fetch_source, source, now_ms)
+            for name, future in futures.items():
+                try:
+                    if name == 'usgs':
+                        result = future.result()
+                        if not result.ok: raise RuntimeError(result.error)
+                        fresh.append(result.fresh_for_s)
+                        if result.changed or name not in self._rows: self._rows[name] = list(result.store.iter_values()); changed = True
+                    else:
+                        rows, source_changed = future.result(); fresh.append(sources[name].fresh_for_s)
+                        if source_changed or name not in self._rows: self._rows[name] = rows; changed = True
+                except Exception as e:
+                    errors.append(f"{name}: {e}"); METRICS.inc('source_errors_total', source=name)
+                    if not isinstance(e, requests.exceptions.RequestException) and name != 'usgs': logging.error(f"Kaynak okunamadı ({name}): {e}", exc_info=True)
+                    else: logging.error(f"Kaynak okunamadı ({name}): {e}")
+            if len(errors) == len(futures): return FeedResult(error="; ".join(errors))
+            # En erken bayatlayan kaynak belirleyicidir
+            fresh_for_s = min((value for value in fresh if value is not None), default=None)
+            if not changed: return FeedResult(self._store.copy(), status_code=304, fresh_for_s=fresh_for_s)
+            with METRICS.timer(stage='dedupe'): store, merged = self._merge(now_ms - self.window_ms)
+            changes = diff_stores(self._store, store, window_start_ms=now_ms - self.window_ms); self._store = store; self._dirty = False
+            METRICS.inc('events_merged_total', merged)
+            logging.info(f"Kaynaklar birleştirildi: {sum(len(rows) for rows in self._rows.values())} kayıt -> {len(store)} olay ({merged} yinelenen); değişiklikler: {changes}")
+            return FeedResult(store.copy(), changes=changes, status_code=200, fresh_for_s=fresh_for_s)
+
+    def _merge(self, start_ms):
+        """ Kaynak satırlarını öncelik sırasıyla eşleştirir; (EventStore, yinelenen kayıt sayısı) döndürür. Birleşen olayın id'si
+        üyelerinden biri önceki turda hangi olaya bağlıysa odur; küme başı ya da üye sayısı değişince 'updated' artırılır. """
+        matcher = EventMatcher(self.time_tol_s, self.distance_km, self.mag_tol); prefilter = self.prefilter
+        for name in self.priority:
+            for values in self._rows.get(name, ()):
+                if values[5] >= start_ms and (prefilter is None or prefilter.accepts(values[1], values[2], values[4])): matcher.add(name, values)
+        store = EventStore(len(matcher)); canonical = {}; versions = {}; merged = 0
+        for index, cluster in enumerate(matcher.clusters):
+            head = cluster[0][1]; member_ids = [values[0] for _, values in cluster]
+            eq_id = next((self._canonical[member] for member in member_ids if member in self._canonical and self._canonical[member] not in versions), None)
+            if eq_id is None: eq_id = next((member for member in member_ids if member not in versions), f"{head[0]}~{index}")
+            signature = (head[0], head[6], len(cluster)); updated = max(values[6] for _, values in cluster); previous = self._versions.get(eq_id)
+            if previous is not None: updated = previous[1] if previous[0] == signature else max(updated, previous[1] + 1)
+            store.upsert(eq_id, head[1], head[2], head[3], head[4], head[5], updated, head[7])
+            versions[eq_id] = (signature, updated); merged += len(cluster) - 1
+            for member in member_ids: canonical[member] = eq_id
+        self._canonical = canonical; self._versions = versions
+        return store, merged
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Sütunlu (columnar) deprem deposu: GeoJSON sözlükleri yerine yalnızca uygulamanın kullandığı alanlar
+# tipli NumPy dizilerinde tutulur; id -> satır indeksiyle O(1) erişim, filtreleme/sıralama/uzaklık
+# hesapları doğrudan sütunlar üzerinde yapılır.
+import datetime
+import logging
+
+import numpy as np
+
+from deprem_distance import batch_distances, DEFAULT_DISTANCE_METHOD
+
+_FLOAT_COLUMNS = ('lat', 'lon', 'depth', 'mag', 'distance')
+_INT_COLUMNS = ('time', 'updated')
+_MIN_CAPACITY = 64
+
+
+def ms_to_datetime(time_ms):
+    """ USGS milisaniye zaman damgasını UTC datetime'a çevirir; geçersizse None. """
+    if time_ms <= 0: return None
+    try: return datetime.datetime.fromtimestamp(time_ms / 1000, tz=datetime.timezone.utc)
+    except (OSError, ValueError, OverflowError): return None
+
+
+class EventRecord:
+    """ Tek bir depremin salt okunur görünümü (bildirimler, liste ve harita açılır pencereleri için). """
+    __slots__ = ('id', 'lat', 'lon', 'depth', 'mag', 'time', 'updated', 'place', 'distance')
+
+    def __init__(self, eq_id, lat, lon, depth, mag, time_ms, updated_ms, place, distance=float('inf')):
+        self.id = eq_id; self.lat = lat; self.lon = lon; self.depth = depth; self.mag = mag
+        self.time = time_ms; self.updated = updated_ms; self.place = place; self.distance = distance
+
+    @property
+    def time_dt(self): return ms_to_datetime(self.time)
+
+    @property
+    def location(self): return (self.lat, self.lon)
+
+    def __repr__(self): return f"EventRecord({self.id!r}, M{self.mag:.1f}, {self.place!r})"
+
+
+def feature_values(feature):
+    """ GeoJSON özelliğinden depo satırı değerlerini çıkarır; id yoksa None döner. """
+    eq_id = feature.get('id')
+    if not eq_id: return None
+    props = feature.get('properties') or {}; coordinates = (feature.get('geometry') or {}).get('coordinates') or ()
+    lon = coordinates[0] if len(coordinates) > 0 and coordinates[0] is not None else np.nan
+    lat = coordinates[1] if len(coordinates) > 1 and coordinates[1] is not None else np.nan
+    depth = coordinates[2] if len(coordinates) > 2 and coordinates[2] is not None else np.nan
+    time_ms = props.get('time') or 0
+    return eq_id, lat, lon, depth, props.get('mag') or 0.0, time_ms, props.get('updated') or time_ms, props.get('place') or "Bilinmeyen yer"
+
+
+class EventStore:
+    """ Sabit şemalı, büyüyebilen sütunlu olay deposu. Silme, son satırı boşluğa taşıyarak O(1) yapılır;
+    bu yüzden satır numaraları yalnızca bir sonraki değişikliğe kadar geçerlidir, kalıcı anahtar olay id'sidir. """
+
+    def __init__(self, capacity=_MIN_CAPACITY):
+        capacity = max(int(capacity), _MIN_CAPACITY); self._size = 0; self._index = {}
+        self._ids = [None] * capacity; self._place = [None] * capacity
+        for name in _FLOAT_COLUMNS: setattr(self, '_' + name, np.full(capacity, np.nan if name != 'distance' else np.inf))
+        for name in _INT_COLUMNS: setattr(self, '_' + name, np.zeros(capacity, dtype=np.int64))
+
+    @classmethod
+    def from_features(cls, features):
+        store = cls(len(features)); store.upsert_features(features); return store
+
+    @classmethod
+    def from_values(cls, rows):
+        store = cls(); store.upsert_values(rows); return store
+
+    def __len__(self): return self._size
+
+    def __contains__(self, eq_id): return eq_id in self._index
+
+    # --- Sütun görünümleri (kopyasız) ---
+    @property
+    def ids(self): return self._ids[:self._size]
+    @property
+    def place(self): return self._place[:self._size]
+    @property
+    def lat(self): return self._lat[:self._size]
+    @property
+    def lon(self): return self._lon[:self._size]
+    @property
+    def depth(self): return self._depth[:self._size]
+    @property
+    def mag(self): return self._mag[:self._size]
+    @property
+    def time(self): return self._time[:self._size]
+    @property
+    def updated(self): return self._updated[:self._size]
+    @property
+    def distance(self): return self._distance[:self._size]
+
+    def _grow(self, needed):
+        capacity = len(self._ids)
+        if needed <= capacity: return
+        new_capacity = max(needed, capacity * 2)
+        self._ids.extend([None] * (new_capacity - capacity)); self._place.extend([None] * (new_capacity - capacity))
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS:
+            old = getattr(self, '_' + name); fill = 0 if name in _INT_COLUMNS else (np.inf if name == 'distance' else np.nan)
+            new = np.full(new_capacity, fill, dtype=old.dtype); new[:capacity] = old; setattr(self, '_' + name, new)
+
+    def row_of(self, eq_id): return self._index.get(eq_id)
+
+    def upsert(self, eq_id, lat, lon, depth, mag, time_ms, updated_ms, place):
+        """ Olayı ekler ya da 'updated' değeri değiştiyse günceller. 'added', 'updated' veya None döndürür. """
+        row = self._index.get(eq_id)
+        if row is not None and self._updated[row] == updated_ms: return None
+        status = 'updated'
+        if row is None:
+            self._grow(self._size + 1); row = self._size; self._size += 1; self._index[eq_id] = row; self._ids[row] = eq_id; status = 'added'
+        self._lat[row] = lat; self._lon[row] = lon; self._depth[row] = depth; self._mag[row] = mag
+        self._time[row] = time_ms; self._updated[row] = updated_ms; self._place[row] = place; self._distance[row] = np.inf
+        return status
+
+    def upsert_features(self, features):
+        """ GeoJSON özelliklerini ekler/günceller; (eklenen id'ler, güncellenen id'ler) döndürür. """
+        return self.upsert_values(values for values in map(feature_values, features) if values is not None)
+
+    def upsert_values(self, rows):
+        """ feature_values() biçimindeki satırları (akış halinde gelebilir) ekler/günceller; (eklenen id'ler, güncellenen id'ler) döndürür. """
+        added = []; updated = []; missing_time = 0
+        for values in rows:
+            if not values[5]: missing_time += 1
+            status = self.upsert(*values)
+            if status == 'added': added.append(values[0])
+            elif status == 'updated': updated.append(values[0])
+        if missing_time: logging.warning(f"{missing_time} deprem verisi eksik işlendi.")
+        return added, updated
+
+    def remove(self, eq_ids):
+        """ Verilen id'leri siler (son satır boşalan yere taşınır); silinen id'lerin listesini döndürür. """
+        removed = []
+        for eq_id in eq_ids:
+            row = self._index.pop(eq_id, None)
+            if row is None: continue
+            last = self._size - 1
+            if row != last:
+                moved_id = self._ids[last]; self._ids[row] = moved_id; self._place[row] = self._place[last]; self._index[moved_id] = row
+                for name in _FLOAT_COLUMNS + _INT_COLUMNS: column = getattr(self, '_' + name); column[row] = column[last]
+            self._ids[last] = None; self._place[last] = None; self._size = last; removed.append(eq_id)
+        return removed
+
+    def remove_older_than(self, cutoff_ms):
+        return self.remove([self._ids[row] for row in np.flatnonzero(self.time < cutoff_ms).tolist()])
+
+    def copy(self):
+        other = EventStore(self._size); other._size = self._size; other._index = dict(self._index)
+        other._ids[:self._size] = self.ids; other._place[:self._size] = self.place
+        for name in _FLOAT_COLUMNS + _INT_COLUMNS: getattr(other, '_' + name)[:self._size] = getattr(self, name)
+        return other
+
+    def iter_values(self):
+        """ Satırları feature_values() biçiminde (id, lat, lon, depth, mag, time, updated, place) üretir. """
+        return zip(self.ids, self.lat.tolist(), self.lon.tolist(), self.depth.tolist(), self.mag.tolist(), self.time.tolist(), self.updated.tolist(), self.place)
+
+    # --- Sorgular ---
+    def record(self, row):
+        return EventRecord(self._ids[row], float(self._lat[row]), float(self._lon[row]), float(self._depth[row]), float(self._mag[row]),
+                           int(self._time[row]), int(self._updated[row]), self._place[row], float(self._distance[row]))
+
+    def get(self, eq_id):
+        row = self._index.get(eq_id)
+        return None if row is None else self.record(row)
+
+    def compute_distances(self, target_location, method=DEFAULT_DISTANCE_METHOD, rows=None):
+        """ Hedefe uzaklıkları hesaplar ve 'distance' sütununa yazar (rows verilirse yalnızca o satırlar). """
+        if rows is None: self._distance[:self._size] = batch_distances(target_location, self.lat, self.lon, method); return self.distance
+        rows = np.asarray(rows, dtype=np.int64); distances = batch_distances(target_location, self._lat[rows], self._lon[rows], method)
+        self._distance[rows] = distances; return distances
+
+    def filter_rows(self, min_magnitude=None, max_distance=None, since_ms=None):
+        """ Koşulları sağlayan satır numaralarını döndürür. """
+        mask = np.ones(self._size, dtype=bool)
+        if min_magnitude is not None: mask &= self.mag >= min_magnitude
+        if max_distance is not None: mask &= self.distance <= max_distance
+        if since_ms is not None: mask &= self.time >= since_ms
+        return np.flatnonzero(mask)
+
+    def sort_rows(self, rows, column='time', descending=False):
+        rows = np.asarray(rows, dtype=np.int64); keys = getattr(self, column)[rows]
+        order = np.argsort(-keys if descending else keys, kind='stable'); return rows[order]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Akış halinde GeoJSON ayrıştırma: yanıt gövdesi parça parça okunurken 'features' dizisinin öğeleri ham bayt
+# olarak ayrılır. Her öğe json.loads'tan önce büyüklük ve izleme bölgelerinin sınır kutularıyla kabaca süzülür;
+# geçenler sözlük yerine EventStore satır değerleri (feature_values) olarak, geldikçe üretilir. Böylece haftalık /
+# aylık akışlarda tüm gövde ve tüm özellik sözlükleri aynı anda bellekte tutulmaz.
+import json
+import math
+import re
+import time
+
+from deprem_store import feature_values
+
+STREAM_CHUNK_SIZE = 64 * 1024
+KM_PER_DEGREE = 110.0  # Bir derecenin en kısa karşılığından (~110.57 km) küçük: kutular gerekenden biraz geniş olur
+
+# Üst düzeyde: dizge (tamamı), köşeli/süslü parantez ya da kapanmamış dizge başlangıcı (parça sonunda, devamı beklenir)
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.DOTALL)
+# İç düzeylerde: parantez dışındaki her şeyi (tam dizgeler dahil) tek seferde atlar; Python döngüsü yalnızca parantezlerde döner
+_SKIP = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_MAG_VALUE = re.compile(rb'\s*:\s*(-?[0-9][0-9.eE+-]*)')
+_COORDINATES_VALUE = re.compile(rb'\s*:\s*\[\s*(-?[0-9][0-9.eE+-]*)\s*,\s*(-?[0-9][0-9.eE+-]*)')
+_OPEN_BRACE, _OPEN_BRACKET, _CLOSE_BRACE, _CLOSE_BRACKET, _QUOTE = b'{[}]"'
+
+
+def _find_value(raw, key, pattern):
+    """ raw içinde anahtarı (bytes.find ile) bulup değerini pattern ile eşler; dizge içindeki ya da değer olarak geçen eşleşmeler atlanır. """
+    index = raw.find(key)
+    while index >= 0:
+        if not index or raw[index - 1] != 0x5C:  # Önünde ters bölü varsa bir dizgenin içindedir
+            match = pattern.match(raw, index + len(key))
+            if match: return match
+        index = raw.find(key, index + 1)
+    return None
+
+
+def zone_bounds(zone):
+    """ Bölgenin yarıçap çemberini içine alan (güney, kuzey, merkez boylam, boylam yarı genişliği) kutusu. """
+    dlat = zone.radius_km / KM_PER_DEGREE; south = zone.lat - dlat; north = zone.lat + dlat
+    if south <= -90.0 or north >= 90.0: return max(south, -90.0), min(north, 90.0), zone.lon, 180.0
+    dlon = dlat / math.cos(math.radians(max(abs(south), abs(north))))
+    return south, north, zone.lon, min(dlon, 180.0)
+
+
+class FeaturePrefilter:
+    """ Ham özellik baytları üzerinde kaba süzgeç: büyüklüğü min_magnitude ve üzeri olanlar ile bir izleme bölgesinin
+    sınır kutusunda kalıp o bölgenin eşiğini geçenler tutulur. Kesin eşleştirme sonradan yapılır; süzgeç yalnızca
+    fazlasını tutabilir, eksiğini değil. """
+
+    def __init__(self, min_magnitude, zones=()):
+        self.min_magnitude = float(min_magnitude)
+        # Eşiği genel eşikten düşük olmayan bölgeler zaten min_magnitude ile kapsanır
+        self.boxes = tuple(zone_bounds(zone) + (float(zone.min_magnitude),) for zone in zones if zone.min_magnitude < self.min_magnitude)
+
+    @classmethod
+    def for_zones(cls, zones):
+        """ İlk bölge ana bölgedir; eşiği bildirimlerdeki genel eşiktir. """
+        return cls(zones[0].min_magnitude, zones[1:]) if zones else None
+
+    def __eq__(self, other): return isinstance(other, FeaturePrefilter) and (self.min_magnitude, self.boxes) == (other.min_magnitude, other.boxes)
+
+    def __hash__(self): return hash((self.min_magnitude, self.boxes))
+
+    def __repr__(self): return f"FeaturePrefilter(M>={self.min_magnitude}, {len(self.boxes)} bölge kutusu)"
+
+    def covers(self, other):
+        """ other'ın tuttuğu her olayı bu süzgeç de tutuyorsa True (other daha dar): eldeki depo yeniden indirilmeden yerelde süzülebilir. """
+        if other is None or self.min_magnitude > other.min_magnitude: return False
+        for south, north, center, half_width, zone_min in other.boxes:
+            if zone_min >= self.min_magnitude: continue
+            if not any(zone_min >= own_min and own_south <= south and north <= own_north and abs((center - own_center + 180.0) % 360.0 - 180.0) + half_width <= own_half
+                       for own_south, own_north, own_center, own_half, own_min in self.boxes): return False
+        return True
+
+    def accepts(self, lat, lon, mag):
+        if mag >= self.min_magnitude: return True
+        for south, north, center, half_width, zone_min in self.boxes:
+            if mag >= zone_min and south <= lat <= north and abs((lon - center + 180.0) % 360.0 - 180.0) <= half_width: return True
+        return False
+
+    def accepts_raw(self, raw):
+        """ raw: tek bir özelliğin JSON baytları. Büyüklük yoksa 0 sayılır (EventStore ile aynı); koordinat yoksa yalnızca büyüklüğe bakılır. """
+        match = _find_value(raw, b'"mag"', _MAG_VALUE)
+        try: mag = float(match.group(1)) if match else 0.0
+        except ValueError: return True  # Tanınmayan biçim: karar json.loads sonrasına kalsın
+        if mag >= self.min_magnitude: return True
+        if not self.boxes: return False
+        match = _find_value(raw, b'"coordinates"', _COORDINATES_VALUE)
+        if not match: return False
+        try: return self.accepts(float(match.group(2)), float(match.group(1)), mag)
+        except ValueError: return True
+
+
+def prefilter_covers(current, prefilter):
+    """ current süzgeciyle (None: süzgeç yok) tutulan olaylar prefilter'ın tutacaklarını kapsıyorsa True. """
+    return current is None or current.covers(prefilter)
+
+
+def iter_feature_bytes(chunks, envelope=None):
+    """ JSON gövdesi parçalarından (bayt) üst düzey 'features' dizisinin her öğesini ham bayt olarak üretir. Tampon
+    yalnızca o an ayrıştırılan öğeyi tutar. envelope sözlüğü verilirse üst düzey 'metadata' nesnesi çözülüp içine yazılır.
+    Gövde yarım kalırsa ya da 'features' dizisi yoksa ValueError yükseltir. """
+    buf = b''; pos = 0; depth = 0; last_key = None; in_features = False; seen_features = False; start = None; meta_start = None
+    for chunk in chunks:
+        if not chunk: continue
+        buf += chunk
+        size = len(buf)
+        while True:
+            if depth >= 2:
+                token_start = _SKIP.match(buf, pos).end()
+                if token_start >= size: pos = size; break
+                char = buf[token_start]; token_end = token_start + 1
+                if char == _QUOTE: pos = token_start; break  # Dizge bir sonraki parçada devam ediyor
+            else:
+                match = _TOKEN.search(buf, pos)
+                if match is None: pos = size; break
+                token_start, token_end = match.span(); char = buf[token_start]
+                if char == _QUOTE:
+                    if token_end - token_start == 1: pos = token_start; break
+                    if depth == 1: last_key = match.group()
+                    pos = token_end; continue
+            if char == _OPEN_BRACE or char == _OPEN_BRACKET:
+                depth += 1
+                if depth == 3 and in_features and char == _OPEN_BRACE: start = token_start
+                elif depth == 2 and char == _OPEN_BRACKET and last_key == b'"features"': in_features = True; seen_features = True
+                elif depth == 2 and char == _OPEN_BRACE and last_key == b'"metadata"' and envelope is not None: meta_start = token_start
+            else:
+                if depth == 3 and start is not None and char == _CLOSE_BRACE: yield buf[start:token_end]; start = None
+                elif depth == 2 and in_features and char == _CLOSE_BRACKET: in_features = False
+                elif depth == 2 and meta_start is not None and char == _CLOSE_BRACE: envelope['metadata'] = json.loads(buf[meta_start:token_end]); meta_start = None
+                depth -= 1
+            pos = token_end
+        keep = min(pos, start if start is not None else pos, meta_start if meta_start is not None else pos)
+        if keep:
+            buf = buf[keep:]; pos -= keep
+            if start is not None: start -= keep
+            if meta_start is not None: meta_start -= keep
+    if depth != 0 or buf[pos:].strip(): raise ValueError("GeoJSON gövdesi yarım kaldı.")
+    if not seen_features: raise ValueError("GeoJSON gövdesinde 'features' dizisi yok.")
+
+
+class FeatureStream:
+    """ Yanıt gövdesi parçalarından süzülmüş EventStore satır değerleri üreten tek kullanımlık yineleyici.
+    Tüketildikten sonra metadata, seen (görülen özellik), kept (tutulan) ve decode_s (json.loads + satır değerlerinde geçen süre) dolar. """
+
+    def __init__(self, chunks, prefilter=None):
+        self.chunks = chunks; self.prefilter = prefilter; self.envelope = {}; self.seen = 0; self.kept = 0; self.decode_s = 0.0
+
+    @property
+    def metadata(self): return self.envelope.get('metadata') or {}
+
+    def __iter__(self):
+        prefilter = self.prefilter
+        for raw in iter_feature_bytes(self.chunks, self.envelope):
+            self.seen += 1
+            if prefilter is not None and not prefilter.accepts_raw(raw): continue
+            start = time.perf_counter(); values = feature_values(json.loads(raw)); self.decode_s += time.perf_counter() - start
+            if values is None: continue
+            if prefilter is not None and not prefilter.accepts(values[1], values[2], values[4]): continue
+            self.kept += 1; yield values
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+# Çevrimdışı harita önbelleği: harita karoları MBTiles uyumlu bir SQLite dosyasında (en uzun süredir kullanılmayan
+# karolar silinerek boyut sınırı içinde) tutulur; Leaflet/folium JS/CSS dosyaları uygulamayla gelen map_assets
+# klasöründen ya da ilk indirmede aynı dosyaya yazılan kopyadan sunulur. Harita sayfası bunları deprem:// şemasıyla
+# ister (deprem://tile/z/x/y.png, deprem://asset/<sunucu>/<yol>); QWebEngineUrlSchemeHandler önce önbelleğe bakar,
+# bulamazsa arka planda indirir. İzleme bölgelerinin çevresindeki karolar arka planda önceden indirilir (prefetch).
+# Kullanım: python deprem.py --map-cache [--settings DOSYA] [--prefetch] [--bundle-assets]
+import argparse
+import logging
+import math
+import mimetypes
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from deprem_feed import create_session
+from deprem_log import LOG_FORMAT
+from deprem_map import zoom_for_radius
+from deprem_metrics import METRICS
+
+MAP_SCHEME = "deprem"
+TILE_CACHE_FILE = "deprem_harita.mbtiles"
+ASSETS_DIR = "map_assets"  # Paketlenmiş Leaflet/folium dosyaları: map_assets/<sunucu>/<yol>
+DEFAULT_OFFLINE_MAP = True
+DEFAULT_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+DEFAULT_TILE_CACHE_MB = 200
+DEFAULT_TILE_PREFETCH = True
+TILE_ATTRIBUTION = '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> katkıcıları'
+TILE_REFRESH_AGE_S = 7 * 24 * 3600  # Daha eski karolar yine sunulur, arka planda yenilenir
+ACCESS_RESOLUTION_S = 60  # last_access en fazla bu sıklıkla yazılır (her okumada yazma yapılmasın)
+MAX_TILE_ZOOM = 19
+WORLD_PREFETCH_ZOOM = 3  # 0-3 arası tüm dünya (85 karo)
+MAX_PREFETCH_TILES = 1500
+TILE_FETCH_WORKERS = 2  # Karo sunucusunun kullanım kuralları: az sayıda eşzamanlı bağlantı
+TILE_TIMEOUT_S = 15
+PREFETCH_JOIN_TIMEOUT_S = 2.0  # Kapatılırken ön indirme iş parçacığı en fazla bu kadar beklenir (süren indirme bitmeyebilir)
+USER_AGENT = "DepremTakip/1.0 (+https://github.com/superyapayzeka/deprem-takip-app)"
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)",
+    """CREATE TABLE IF NOT EXISTS tiles (
+        zoom_level INTEGER NOT NULL, tile_column INTEGER NOT NULL, tile_row INTEGER NOT NULL, tile_data BLOB NOT NULL,
+        fetched INTEGER NOT NULL, last_access INTEGER NOT NULL, PRIMARY KEY (zoom_level, tile_column, tile_row)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tiles_access ON tiles(last_access)",
+    "CREATE TABLE IF NOT EXISTS assets (url TEXT PRIMARY KEY, content_type TEXT NOT NULL, data BLOB NOT NULL, fetched INTEGER NOT NULL)",
+)
+_CSS_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)')
+mimetypes.add_type('font/woff2', '.woff2'); mimetypes.add_type('font/woff', '.woff'); mimetypes.add_type('font/ttf', '.ttf')
+
+
+def tile_xy(lat, lon, zoom):
+    """ Web Mercator (XYZ) karo koordinatları. """
+    lat = max(min(lat, 85.0511), -85.0511); n = 1 << zoom
+    x = int((lon + 180.0) / 360.0 * n); y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_around(lat, lon, radius_km, zoom):
+    """ (lat, lon) merkezli radius_km yarıçaplı dairenin sınırlayıcı kutusunu kaplayan karolar. """
+    dlat = radius_km / 111.2; dlon = radius_km / (111.2 * max(math.cos(math.radians(lat)), 0.01))
+    x0, y0 = tile_xy(lat + dlat, lon - dlon, zoom); x1, y1 = tile_xy(lat - dlat, lon + dlon, zoom); n = 1 << zoom
+    xs = range(x0, x1 + 1) if x0 <= x1 else list(range(x0, n)) + list(range(0, x1 + 1))  # Tarih değiştirme çizgisi
+    return [(zoom, x, y) for y in range(y0, y1 + 1) for x in xs]
+
+
+def prefetch_plan(zones, max_tiles=MAX_PREFETCH_TILES):
+    """ Önce dünya geneli kaba karolar, sonra her bölge için açılış yakınlaştırmasının bir altı ile iki üstü arası; en fazla max_tiles karo. """
+    plan = [(z, x, y) for z in range(WORLD_PREFETCH_ZOOM + 1) for x in range(1 << z) for y in range(1 << z)]
+    zone_tiles = {}
+    for zone in zones:
+        base = zoom_for_radius(zone.radius_km)
+        for zoom in range(max(base - 1, WORLD_PREFETCH_ZOOM + 1), min(base + 2, MAX_TILE_ZOOM) + 1): zone_tiles.setdefault(zoom, []).extend(tiles_around(zone.lat, zone.lon, zone.radius_km, zoom))
+    seen = set(plan)
+    for zoom in sorted(zone_tiles):  # Kaba yakınlaştırmalar önce: sınır aşılırsa ayrıntılı karolar eksik kalır
+        for tile in zone_tiles[zoom]:
+            if tile not in seen: seen.add(tile); plan.append(tile)
+    return plan[:max_tiles]
+
+
+def asset_url(url):
+    """ 'https://cdn.example/a/b.js' -> 'deprem://asset/cdn.example/a/b.js' (CSS içindeki göreli adresler de aynı şemada çözülür). """
+    return f"{MAP_SCHEME}://asset/" + url.split("://", 1)[1]
+
+
+def _origin_url(path):
+    """ deprem://asset yolu -> özgün https adresi. """
+    return "https://" + path.lstrip('/')
+
+
+def _content_type(path): return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+class MapCache:
+    """ Karo ve harita dosyası önbelleği (tek SQLite bağlantısı + kilit; iş parçacıkları arasında paylaşılabilir).
+    resolve() yalnızca yerel kaynaklara bakar (arayüz iş parçacığı için), download() ağdan indirip önbelleğe yazar. """
+
+    def __init__(self, path=TILE_CACHE_FILE, max_bytes=DEFAULT_TILE_CACHE_MB * 1024 * 1024, tile_url=DEFAULT_TILE_URL, assets_dir=None, session=None):
+        self.path = path; self.max_bytes = max_bytes; self.tile_url = tile_url or DEFAULT_TILE_URL; self.assets_dir = assets_dir
+        self.session = session or create_session(); self.session.headers.update({'User-Agent': USER_AGENT, 'Accept': '*/*'})
+        self._lock = threading.Lock(); self._prefetch_stop = threading.Event(); self._prefetch_thread = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL"); self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA: self._conn.execute(statement)
+            self._conn.executemany("INSERT OR IGNORE INTO metadata (name, value) VALUES (?, ?)", (('name', "Deprem Takip harita önbelleği"), ('format', 'png'), ('type', 'baselayer')))
+            count, self._bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length(tile_data)), 0) FROM tiles").fetchone()
+        logging.info(f"Harita önbelleği açıldı: {path} ({count} karo, {self._bytes / 1048576:.1f} / {max_bytes / 1048576:.0f} MB)")
+
+    def close(self):
+        self._prefetch_stop.set(); thread = self._prefetch_thread
+        if thread is not None: thread.join(PREFETCH_JOIN_TIMEOUT_S)  # Zamanında bitmezse prefetch kapalı bağlantı hatasını sessizce durur
+        with self._lock: self._conn.close()
+        self.session.close()
+
+    def stats(self):
+        with self._lock:
+            tiles, tile_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length(tile_data)), 0) FROM tiles").fetchone()
+            assets, asset_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM assets").fetchone()
+        return {'tiles': tiles, 'tile_bytes': tile_bytes, 'assets': assets, 'asset_bytes': asset_bytes, 'max_bytes': self.max_bytes}
+
+    # --- Karolar (tile_row MBTiles gereği TMS düzenindedir: y ekseni ters) ---
+    def get_tile(self, z, x, y):
+        """ (veri, yenilenmeli_mi) ya da (None, True). """
+        now = int(time.time()); key = (z, x, (1 << z) - 1 - y)
+        with self._lock:
+            row = self._conn.execute("SELECT tile_data, fetched, last_access FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", key).fetchone()
+            if row is None: return None, True
+            if now - row[2] >= ACCESS_RESOLUTION_S: self._conn.execute("UPDATE tiles SET last_access = ? WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", (now,) + key)
+        return row[0], now - row[1] >= TILE_REFRESH_AGE_S
+
+    def has_fresh_tile(self, z, x, y):
+        with self._lock:
+            row = self._conn.execute("SELECT fetched FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", (z, x, (1 << z) - 1 - y)).fetchone()
+        return row is not None and time.time() - row[0] < TILE_REFRESH_AGE_S
+
+    def put_tile(self, z, x, y, data):
+        now = int(time.time()); key = (z, x, (1 << z) - 1 - y)
+        with self._lock:
+            old = self._conn.execute("SELECT length(tile_data) FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", key).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data, fetched, last_access) VALUES (?, ?, ?, ?, ?, ?)", key + (data, now, now))
+            self._bytes += len(data) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes: self._evict()
+
+    def _evict(self):
+        """ En uzun süredir okunmayan karoları boyut sınırının %90'ına inene kadar siler (kilit tutulurken çağrılır). """
+        target = self.max_bytes * 0.9; removed = 0; self._conn.execute("BEGIN")
+        try:
+            while self._bytes > target:
+                victims = []
+                for row in self._conn.execute("SELECT zoom_level, tile_column, tile_row, length(tile_data) FROM tiles ORDER BY last_access LIMIT 256").fetchall():
+                    if self._bytes <= target: break
+                    victims.append(row[:3]); self._bytes -= row[3]
+                if not victims: break
+                self._conn.executemany("DELETE FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", victims); removed += len(victims)
+            self._conn.execute("COMMIT")
+        except Exception: self._conn.execute("ROLLBACK"); raise
+        METRICS.inc('tiles_evicted_total', removed); logging.info(f"Harita önbelleği sınırı aşıldı; {removed} karo silindi ({self._bytes / 1048576:.1f} MB).")
+
+    def download_tile(self, z, x, y):
+        with METRICS.timer(stage='tile_fetch'):
+            response = self.session.get(self.tile_url.format(z=z, x=x, y=y, s='a'), timeout=TILE_TIMEOUT_S); response.raise_for_status()
+        data = response.content; self.put_tile(z, x, y, data); return data
+
+    # --- Leaflet/folium dosyaları ---
+    def get_asset(self, path):
+        """ Önce paketlenmiş klasör, sonra önbellek; (içerik türü, veri) ya da (içerik türü, None). """
+        content_type = _content_type(path)
+        if self.assets_dir:
+            local = os.path.normpath(os.path.join(self.assets_dir, *path.lstrip('/').split('/')))
+            if local.startswith(os.path.normpath(self.assets_dir) + os.sep) and os.path.isfile(local):
+                with open(local, 'rb') as asset_file: return content_type, asset_file.read()
+        with self._lock: row = self._conn.execute("SELECT content_type, data FROM assets WHERE url = ?", (_origin_url(path),)).fetchone()
+        return (row[0], row[1]) if row else (content_type, None)
+
+    def download_asset(self, path):
+        url = _origin_url(path)
+        with METRICS.timer(stage='asset_fetch'): response = self.session.get(url, timeout=TILE_TIMEOUT_S); response.raise_for_status()
+        content_type = response.headers.get('Content-Type', _content_type(path)).split(';', 1)[0].strip(); data = response.content
+        with self._lock: self._conn.execute("INSERT OR REPLACE INTO assets (url, content_type, data, fetched) VALUES (?, ?, ?, ?)", (url, content_type, data, int(time.time())))
+        return content_type, data
+
+    # --- deprem:// adresleri ---
+    @staticmethod
+    def parse_url(url):
+        """ 'deprem://tile/5/17/11.png' -> ('tile', (5, 17, 11)); 'deprem://asset/sunucu/yol' -> ('asset', '/sunucu/yol'). Geçersizse ValueError. """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != MAP_SCHEME: raise ValueError(f"Bilinmeyen şema: {url}")
+        if parts.netloc == 'tile':
+            match = re.fullmatch(r'/(\d+)/(\d+)/(\d+)\.png', parts.path)
+            if not match: raise ValueError(f"Geçersiz karo adresi: {url}")
+            z, x, y = map(int, match.groups())
+            if z > MAX_TILE_ZOOM or x >= 1 << z or y >= 1 << z: raise ValueError(f"Geçersiz karo adresi: {url}")
+            return 'tile', (z, x, y)
+        if parts.netloc == 'asset' and parts.path.count('/') >= 2 and '..' not in parts.path: return 'asset', parts.path
+        raise ValueError(f"Geçersiz adres: {url}")
+
+    def resolve(self, url):
+        """ Yalnızca yerel kaynaklardan: (içerik türü, veri ya da None, ağdan yenilenmeli_mi). """
+        kind, key = self.parse_url(url)
+        if kind == 'tile':
+            data, stale = self.get_tile(*key); METRICS.inc('tile_requests_total', result='miss' if data is None else 'hit')
+            return 'image/png', data, stale
+        content_type, data = self.get_asset(key); METRICS.inc('asset_requests_total', result='miss' if data is None else 'hit')
+        return content_type, data, data is None
+
+    def download(self, url):
+        """ Adresi ağdan indirir, önbelleğe yazar ve (içerik türü, veri) döndürür; hatalar yükseltilir. """
+        kind, key = self.parse_url(url)
+        if kind == 'tile': return 'image/png', self.download_tile(*key)
+        return self.download_asset(key)
+
+    # --- Önceden indirme ---
+    def prefetch(self, tiles, stop=None):
+        """ Önbellekte taze olmayan karoları sırayla indirir; (indirilen, zaten olan, başarısız) döndürür.
+        stop kurulduktan sonraki hatalar (ör. önbellek kapatılırken kapanan bağlantı) sayılmaz; indirme sessizce durur. """
+        fetched = cached = failed = 0; start = time.perf_counter()
+        for z, x, y in tiles:
+            if stop is not None and stop.is_set(): break
+            try:
+                if self.has_fresh_tile(z, x, y): cached += 1; continue
+                self.download_tile(z, x, y); fetched += 1
+            except Exception as e:
+                if stop is not None and stop.is_set(): break
+                failed += 1
+                if failed == 1: logging.warning(f"Karo indirilemedi ({z}/{x}/{y}): {e}")
+                if failed >= 10 and not fetched: logging.warning("Ağ erişimi yok gibi görünüyor; karo ön indirmesi durduruldu."); break
+        METRICS.inc('tiles_prefetched_total', fetched)
+        logging.info(f"Karo ön indirmesi: {fetched} indirildi, {cached} zaten önbellekte, {failed} başarısız ({time.perf_counter() - start:.1f} sn).")
+        return fetched, cached, failed
+
+    def start_prefetch(self, zones, max_tiles=MAX_PREFETCH_TILES):
+        """ Önceki ön indirmeyi durdurur ve bölgeler için yenisini arka planda başlatır. """
+        self._prefetch_stop.set(); stop = self._prefetch_stop = threading.Event(); plan = prefetch_plan(zones, max_tiles)
+        self._prefetch_thread = threading.Thread(target=self.prefetch, args=(plan, stop), name="deprem-tile-prefetch", daemon=True); self._prefetch_thread.start()
+        return len(plan)
+
+    def bundle_assets(self, urls, dest):
+        """ Verilen JS/CSS dosyalarını (ve CSS'lerin göreli olarak başvurduğu yazı tiplerini) dest/<sunucu>/<yol> altına indirir. """
+        queue = list(urls); done = set(); written = 0
+        while queue:
+            url = queue.pop(0)
+            if url in done: continue
+            done.add(url); path = url.split("://", 1)[1].split('?', 1)[0].split('#', 1)[0]
+            response = self.session.get(url, timeout=TILE_TIMEOUT_S); response.raise_for_status()
+            target = os.path.join(dest, *path.split('/')); os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as out: out.write(response.content)
+            written += 1; logging.info(f"Harita dosyası paketlendi: {target}")
+            if path.endswith('.css'):
+                for ref in _CSS_URL.findall(response.text):
+                    if not ref.startswith('data:'): queue.append(urllib.parse.urljoin(url, ref))
+        return written
+
+
+def folium_asset_urls():
+    """ folium'un harita sayfasına eklediği JS/CSS dosyalarının adresleri. """
+    import folium
+    return [url for _, url in list(folium.Map.default_js) + list(folium.Map.default_css)]
+
+
+# --- QtWebEngine tümleşimi (yalnızca arayüzde; Qt modülleri çağrıldıklarında yüklenir) ---
+_scheme_registered = False
+
+
+def map_scheme_registered(): return _scheme_registered
+
+
+def register_map_scheme():
+    """ deprem:// şemasını kaydeder; QApplication oluşturulmadan önce çağrılmalıdır. Başarılıysa True. """
+    global _scheme_registered
+    try:
+        from PySide6.QtWebEngineCore import QWebEngineUrlScheme
+        scheme = QWebEngineUrlScheme(MAP_SCHEME.encode()); scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+        scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.CorsEnabled | QWebEngineUrlScheme.Flag.FetchApiAllowed)
+        QWebEngineUrlScheme.registerScheme(scheme); _scheme_registered = True; logging.info(f"Harita şeması kaydedildi: {MAP_SCHEME}://")
+        return True
+    except Exception as e: logging.warning(f"Harita şeması kaydedilemedi; harita ağdan yüklenecek: {e}"); return False
+
+
+def create_scheme_handler(cache, parent=None):
+    """ MapCache'ten yanıt veren QWebEngineUrlSchemeHandler. Önbellekte olmayanlar arka planda indirilir; yanıt arayüz
+    iş parçacığında verilir (iş bu arada iptal edildiyse atlanır). """
+    from PySide6.QtCore import QBuffer, QIODevice, Signal
+    from PySide6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlSchemeHandler
+    import shiboken6
+
+    class MapSchemeHandler(QWebEngineUrlSchemeHandler):
+        _downloaded = Signal(object, object, object)  # (iş, içerik türü, veri ya da None)
+
+        def __init__(self):
+            super().__init__(parent); self._executor = ThreadPoolExecutor(max_workers=TILE_FETCH_WORKERS, thread_name_prefix="deprem-karo")
+            self._downloaded.connect(self._reply)
+
+        def requestStarted(self, job):
+            url = job.requestUrl().toString()
+            try: content_type, data, refresh = cache.resolve(url)
+            except ValueError as e: logging.warning(str(e)); job.fail(QWebEngineUrlRequestJob.Error.UrlInvalid); return
+            if data is not None:
+                self._reply(job, content_type, data)
+                if refresh: self._executor.submit(self._refresh, url)
+            else: self._executor.submit(self._download, job, url)
+
+        def _refresh(self, url):
+            try: cache.download(url)
+            except Exception as e: logging.debug(f"Önbellekteki eski kopya yenilenemedi ({url}): {e}")
+
+        def _download(self, job, url):
+            try: content_type, data = cache.download(url)
+            except Exception as e: logging.info(f"Harita kaynağı indirilemedi ({url}): {e}"); content_type = data = None; METRICS.inc('tile_requests_total', result='error')
+            self._downloaded.emit(job, content_type, data)
+
+        def _reply(self, job, content_type, data):
+            if not shiboken6.isValid(job): return  # Sayfa isteği iptal etti
+            if data is None: job.fail(QWebEngineUrlRequestJob.Error.RequestFailed); return
+            if hasattr(job, 'setAdditionalResponseHeaders'): job.setAdditionalResponseHeaders({b'Access-Control-Allow-Origin': b'*'})  # Qt 6.6+: yazı tipleri CORS ister
+            buffer = QBuffer(job); buffer.setData(data); buffer.open(QIODevice.OpenModeFlag.ReadOnly); job.reply(content_type.encode(), buffer)
+
+        def shutdown(self): self._executor.shutdown(wait=False, cancel_futures=True)
+
+    return MapSchemeHandler()
+
+
+def main(argv=None):
+    from deprem_settings import SETTINGS_FILE, load_settings, resource_path, watch_zones_from_settings
+    parser = argparse.ArgumentParser(prog="deprem.py --map-cache", description="Çevrimdışı harita önbelleğini doldurur ve durumunu gösterir.")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help=f"INI ayar dosyası (varsayılan: {SETTINGS_FILE})")
+    parser.add_argument('--prefetch', action='store_true', help="İzleme bölgelerinin çevresindeki karoları şimdi indir")
+    parser.add_argument('--max-tiles', type=int, default=MAX_PREFETCH_TILES, help="Ön indirilecek en fazla karo sayısı")
+    parser.add_argument('--bundle-assets', action='store_true', help=f"Leaflet/folium dosyalarını uygulamayla dağıtmak üzere {ASSETS_DIR}/ klasörüne indir")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, stream=sys.stderr)
+    settings = load_settings(args.settings); assets_dir = resource_path(ASSETS_DIR)
+    cache = MapCache(TILE_CACHE_FILE, settings.get('tile_cache_mb', DEFAULT_TILE_CACHE_MB) * 1024 * 1024, settings.get('tile_url', DEFAULT_TILE_URL), assets_dir)
+    try:
+        if args.bundle_assets: print(f"{cache.bundle_assets(folium_asset_urls(), assets_dir)} dosya {assets_dir} klasörüne yazıldı.")
+        if args.prefetch: cache.prefetch(prefetch_plan(watch_zones_from_settings(settings), args.max_tiles))
+        stats = cache.stats()
+        print(f"{cache.path}: {stats['tiles']} karo ({stats['tile_bytes'] / 1048576:.1f} / {stats['max_bytes'] / 1048576:.0f} MB), "
+              f"{stats['assets']} harita dosyası ({stats['asset_bytes'] / 1024:.0f} KB)")
+    finally: cache.close()
+    return 0
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# İzleme bölgeleri (her biri kendi yarıçapı ve minimum büyüklüğüyle) ve yarıçap sorguları için
+# enlem/boylam hücre ızgarasına dayalı uzamsal indeks. İndeks her akış güncellemesinde bir kez
+# kurulur; her bölge yalnızca yarıçapı kesen hücrelerdeki adaylara bakar.
+import itertools
+import logging
+import math
+
+import numpy as np
+
+from deprem_distance import batch_distances, DEFAULT_DISTANCE_METHOD, MEAN_EARTH_RADIUS_KM
+
+KM_PER_DEGREE = math.pi * MEAN_EARTH_RADIUS_KM / 180.0
+DEFAULT_CELL_DEG = 1.0
+ZONE_FIELD_SEPARATOR = ";"
+
+
+class WatchZone:
+    __slots__ = ('name', 'lat', 'lon', 'radius_km', 'min_magnitude')
+
+    def __init__(self, name, lat, lon, radius_km, min_magnitude):
+        self.name = name; self.lat = float(lat); self.lon = float(lon); self.radius_km = float(radius_km); self.min_magnitude = float(min_magnitude)
+
+    @property
+    def location(self): return (self.lat, self.lon)
+
+    def __repr__(self): return f"WatchZone({self.name!r}, {self.lat}, {self.lon}, {self.radius_km}, {self.min_magnitude})"
+
+    def __eq__(self, other):
+        return isinstance(other, WatchZone) and (self.name, self.lat, self.lon, self.radius_km, self.min_magnitude) == (other.name, other.lat, other.lon, other.radius_km, other.min_magnitude)
+
+
+def parse_watch_zones(text, reserved=()):
+    """ Her satırda bir bölge: "Ad; Enlem; Boylam; Yarıçap (km); Min. Büyüklük". Hatalı satırlar atlanır. Eşleşmeler bölge
+    adıyla tutulduğundan yinelenen ya da ayrılmış (reserved, ör. ana hedef bölgesi) adlar "Ad (2)" biçiminde yeniden adlandırılır. """
+    zones = []; used = set(reserved)
+    for line_no, line in enumerate((text or "").splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('#'): continue
+        parts = [part.strip() for part in line.split(ZONE_FIELD_SEPARATOR)]
+        try:
+            if len(parts) != 5: raise ValueError(f"5 alan bekleniyordu, {len(parts)} bulundu")
+            name, lat, lon, radius_km, min_magnitude = parts[0], *(float(p.replace(',', '.')) for p in parts[1:])
+            if not name: raise ValueError("bölge adı boş")
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180) or radius_km <= 0: raise ValueError("koordinat/yarıçap aralık dışında")
+            if name in used:
+                unique = next(f"{name} ({n})" for n in itertools.count(2) if f"{name} ({n})" not in used)
+                logging.warning(f"İzleme bölgesi satırı {line_no}: '{name}' adı zaten kullanılıyor; '{unique}' olarak yeniden adlandırıldı."); name = unique
+            used.add(name); zones.append(WatchZone(name, lat, lon, radius_km, min_magnitude))
+        except ValueError as e: logging.warning(f"İzleme bölgesi satırı {line_no} atlandı ({e}): {line}")
+    return zones
+
+
+def format_watch_zones(zones):
+    return "\n".join(f"{z.name}{ZONE_FIELD_SEPARATOR} {z.lat:g}{ZONE_FIELD_SEPARATOR} {z.lon:g}{ZONE_FIELD_SEPARATOR} {z.radius_km:g}{ZONE_FIELD_SEPARATOR} {z.min_magnitude:g}" for z in zones)
+
+
+def grid_shape(cell_deg=DEFAULT_CELL_DEG): return int(math.ceil(180.0 / cell_deg)), int(math.ceil(360.0 / cell_deg))
+
+
+def grid_cell_ids(lats, lons, cell_deg=DEFAULT_CELL_DEG):
+    """ Enlem/boylam dizileri için hücre numaraları (satır * sütun_sayısı + sütun). Arşivdeki 'cell' sütunu da bunu kullanır. """
+    n_rows, n_cols = grid_shape(cell_deg)
+    rows = np.clip(((np.asarray(lats, dtype=np.float64) + 90.0) // cell_deg).astype(np.int64), 0, n_rows - 1)
+    cols = np.clip((((np.asarray(lons, dtype=np.float64) + 180.0) % 360.0) // cell_deg).astype(np.int64), 0, n_cols - 1)
+    return rows * n_cols + cols
+
+
+def candidate_cell_ranges(lat, lon, radius_km, cell_deg=DEFAULT_CELL_DEG):
+    """ (lat, lon) merkezli radius_km çemberini kapsayan kapalı hücre aralıklarını [(ilk, son), ...] döndürür.
+    Kutuplara taşan ya da çok büyük yarıçaplar için None döner (tüm hücreler aday). """
+    n_rows, n_cols = grid_shape(cell_deg)
+    # Sınır kutusu küre üzerinde hesaplanır; elipsoidal uzaklıklarla farkı (< %0.6) için %1 pay bırakılır
+    dlat = radius_km * 1.01 / KM_PER_DEGREE; lat_min = lat - dlat; lat_max = lat + dlat
+    if lat_min <= -90.0 or lat_max >= 90.0 or dlat >= 90.0: return None
+    dlon = math.degrees(math.asin(min(1.0, math.sin(math.radians(dlat)) / math.cos(math.radians(lat)))))
+    row_lo, row_hi = (int(c) // n_cols for c in grid_cell_ids([lat_min, lat_max], [lon, lon], cell_deg))
+    if dlon >= 90.0: return [(row_lo * n_cols, (row_hi + 1) * n_cols - 1)]  # Tam enlem bandı
+    col_lo, col_hi = (int(c) % n_cols for c in grid_cell_ids([lat, lat], [lon - dlon, lon + dlon], cell_deg))
+    col_ranges = [(col_lo, col_hi)] if col_lo <= col_hi else [(col_lo, n_cols - 1), (0, col_hi)]  # 180. meridyen taşması
+    return [(row * n_cols + c0, row * n_cols + c1) for row in range(row_lo, row_hi + 1) for c0, c1 in col_ranges]
+
+
+def bbox_cell_ranges(min_lat, min_lon, max_lat, max_lon, cell_deg=DEFAULT_CELL_DEG):
+    """ Enlem/boylam kutusunu kapsayan kapalı hücre aralıkları; min_lon > max_lon ise kutu 180. meridyeni keser. """
+    n_cols = grid_shape(cell_deg)[1]
+    row_lo, row_hi = (int(c) // n_cols for c in grid_cell_ids([min_lat, max_lat], [0.0, 0.0], cell_deg))
+    col_lo, col_hi = (int(c) % n_cols for c in grid_cell_ids([0.0, 0.0], [min_lon, max_lon], cell_deg))
+    if max_lon - min_lon >= 360.0: col_lo, col_hi = 0, n_cols - 1
+    col_ranges = [(col_lo, col_hi)] if col_lo <= col_hi else [(col_lo, n_cols - 1), (0, col_hi)]
+    return [(row * n_cols + c0, row * n_cols + c1) for row in range(row_lo, row_hi + 1) for c0, c1 in col_ranges]
+
+
+class GridSpatialIndex:
+    """ Olayları cell_deg boyutunda enlem/boylam hücrelerine göre sıralar. Yarıçap sorgusu, çemberin
+    sınır kutusunu kesen her hücre satırı için ikili arama ile aday aralığını bulur ve yalnızca bu
+    adaylar için kesin uzaklığı hesaplar. """
+
+    def __init__(self, lats, lons, cell_deg=DEFAULT_CELL_DEG):
+        self.cell_deg = cell_deg
+        lats = np.asarray(lats, dtype=np.float64); lons = np.asarray(lons, dtype=np.float64)
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        cells = grid_cell_ids(lats[valid], lons[valid], cell_deg); order = np.argsort(cells, kind='stable')
+        self.indices = valid[order]; self.cells = cells[order]
+        self.lats = lats[self.indices]; self.lons = lons[self.indices]
+
+    def __len__(self): return len(self.indices)
+
+    def _candidate_slices(self, lat, lon, radius_km):
+        ranges = candidate_cell_ranges(lat, lon, radius_km, self.cell_deg)
+        if ranges is None: yield 0, len(self.cells); return
+        for first, last in ranges:
+            lo = np.searchsorted(self.cells, first, 'left'); hi = np.searchsorted(self.cells, last, 'right')
+            if hi > lo: yield lo, hi
+
+    def query_radius(self, lat, lon, radius_km, method=DEFAULT_DISTANCE_METHOD, distance_fn=None):
+        """ (lat, lon) merkezli radius_km içindeki olayların (özgün indeksler, uzaklıklar) dizilerini döndürür.
+        distance_fn(hedef, özgün indeksler) verilirse adayların uzaklıkları onunla (ör. DerivedCache üzerinden) alınır. """
+        slices = list(self._candidate_slices(lat, lon, radius_km))
+        if not slices: return np.empty(0, dtype=np.int64), np.empty(0)
+        positions = np.concatenate([np.arange(lo, hi) for lo, hi in slices])
+        if distance_fn is not None: distances = distance_fn((lat, lon), self.indices[positions])
+        else: distances = batch_distances((lat, lon), self.lats[positions], self.lons[positions], method)
+        inside = distances <= radius_km
+        return self.indices[positions[inside]], distances[inside]
+
+
+def match_zones(zones, lats, lons, mags, method=DEFAULT_DISTANCE_METHOD, index=None, distance_fn=None):
+    """ Her bölge için (olay indeksleri, uzaklıklar) döndürür; sonuçlar uzaklığa göre sıralıdır. """
+    index = index if index is not None else GridSpatialIndex(lats, lons); mags = np.asarray(mags, dtype=np.float64); matches = {}
+    for zone in zones:
+        indices, distances = index.query_radius(zone.lat, zone.lon, zone.radius_km, method, distance_fn)
+        keep = mags[indices] >= zone.min_magnitude; indices = indices[keep]; distances = distances[keep]
+        order = np.argsort(distances, kind='stable'); matches[zone.name] = (indices[order], distances[order])
+    return matches
+
+
+def merge_zone_matches(zone_matches):
+    """ Bölge eşleşmelerini birleştirir: her olay bir kez, en yakın bölgesiyle. Uzaklığa göre sıralı
+    (satırlar, uzaklıklar, bölge sıraları, bölge adları) döndürür. """
+    zone_names = list(zone_matches)
+    if not zone_names: return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64), zone_names
+    rows = np.concatenate([zone_matches[name][0] for name in zone_names]); distances = np.concatenate([zone_matches[name][1] for name in zone_names])
+    zone_ids = np.concatenate([np.full(len(zone_matches[name][0]), i, dtype=np.int64) for i, name in enumerate(zone_names)])
+    order = np.argsort(distances, kind='stable'); rows = rows[order]; distances = distances[order]; zone_ids = zone_ids[order]
+    _, first = np.unique(rows, return_index=True); first.sort()
+    return rows[first], distances[first], zone_ids[first], zone_names